@@ -0,0 +1,124 @@
+"""Tests for the persistent backtest result cache (backtest/cache.py).
+
+Run standalone:   python dev/test_backtest_cache.py
+Or with pytest:   pytest dev/test_backtest_cache.py
+"""
+
+import copy
+import json
+import logging
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import stonkslib.backtest.strategy as bt
+from stonkslib.backtest.cache import (
+    set_backtest_cache, clear_backtest_cache, backtest_cache_info, backtest_cache_key, DEFAULT_DB,
+)
+
+logging.getLogger("stonkslib").setLevel(logging.WARNING)
+
+STRATEGY = bt.load_strategy(os.path.join(os.path.dirname(__file__), "..", "stonkslib",
+                                         "strategies", "rsi_macd_v2.yaml"))
+
+
+def _prices(n=500, seed=8):
+    rng = np.random.default_rng(seed)
+    close = 60 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    return pd.DataFrame({"Open": close * (1 + rng.normal(0, 0.003, n)), "High": close * 1.01,
+                         "Low": close * 0.99, "Close": close, "Volume": np.full(n, 1e5)},
+                        index=pd.date_range("2022-01-03", periods=n, freq="D", tz="UTC"))
+
+
+class _Cache:
+    def __enter__(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        set_backtest_cache(Path(self.tmp.name) / "bt.sqlite")
+        clear_backtest_cache()
+        return Path(self.tmp.name)
+
+    def __exit__(self, *exc):
+        set_backtest_cache(DEFAULT_DB)
+        self.tmp.cleanup()
+
+
+def _run(tmp, strategy=STRATEGY, df=None, **kw):
+    return bt.run_strategy_backtest("AAA", "1d", strategy, output_dir=tmp / "out",
+                                    df_override=_prices() if df is None else df, **kw)
+
+
+def test_hit_returns_same_metrics_and_outputs_without_simulating():
+    with _Cache() as tmp:
+        first = _run(tmp)
+        csv = (tmp / "out" / "AAA" / "1d" / "rsi_macd_classic_v2.csv").read_text()
+        js = (tmp / "out" / "AAA" / "1d" / "rsi_macd_classic_v2_metrics.json").read_text()
+        (tmp / "out").rename(tmp / "first")
+
+        def no_sim(*args, **kwargs):
+            raise AssertionError("a cache hit must not simulate")
+
+        orig = bt.simulate_signals
+        bt.simulate_signals = no_sim
+        try:
+            second = _run(tmp)
+        finally:
+            bt.simulate_signals = orig
+        curve, cached_curve = first.pop("equity_curve"), second.pop("equity_curve")
+        assert json.dumps(second, sort_keys=True) == json.dumps(first, sort_keys=True)
+        pd.testing.assert_series_equal(cached_curve.to_series(), curve.to_series())
+        assert (tmp / "out" / "AAA" / "1d" / "rsi_macd_classic_v2.csv").read_text() == csv
+        assert (tmp / "out" / "AAA" / "1d" / "rsi_macd_classic_v2_metrics.json").read_text() == js
+        info = backtest_cache_info()
+        assert (info["hits"], info["misses"], info["stores"], info["entries"]) == (1, 1, 1, 1)
+        assert info["lifetime_hits"] == 1 and info["hit_rate"] == 0.5
+
+
+def test_key_covers_strategy_kwargs_and_data():
+    with _Cache() as tmp:
+        df = _prices()
+        base = backtest_cache_key("strategy", "AAA", "1d", STRATEGY, df, per_signal_amount=0)
+        reordered = dict(reversed(list(STRATEGY.items())))
+        assert backtest_cache_key("strategy", "AAA", "1d", reordered, df, per_signal_amount=0) == base
+        tweaked = copy.deepcopy(STRATEGY)
+        tweaked["indicators"]["rsi"]["params"]["period"] = 9
+        bumped = df.copy()
+        bumped.iloc[-1, bumped.columns.get_loc("Close")] *= 1.01
+        others = [
+            backtest_cache_key("strategy", "AAA", "1d", tweaked, df, per_signal_amount=0),
+            backtest_cache_key("strategy", "AAA", "1d", STRATEGY, df, per_signal_amount=500),
+            backtest_cache_key("strategy", "AAA", "1d", STRATEGY, bumped, per_signal_amount=0),
+            backtest_cache_key("strategy", "BBB", "1d", STRATEGY, df, per_signal_amount=0),
+            backtest_cache_key("leaps", "AAA", "1d", STRATEGY, df, per_signal_amount=0),
+        ]
+        assert base not in others and len(set(others)) == len(others)
+
+
+def test_uncacheable_and_disabled_runs_always_simulate():
+    with _Cache() as tmp:
+        news = copy.deepcopy(STRATEGY)
+        news["indicators"]["news_sentiment"] = {"params": {}}
+        assert backtest_cache_key("strategy", "AAA", "1d", news, _prices()) is None
+        _run(tmp, use_cache=False)
+        _run(tmp, use_cache=False)
+        info = backtest_cache_info()
+        assert info["hits"] == 0 and info["entries"] == 0 and info["uncacheable"] == 1
+
+
+if __name__ == "__main__":
+    fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    failed = 0
+    for fn in fns:
+        try:
+            fn()
+            print(f"  ok  {fn.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"FAIL  {fn.__name__}: {e}")
+    print(f"\n{len(fns) - failed}/{len(fns)} passed")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,161 @@
+"""Array metrics (backtest/metrics.py) and the vectorized buy-and-hold benchmark.
+
+Run standalone:   python dev/test_backtest_metrics.py
+Or with pytest:   pytest dev/test_backtest_metrics.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from stonkslib.backtest.metrics import max_drawdown, performance_stats, return_pct
+from stonkslib.backtest.strategy import run_buy_and_hold
+
+
+# Reference copies of the pre-vectorization code (strategy.py).
+def _max_dd_ref(eq_vals):
+    max_dd = 0.0
+    if eq_vals:
+        peak = eq_vals[0]
+        for v in eq_vals:
+            peak = max(peak, v)
+            dd = (peak - v) / peak if peak > 0 else 0
+            max_dd = max(max_dd, dd)
+    return max_dd
+
+
+def _buy_and_hold_ref(df, start_cash=10000, slippage=0.0005, dca_amount=0, dca_bars=0):
+    cash = float(start_cash)
+    pos  = 0.0
+    total_invested  = float(start_cash)
+    n_contributions = 0
+    equity_curve    = []
+    for idx, (i, row) in enumerate(df.iterrows()):
+        open_price = row.get("Open")
+        close      = row.get("Close")
+        if dca_amount > 0 and dca_bars > 0 and idx > 0 and idx % dca_bars == 0:
+            if open_price and not pd.isna(open_price):
+                cash           += float(dca_amount)
+                total_invested += float(dca_amount)
+                n_contributions += 1
+        if open_price and not pd.isna(open_price) and cash > 0:
+            fill = float(open_price) * (1 + slippage)
+            pos  += cash / fill
+            cash  = 0.0
+        if close is None or pd.isna(close):
+            continue
+        equity_curve.append({"date": str(i), "value": round(pos * float(close), 2)})
+    final_value = 0.0
+    if pos > 0:
+        fill        = float(df["Close"].iloc[-1]) * (1 - slippage)
+        final_value = pos * fill
+    pnl   = final_value - total_invested
+    label = f"Buy & Hold + DCA (×{n_contributions})" if n_contributions > 0 else "Buy & Hold"
+    return {
+        "strategy":       label,
+        "net_pnl":        round(pnl, 2),
+        "trades":         1 + n_contributions,
+        "win_rate":       1.0 if pnl > 0 else 0.0,
+        "max_drawdown":   round(_max_dd_ref([e["value"] for e in equity_curve]), 4),
+        "start_cash":     start_cash,
+        "total_invested": round(total_invested, 2),
+        "final_cash":     round(final_value, 2),
+        "equity_curve":   equity_curve,
+    }
+
+
+def _frame(n, seed, holes=False):
+    rng = np.random.default_rng(seed)
+    close = 40 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    open_ = close * (1 + rng.normal(0, 0.005, n))
+    if holes:
+        open_[:3] = np.nan
+        open_[rng.choice(n, n // 15, replace=False)] = np.nan
+        close[rng.choice(n, n // 20, replace=False)] = np.nan
+        open_[10] = 0.0
+    return pd.DataFrame({"Open": open_, "High": open_, "Low": close, "Close": close,
+                         "Volume": np.full(n, 1e5)},
+                        index=pd.date_range("2019-01-01", periods=n, freq="B", tz="UTC"))
+
+
+def test_max_drawdown_matches_loop():
+    rng = np.random.default_rng(0)
+    curves = [[], [0.0, 0.0, 5.0], [100.0, 90.0, 120.0, 60.0, 130.0],
+              (10_000 * np.exp(np.cumsum(rng.normal(0, 0.02, 2000)))).round(2).tolist()]
+    for vals in curves:
+        assert max_drawdown(vals) == _max_dd_ref(vals)
+    matrix = np.column_stack([curves[3], curves[3][::-1]])
+    assert list(max_drawdown(matrix)) == [_max_dd_ref(curves[3]), _max_dd_ref(curves[3][::-1])]
+
+
+def test_buy_and_hold_matches_row_loop():
+    cases = [dict(), dict(start_cash=5_000, dca_amount=250, dca_bars=21),
+             dict(slippage=0.002, dca_amount=100, dca_bars=5), dict(start_cash=0, dca_amount=50, dca_bars=10)]
+    for seed in range(4):
+        for holes in (False, True):
+            df = _frame(700, seed, holes)
+            for case in cases:
+                ref = _buy_and_hold_ref(df, **case)
+                got = run_buy_and_hold(df, **case)
+                for key, value in ref.items():
+                    if key == "equity_curve":
+                        series = got["equity_curve"].to_series()
+                        assert [str(d) for d in series.index] == [e["date"] for e in value]
+                        np.testing.assert_array_equal(
+                            series.to_numpy(), np.float32([e["value"] for e in value]))
+                    else:
+                        assert got[key] == value or (np.isnan(got[key]) and np.isnan(value)), \
+                            (key, got[key], value)
+
+
+def test_performance_stats():
+    idx = pd.date_range("2020-01-01", periods=253, freq="B", tz="UTC")
+    flat = performance_stats(idx, np.full(253, 100.0))
+    assert (flat["sharpe"], flat["sortino"], flat["cagr"], flat["exposure"]) == (0.0, 0.0, 0.0, 1.0)
+
+    rng = np.random.default_rng(1)
+    rets = rng.normal(0.002, 0.01, 252)
+    values = 100 * np.concatenate([[1.0], np.cumprod(1 + rets)])
+    stats = performance_stats(idx, values, held=np.arange(253) % 2 == 0)
+    per_year = 252 / ((idx[-1] - idx[0]).days / 365.25)
+    assert abs(stats["sharpe"] - rets.mean() / rets.std(ddof=1) * np.sqrt(per_year)) < 1e-3
+    assert stats["sortino"] > stats["sharpe"] and stats["exposure"] == round(127 / 253, 4)
+    years = (idx[-1] - idx[0]).days / 365.25
+    assert abs(stats["cagr"] - ((values[-1] / 100) ** (1 / years) - 1)) < 1e-4
+
+    # A contribution is new money, not a gain: doubling the account by depositing
+    # leaves the time-weighted return flat.
+    deposit = performance_stats(idx[:3], [100.0, 200.0, 200.0], flows=[0, 100.0, 0])
+    assert deposit["cagr"] == 0.0 and deposit["sharpe"] == 0.0
+    assert return_pct({"net_pnl": 50, "total_invested": 200}) == 25.0
+    assert return_pct({"net_pnl": 50, "total_invested": 0}) == 0.0
+
+
+def test_buy_and_hold_speed():
+    df = _frame(5_000, 7)
+    t0 = time.perf_counter()
+    _buy_and_hold_ref(df, dca_amount=100, dca_bars=21)
+    t1 = time.perf_counter()
+    run_buy_and_hold(df, dca_amount=100, dca_bars=21)
+    t2 = time.perf_counter()
+    print(f"    buy & hold (5000 bars): loop {(t1 - t0) * 1e3:.0f} ms → arrays {(t2 - t1) * 1e3:.1f} ms")
+    assert t2 - t1 < t1 - t0
+
+
+if __name__ == "__main__":
+    fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    failed = 0
+    for fn in fns:
+        try:
+            fn()
+            print(f"  ok  {fn.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"FAIL  {fn.__name__}: {e}")
+    print(f"\n{len(fns) - failed}/{len(fns)} passed")
+    sys.exit(1 if failed else 0)
@@ -12,9 +12,12 @@ import pandas as pd
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+import ast
+
 from stonkslib.strategies.engine import (
-    eval_expr, build_namespace, entry_signals, exit_signals,
-    vote_signals, validate_strategy, ExprError,
+    eval_expr, compile_expr, build_namespace, entry_signals, exit_signals,
+    vote_signals, confluence_scores, evaluate_strategy, validate_strategy, ExprError,
+    _FUNCS, _CMP, _BIN, _and, _or,
 )
 
 
@@ -118,6 +121,143 @@ def test_validate_strategy():
     assert validate_strategy({"indicators": {"rsi": {}}, "entry": "rsi < bar"})
 
 
+# ── reference: the recursive tree-walker compile_expr replaced ────────────────
+def _walk(node, ns):
+    if isinstance(node, ast.Expression):
+        return _walk(node.body, ns)
+    if isinstance(node, ast.BoolOp):
+        vals = [_walk(v, ns) for v in node.values]
+        if isinstance(node.op, ast.And):
+            return _and(vals)
+        if isinstance(node.op, ast.Or):
+            return _or(vals)
+        raise ExprError(f"Unsupported boolean op: {type(node.op).__name__}")
+    if isinstance(node, ast.UnaryOp):
+        val = _walk(node.operand, ns)
+        if isinstance(node.op, ast.Not):
+            return ~val if isinstance(val, pd.Series) else (not val)
+        if isinstance(node.op, ast.USub):
+            return -val
+        if isinstance(node.op, ast.UAdd):
+            return +val
+        raise ExprError(f"Unsupported unary op: {type(node.op).__name__}")
+    if isinstance(node, ast.BinOp):
+        op = _BIN.get(type(node.op))
+        if op is None:
+            raise ExprError(f"Unsupported binary op: {type(node.op).__name__}")
+        return op(_walk(node.left, ns), _walk(node.right, ns))
+    if isinstance(node, ast.Compare):
+        left = _walk(node.left, ns)
+        result = None
+        for op, comp in zip(node.ops, node.comparators):
+            fn = _CMP.get(type(op))
+            if fn is None:
+                raise ExprError(f"Unsupported comparison: {type(op).__name__}")
+            right = _walk(comp, ns)
+            piece = fn(left, right)
+            result = piece if result is None else (result & piece)
+            left = right
+        return result
+    if isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id not in _FUNCS:
+            raise ExprError("Only whitelisted functions may be called")
+        if node.keywords:
+            raise ExprError("Keyword arguments are not allowed in expressions")
+        return _FUNCS[node.func.id](*[_walk(a, ns) for a in node.args])
+    if isinstance(node, ast.Name):
+        if node.id not in ns:
+            raise ExprError(f"Unknown name in expression: '{node.id}'")
+        return ns[node.id]
+    if isinstance(node, ast.Constant):
+        if isinstance(node.value, (int, float, bool)):
+            return node.value
+        raise ExprError(f"Unsupported constant: {node.value!r}")
+    raise ExprError(f"Disallowed expression syntax: {type(node).__name__}")
+
+
+def _outcome(fn):
+    try:
+        return "ok", fn()
+    except ExprError as e:
+        return "err", str(e)
+
+
+def test_compiled_matches_tree_walk():
+    idx = pd.date_range("2024-01-01", periods=10, freq="D")
+    ns = _ns(idx)
+    exprs = [
+        "rsi < 30 and macd > 0", "20 < rsi < 70", "not (rsi > 70) or close >= 100",
+        "crossover(close, 100)", "crossunder(macd, 0) and rising(close, 2)",
+        "falling(rsi)", "-macd > 0.5", "+macd != 0", "(close - 100) * 2 / 3 > 1",
+        "abs(macd) > 1", "max(1, 2) == 2", "not True", "1 < 2 < 3", "rsi == rsi",
+        # error precedence: which problem surfaces first must not change
+        "foo + 'x'", "'x' + foo", "rsi ** 2 + foo", "foo < rsi in close",
+        "rsi < close is macd", "~rsi", "~foo", "rsi.mean()", "__import__('os')",
+        "crossover(a=rsi, b=1)", "crossover(foo, bar)", "rsi if foo else macd",
+        "[rsi]", "close @ macd", "lambda: 1", "rsi < 30 and foo", "1 < foo < 'x'",
+    ]
+    for expr in exprs:
+        ref = _outcome(lambda: _walk(ast.parse(expr, mode="eval"), ns))
+        got = _outcome(lambda: eval_expr(expr, ns))
+        assert ref[0] == got[0], expr
+        if ref[0] == "err":
+            assert ref[1] == got[1], (expr, ref[1], got[1])
+        elif isinstance(ref[1], pd.Series):
+            pd.testing.assert_series_equal(got[1], ref[1])
+        else:
+            assert got[1] == ref[1], expr
+
+
+def test_compile_is_memoized():
+    assert compile_expr("rsi < 30") is compile_expr("rsi < 30")
+    for bad in ("", "   ", "rsi <", None):
+        try:
+            compile_expr(bad)
+        except ExprError:
+            continue
+        raise AssertionError(f"{bad!r} should raise ExprError")
+
+
+def test_shared_subexpressions_computed_once():
+    idx = pd.date_range("2024-01-01", periods=10, freq="D")
+    ns = _ns(idx)
+    memo = {}
+    a = eval_expr("rsi < 30", ns, memo)
+    eval_expr("macd > 0 and (rsi   < 30)", ns, memo)   # same node, different spelling
+    key = ast.dump(ast.parse("rsi < 30", mode="eval").body)
+    assert memo[key] is a
+    co = eval_expr("crossover(macd, 0)", ns, memo)
+    cu = eval_expr("crossunder(macd, 0)", ns, memo)
+    macd_key = ast.dump(ast.parse("macd", mode="eval").body)
+    assert sum(1 for k in memo if isinstance(k, tuple) and k == ("prev", macd_key)) == 1
+    pd.testing.assert_series_equal(co, eval_expr("crossover(macd, 0)", ns))
+    pd.testing.assert_series_equal(cu, eval_expr("crossunder(macd, 0)", ns))
+
+
+def test_evaluate_strategy_matches_separate_calls():
+    df = _synthetic_df(200)
+    strategy = {
+        "version": 2,
+        "indicators": {"rsi": {}, "macd": {}, "bollinger": {}},
+        "entry": "crossover(macd, macd_signal) and rsi < 60",
+        "exit": "crossunder(macd, macd_signal) or rsi > 70",
+        "confluence": {"weights": {"rsi": 2.0}},
+    }
+    ns = build_namespace(df, strategy)
+    plan = evaluate_strategy(df, strategy, ns)
+    pd.testing.assert_series_equal(plan["entry"], entry_signals(df, strategy, ns))
+    pd.testing.assert_series_equal(plan["exit"], exit_signals(df, strategy, ns))
+    votes = vote_signals(df, strategy, ns)
+    for direction in ("BUY", "SELL"):
+        assert plan["votes"][direction].keys() == votes[direction].keys()
+        for src in votes[direction]:
+            pd.testing.assert_series_equal(plan["votes"][direction][src], votes[direction][src])
+    buy, sell = confluence_scores(df, strategy, ns)
+    pd.testing.assert_series_equal(plan["buy_score"], buy)
+    pd.testing.assert_series_equal(plan["sell_score"], sell)
+    assert "votes" not in evaluate_strategy(df, strategy, ns, votes=False)
+
+
 if __name__ == "__main__":
     fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
     failed = 0
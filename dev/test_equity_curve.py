@@ -0,0 +1,82 @@
+"""Compact equity curves: scalar-only metrics JSON, parquet sidecar, lazy loading.
+
+Run standalone:   python dev/test_equity_curve.py
+Or with pytest:   pytest dev/test_equity_curve.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from stonkslib.backtest.equity import EquityCurve, load_equity_curve
+from stonkslib.backtest.strategy import run_strategy_backtest, run_buy_and_hold, load_strategy
+
+STRATEGY = load_strategy(os.path.join(os.path.dirname(__file__), "..", "stonkslib",
+                                      "strategies", "rsi_macd_v2.yaml"))
+
+
+def _prices(n=500, seed=5):
+    rng = np.random.default_rng(seed)
+    close = 80 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    close[[50, 51, 300]] = np.nan
+    open_ = close * (1 + rng.normal(0, 0.004, n))
+    return pd.DataFrame({"Open": open_, "High": open_, "Low": close, "Close": close,
+                         "Volume": np.full(n, 1e5)},
+                        index=pd.date_range("2020-01-01", periods=n, freq="B", tz="UTC"))
+
+
+def test_metrics_json_is_scalars_and_curve_loads_lazily():
+    df = _prices()
+    with tempfile.TemporaryDirectory() as tmp:
+        m = run_strategy_backtest("AAA", "1d", STRATEGY, output_dir=tmp, df_override=df,
+                                  use_cache=False)
+        path = Path(tmp) / "AAA" / "1d" / "rsi_macd_classic_v2_metrics.json"
+        saved = json.loads(path.read_text())
+        assert not any(isinstance(v, (list, dict)) for v in saved.values())
+        assert saved["equity_file"] == "rsi_macd_classic_v2_equity.parquet"
+        curve = load_equity_curve(path)
+    assert len(curve) == len(m["equity_curve"]) == int(df["Close"].notna().sum())
+    assert curve.values.dtype == np.float32
+    pd.testing.assert_series_equal(curve.to_series(), m["equity_curve"].to_series())
+    assert curve.index.equals(df.index[df["Close"].notna()])
+
+
+def test_old_inline_metrics_still_load():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "x_metrics.json"
+        path.write_text(json.dumps({"net_pnl": 1.0, "equity_curve": [
+            {"date": "2024-01-02 00:00:00+00:00", "value": 10000.0},
+            {"date": "2024-01-03 00:00:00+00:00", "value": 10012.34}]}))
+        curve = load_equity_curve(path)
+        assert load_equity_curve(Path(tmp) / "missing_metrics.json") is None
+    np.testing.assert_allclose(curve.values, [10000.0, 10012.34], atol=0.005)
+    assert str(curve.index[1]) == "2024-01-03 00:00:00+00:00"
+
+
+def test_payload_round_trip_and_buy_and_hold():
+    bh = run_buy_and_hold(_prices(), start_cash=5_000, dca_amount=100, dca_bars=20)
+    curve = bh["equity_curve"]
+    back = EquityCurve.from_payload(json.loads(json.dumps(curve.to_payload())))
+    pd.testing.assert_series_equal(back.to_series(), curve.to_series())
+    assert list(curve.to_frame().columns) == ["date", "value"] and len(curve) == 497
+
+
+if __name__ == "__main__":
+    fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    failed = 0
+    for fn in fns:
+        try:
+            fn()
+            print(f"  ok  {fn.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"FAIL  {fn.__name__}: {e}")
+    print(f"\n{len(fns) - failed}/{len(fns)} passed")
+    sys.exit(1 if failed else 0)
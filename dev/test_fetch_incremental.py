@@ -0,0 +1,205 @@
+"""Tests for the raw fetch: incremental tail-append, sidecar index, batched downloads.
+
+yf.download is replaced (via fetch_all's `downloader=`) with an in-memory stand-in,
+so nothing touches the network.
+
+Run standalone:   python dev/test_fetch_incremental.py
+Or with pytest:   pytest dev/test_fetch_incremental.py
+"""
+
+import logging
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import stonkslib.fetch.td as td
+from stonkslib.fetch.guard import read_index
+from stonkslib.fetch.throttle import TokenBucket
+
+# fetch/td.py points the root logger at the repo's log/fetch.log on import; keep test
+# runs out of it.
+for _h in [h for h in logging.getLogger().handlers if isinstance(h, logging.FileHandler)
+           and Path(h.baseFilename).parent == td.PROJECT_ROOT / "log"]:
+    logging.getLogger().removeHandler(_h)
+    _h.close()
+
+
+class _FakeYahoo:
+    """Daily bars ending yesterday for any symbol; records how each download was requested.
+
+    Multi-symbol requests come back like yfinance's group_by="ticker" layout:
+    (Ticker, Price) columns.
+    """
+
+    def __init__(self, end_offset_days=1, missing=()):
+        end = pd.Timestamp.now().normalize() - pd.Timedelta(days=end_offset_days)
+        self.index = pd.date_range(end=end, periods=400, freq="D", name="Date")
+        self.missing = set(missing)
+        self.trim = 0
+        self.calls = []
+
+    def bars(self, ticker):
+        px = 100 + np.arange(len(self.index), dtype=float) + 7 * (ord(ticker[0]) - ord("A"))
+        df = pd.DataFrame(np.column_stack([px, px + 1, px - 1, px, px * 10]), index=self.index,
+                          columns=["Close", "High", "Low", "Open", "Volume"])
+        return df.iloc[:len(df) - self.trim]
+
+    def download(self, tickers, interval=None, period=None, start=None, group_by=None, progress=False):
+        self.calls.append({"tickers": list(tickers), "period": period, "start": start})
+        parts = {}
+        for t in tickers:
+            if t in self.missing:
+                continue
+            df = self.bars(t)
+            if start is not None:
+                df = df[df.index >= pd.Timestamp(start).tz_localize(None)]
+            parts[t] = df
+        if not parts:
+            return pd.DataFrame()
+        return pd.concat(parts, axis=1, names=["Ticker", "Price"])
+
+
+def _run(tmp, fake, tickers=("AAA",), **kwargs):
+    yaml_file = Path(tmp) / "tickers.yaml"
+    yaml_file.write_text("stocks:\n" + "".join(f"  - {t}\n" for t in tickers))
+    bucket = kwargs.pop("throttle", None) or TokenBucket(rate=1e6, capacity=1e6, sleep=lambda s: None)
+    td.fetch_all(yaml_file=yaml_file, data_dir=Path(tmp) / "raw", tickers=list(tickers),
+                 only_intervals=["1d"], downloader=fake.download, throttle=bucket, **kwargs)
+    return Path(tmp) / "raw" / tickers[0] / "1d.csv"
+
+
+def test_full_then_tail_append_matches_full_download():
+    with tempfile.TemporaryDirectory() as tmp:
+        fake = _FakeYahoo()
+        first = _FakeYahoo()
+        first.trim = 5                              # first run: history stops 5 days early
+        csv = _run(tmp, first)
+        meta = read_index(csv)
+        assert meta["rows"] == 395 and meta["header_lines"] == 3
+
+        _run(tmp, fake)                             # second run appends only the tail
+        assert fake.calls[-1]["start"] is not None and fake.calls[-1]["period"] is None
+        meta = read_index(csv)
+        assert meta["rows"] == 400
+        assert meta["last"] == fake.index[-1].tz_localize("UTC")
+
+        # The appended file reads exactly like a fresh full-period download.
+        got = pd.read_csv(csv, skiprows=[1, 2], index_col=0)
+        with tempfile.TemporaryDirectory() as tmp2:
+            fresh = pd.read_csv(_run(tmp2, _FakeYahoo()), skiprows=[1, 2], index_col=0)
+        pd.testing.assert_frame_equal(got, fresh)
+
+
+def test_up_to_date_file_is_not_refetched():
+    with tempfile.TemporaryDirectory() as tmp:
+        fake = _FakeYahoo(end_offset_days=0)
+        csv = _run(tmp, fake)
+        n_calls = len(fake.calls)
+        size = csv.stat().st_size
+        _run(tmp, fake)
+        assert csv.stat().st_size == size
+        assert len(fake.calls) <= n_calls + 1
+
+
+def test_batched_download_splits_into_per_ticker_files():
+    tickers = ("AAA", "BBB", "CCC", "DDD", "EEE")
+    with tempfile.TemporaryDirectory() as tmp:
+        fake = _FakeYahoo(missing={"DDD"})
+        _run(tmp, fake, tickers=tickers, batch_size=2)
+        # 5 tickers in batches of 2 → 3 requests, not 5.
+        assert [c["tickers"] for c in fake.calls] == [["AAA", "BBB"], ["CCC", "DDD"], ["EEE"]]
+        raw = Path(tmp) / "raw"
+        assert not (raw / "DDD" / "1d.csv").exists()
+        for t in ("AAA", "BBB", "CCC", "EEE"):
+            # Each file is byte-identical to a single-ticker fetch of the same symbol.
+            with tempfile.TemporaryDirectory() as tmp2:
+                alone = _run(tmp2, _FakeYahoo(), tickers=(t,))
+                assert (raw / t / "1d.csv").read_bytes() == alone.read_bytes()
+            assert read_index(raw / t / "1d.csv")["rows"] == 400
+
+        # Stale tails are batched too: one request from the oldest last bar.
+        with tempfile.TemporaryDirectory() as tmp3:
+            first = _FakeYahoo(end_offset_days=3)  # 2 bars behind the next run
+            _run(tmp3, first, tickers=("AAA", "BBB"))
+            tail = _FakeYahoo()
+            _run(tmp3, tail, tickers=("AAA", "BBB"))
+            assert len(tail.calls) == 1 and tail.calls[0]["start"] is not None
+            assert tail.calls[0]["tickers"] == ["AAA", "BBB"]
+            assert read_index(Path(tmp3) / "raw" / "BBB" / "1d.csv")["rows"] == 402
+
+
+class _Records(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def test_failed_batch_is_reported_not_skipped():
+    with tempfile.TemporaryDirectory() as tmp:
+        csv = _run(tmp, _FakeYahoo(end_offset_days=3), tickers=("AAA", "BBB"))
+        size = csv.stat().st_size
+
+        class Offline:
+            def download(self, *args, **kwargs):
+                raise ConnectionError("offline")
+
+        records = _Records()
+        td.logger.addHandler(records)
+        bucket = TokenBucket(rate=8.0, capacity=1e6, sleep=lambda s: None)
+        try:
+            _run(tmp, Offline(), tickers=("AAA", "BBB"), throttle=bucket)
+        finally:
+            td.logger.removeHandler(records)
+        assert csv.stat().st_size == size and bucket.rate == 4.0
+        assert not [m for m in records.messages if "up-to-date" in m]
+        assert len([m for m in records.messages if m.startswith("[!] Fetch failed for")]) == 2
+
+        # A tail request that comes back empty is just current data: no backoff.
+        current = _FakeYahoo(missing={"AAA", "BBB"})
+        bucket = TokenBucket(rate=8.0, capacity=1e6, sleep=lambda s: None)
+        _run(tmp, current, tickers=("AAA", "BBB"), throttle=bucket)
+        assert current.calls[-1]["start"] is not None and bucket.rate == 8.0
+
+
+def test_token_bucket_backs_off_and_recovers():
+    now = [0.0]
+    slept = []
+
+    def sleep(s):
+        slept.append(s)
+        now[0] += s
+
+    bucket = TokenBucket(rate=4.0, capacity=1.0, clock=lambda: now[0], sleep=sleep)
+    bucket.acquire()
+    bucket.acquire()                               # bucket empty → waits 1/rate
+    assert abs(slept[-1] - 0.25) < 1e-9
+    bucket.backoff()
+    assert bucket.rate == 2.0
+    bucket.acquire()
+    assert abs(slept[-1] - 0.5) < 1e-9
+    for _ in range(20):
+        bucket.recover()
+    assert bucket.rate == 4.0
+
+
+if __name__ == "__main__":
+    fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    failed = 0
+    for fn in fns:
+        try:
+            fn()
+            print(f"  ok  {fn.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"FAIL  {fn.__name__}: {e}")
+    print(f"\n{len(fns) - failed}/{len(fns)} passed")
+    sys.exit(1 if failed else 0)
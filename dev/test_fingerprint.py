@@ -0,0 +1,96 @@
+"""Tests for the skip-unchanged input fingerprints of the analyze/merge stages.
+
+Run standalone:   python dev/test_fingerprint.py
+Or with pytest:   pytest dev/test_fingerprint.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from stonkslib.utils.fingerprint import inputs_unchanged, write_stamp
+import stonkslib.merge.by_patterns as by_patterns
+
+
+def _prices(n=50, bump=0.0):
+    idx = pd.date_range("2024-01-01", periods=n, freq="D", tz="UTC", name="date")
+    px = 100 + np.arange(n, dtype=float) + bump
+    return pd.DataFrame({"open": px, "high": px + 1, "low": px - 1, "close": px, "volume": px * 10},
+                        index=idx)
+
+
+def test_identical_rewrite_counts_as_unchanged():
+    with tempfile.TemporaryDirectory() as tmp:
+        pq = Path(tmp) / "1d.parquet"
+        stamp = Path(tmp) / ".inputs.json"
+        _prices().to_parquet(pq)
+
+        unchanged, _, fp = inputs_unchanged(stamp, [pq])
+        assert not unchanged                       # no stamp yet
+        write_stamp(stamp, fp)
+        assert inputs_unchanged(stamp, [pq])[0]
+
+        # clean_td rewrites the parquet every run: new mtime, same bytes → still unchanged.
+        time.sleep(0.01)
+        _prices().to_parquet(pq)
+        os.utime(pq, ns=(time.time_ns(), time.time_ns() + 10**9))
+        assert inputs_unchanged(stamp, [pq])[0]
+
+        _prices(bump=0.5).to_parquet(pq)           # new data → changed
+        assert not inputs_unchanged(stamp, [pq])[0]
+
+        pq.unlink()                                # input gone → changed
+        assert not inputs_unchanged(stamp, [pq])[0]
+
+
+def test_pattern_merge_skips_unchanged_inputs():
+    with tempfile.TemporaryDirectory() as tmp:
+        old_in, old_out = by_patterns.INPUT_BASE, by_patterns.OUTPUT_BASE
+        by_patterns.INPUT_BASE = Path(tmp) / "signals"
+        by_patterns.OUTPUT_BASE = Path(tmp) / "merged"
+        try:
+            src = by_patterns.INPUT_BASE / "AAA" / "1d"
+            src.mkdir(parents=True)
+            pd.DataFrame({"start": ["2024-01-02"], "end": ["2024-01-09"], "pattern": ["double_top"],
+                          "confidence": [0.8]}).to_csv(src / "doubles.csv")
+            out = by_patterns.OUTPUT_BASE / "AAA" / "1d.csv"
+
+            by_patterns.merge_patterns_for_ticker_interval("AAA", "1d")
+            first = out.stat().st_mtime_ns
+            time.sleep(0.01)
+            by_patterns.merge_patterns_for_ticker_interval("AAA", "1d")
+            assert out.stat().st_mtime_ns == first   # skipped
+
+            by_patterns.merge_patterns_for_ticker_interval("AAA", "1d", rebuild=True)
+            assert out.stat().st_mtime_ns != first   # forced
+
+            rebuilt = out.stat().st_mtime_ns
+            time.sleep(0.01)
+            pd.DataFrame({"start": ["2024-02-02"], "end": ["2024-02-09"], "pattern": ["wedge"],
+                          "confidence": [0.6]}).to_csv(src / "wedges.csv")
+            by_patterns.merge_patterns_for_ticker_interval("AAA", "1d")
+            assert out.stat().st_mtime_ns != rebuilt  # new input file → re-merged
+            assert len(pd.read_csv(out)) == 2
+        finally:
+            by_patterns.INPUT_BASE, by_patterns.OUTPUT_BASE = old_in, old_out
+
+
+if __name__ == "__main__":
+    fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    failed = 0
+    for fn in fns:
+        try:
+            fn()
+            print(f"  ok  {fn.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"FAIL  {fn.__name__}: {e}")
+    print(f"\n{len(fns) - failed}/{len(fns)} passed")
+    sys.exit(1 if failed else 0)
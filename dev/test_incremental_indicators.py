@@ -0,0 +1,136 @@
+"""Tail-only indicator updates: appending bars must match a full recompute.
+
+Run standalone:   python dev/test_incremental_indicators.py
+Or with pytest:   pytest dev/test_incremental_indicators.py
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import stonkslib.analysis.signals as signals
+from stonkslib.analysis.incremental import STATE_NAME, load_state
+
+
+def _prices(n, seed=7):
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2015-01-01", periods=n, freq="D", tz="UTC", name="date")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    df = pd.DataFrame({"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close,
+                       "Volume": rng.integers(1_000, 100_000, n).astype(float)}, index=idx)
+    df.attrs["ticker"] = "AAA"
+    return df
+
+
+class _Env:
+    """Point aggregate_and_save at a temp analysis dir and an in-memory price frame."""
+
+    def __init__(self, tmp):
+        self.tmp = Path(tmp)
+        self.df = None
+        self.saved = {}
+
+    def __enter__(self):
+        self.saved = {k: getattr(signals, k) for k in
+                      ("BASE_ANALYSIS_DIR", "DEFAULT_CLEAN_DIR", "load_td", "find_doubles",
+                       "find_triangles", "find_wedges", "find_head_shoulders")}
+        signals.BASE_ANALYSIS_DIR = str(self.tmp / "signals")
+        signals.DEFAULT_CLEAN_DIR = self.tmp / "clean"
+        signals.load_td = lambda tickers, interval: {tickers[0]: self.df}
+        for k in ("find_doubles", "find_triangles", "find_wedges", "find_head_shoulders"):
+            setattr(signals, k, lambda ticker, interval: [])
+        return self
+
+    def __exit__(self, *exc):
+        for k, v in self.saved.items():
+            setattr(signals, k, v)
+
+    def run(self, df, **kwargs):
+        self.df = df
+        # A fresh parquet each run so the unchanged-input stamp doesn't short-circuit.
+        pq = self.tmp / "clean" / "AAA" / "1d.parquet"
+        pq.parent.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(pq)
+        return signals.aggregate_and_save("AAA", "1d", **kwargs)
+
+    def read(self, name):
+        path = self.tmp / "signals" / "AAA" / "1d" / f"{name}.csv"
+        return pd.read_csv(path, index_col=0) if path.exists() else None
+
+
+FILES = ["rsi_14", "rsi_14_signals", "macd", "macd_signals", "bollinger", "bollinger_signals",
+         "obv", "obv_signals", "ma_double", "ma_double_signals", "ma_triple", "ma_triple_signals"]
+
+
+def _assert_same(got, ref, name):
+    assert list(got.columns) == list(ref.columns), name
+    assert list(got.index) == list(ref.index), name
+    for col in ref.columns:
+        if ref[col].dtype.kind == "f":
+            np.testing.assert_allclose(got[col], ref[col], rtol=1e-9, atol=1e-9, err_msg=name)
+        else:
+            assert (got[col].fillna("") == ref[col].fillna("")).all(), name
+
+
+def test_appended_bars_match_full_recompute():
+    full_df = _prices(1500)
+    with tempfile.TemporaryDirectory() as a, tempfile.TemporaryDirectory() as b:
+        with _Env(a) as inc:
+            inc.run(full_df.iloc[:1480])
+            assert load_state(Path(a) / "signals" / "AAA" / "1d") is not None
+            for end in (1481, 1495, 1500):          # one bar, then a few at a time
+                status = inc.run(full_df.iloc[:end], verify=True)
+                assert status["rsi"] == "ok" and status["ma_triple"] == "ok"
+            assert load_state(Path(a) / "signals" / "AAA" / "1d")["rows"] == 1500
+            got = {n: inc.read(n) for n in FILES}
+        with _Env(b) as ref_env:
+            ref_env.run(full_df)
+            ref = {n: ref_env.read(n) for n in FILES}
+    for name in FILES:
+        assert (got[name] is None) == (ref[name] is None), name
+        if ref[name] is not None:
+            _assert_same(got[name], ref[name], name)
+
+
+def test_rewritten_history_falls_back_to_full():
+    df = _prices(600)
+    with tempfile.TemporaryDirectory() as tmp:
+        with _Env(tmp) as env:
+            env.run(df.iloc[:590])
+            adjusted = df.copy()
+            adjusted[["Open", "High", "Low", "Close"]] *= 0.5   # e.g. a split adjustment
+            env.run(adjusted)
+            got = env.read("macd")
+        with tempfile.TemporaryDirectory() as tmp2, _Env(tmp2) as ref_env:
+            ref_env.run(adjusted)
+            _assert_same(got, ref_env.read("macd"), "macd")
+
+
+def test_rebuild_ignores_state():
+    df = _prices(300)
+    with tempfile.TemporaryDirectory() as tmp, _Env(tmp) as env:
+        env.run(df.iloc[:290])
+        state_file = Path(tmp) / "signals" / "AAA" / "1d" / STATE_NAME
+        env.run(df, rebuild=True)
+        assert load_state(state_file.parent)["rows"] == 300
+        assert len(env.read("rsi_14")) == 300
+
+
+if __name__ == "__main__":
+    fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    failed = 0
+    for fn in fns:
+        try:
+            fn()
+            print(f"  ok  {fn.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"FAIL  {fn.__name__}: {e}")
+    print(f"\n{len(fns) - failed}/{len(fns)} passed")
+    sys.exit(1 if failed else 0)
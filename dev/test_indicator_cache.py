@@ -0,0 +1,131 @@
+"""Tests for the indicator result cache in indicators/registry.py.
+
+Run standalone:   python dev/test_indicator_cache.py
+Or with pytest:   pytest dev/test_indicator_cache.py
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import stonkslib.indicators.registry as registry
+from stonkslib.indicators.registry import (
+    INDICATORS, compute_indicator, resolve_kwargs, clear_result_cache, result_cache_info,
+    set_result_cache_dir, frame_fingerprint,
+)
+
+
+def _df(n=400, seed=5):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    df = pd.DataFrame({"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close,
+                       "Volume": np.full(n, 1e6)},
+                      index=pd.date_range("2022-01-03", periods=n, freq="D", tz="UTC"))
+    df.attrs["ticker"] = "AAA"
+    return df
+
+
+def _fresh(key, df, kwargs):
+    return INDICATORS[key]["fn"](df.copy(), **kwargs)
+
+
+def _equal(a, b):
+    if isinstance(b, pd.Series):
+        pd.testing.assert_series_equal(a, b)
+    else:
+        pd.testing.assert_frame_equal(a, b)
+
+
+def test_memory_hits_match_fresh_results():
+    clear_result_cache()
+    df = _df()
+    for key in ("rsi", "macd", "bollinger", "supertrend", "markov"):
+        kwargs = resolve_kwargs(key, None)
+        first = compute_indicator(key, df, kwargs)
+        second = compute_indicator(key, df.copy(), kwargs)   # equal content, new object
+        _equal(first, _fresh(key, df, kwargs))
+        _equal(second, first)
+    info = result_cache_info()
+    assert info["misses"] == 5 and info["hits"] == 5
+
+
+def test_changed_data_or_params_miss():
+    clear_result_cache()
+    df = _df()
+    compute_indicator("rsi", df, {"period": 14})
+    bumped = df.copy()
+    bumped.iloc[200, bumped.columns.get_loc("Close")] *= 1.0001  # one revised close mid-history
+    assert frame_fingerprint(bumped, ["Close"]) != frame_fingerprint(df, ["Close"])
+    _equal(compute_indicator("rsi", bumped, {"period": 14}), _fresh("rsi", bumped, {"period": 14}))
+    compute_indicator("rsi", df, {"period": 10})
+    # Volume isn't an RSI input, so changing it reuses the cached RSI.
+    vol = df.copy()
+    vol["Volume"] = 1.0
+    compute_indicator("rsi", vol, {"period": 14})
+    info = result_cache_info()
+    assert info["misses"] == 3 and info["hits"] == 1
+
+
+def test_cached_results_are_read_only_copies():
+    clear_result_cache()
+    df = _df()
+    out = compute_indicator("macd", df, resolve_kwargs("macd", None))
+    try:
+        out["MACD"].to_numpy()[0] = 123.0
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("cached arrays should be read-only")
+    out["extra"] = 1.0                                      # shallow copy: caller-local
+    again = compute_indicator("macd", df, resolve_kwargs("macd", None))
+    assert "extra" not in again.columns
+
+
+def test_disk_tier_is_shared_across_processes():
+    df = _df()
+    with tempfile.TemporaryDirectory() as tmp:
+        set_result_cache_dir(tmp)
+        try:
+            clear_result_cache()
+            ref = compute_indicator("rsi", df, {"period": 14})
+            bands = compute_indicator("bollinger", df, resolve_kwargs("bollinger", None))
+            clear_result_cache()                            # simulate a new process
+            _equal(compute_indicator("rsi", df, {"period": 14}), ref)
+            _equal(compute_indicator("bollinger", df, resolve_kwargs("bollinger", None)), bands)
+            assert result_cache_info()["disk_hits"] == 2
+        finally:
+            set_result_cache_dir(None)
+
+
+def test_uncacheable_indicator_always_recomputes():
+    clear_result_cache()
+    calls = []
+    spec = INDICATORS["news_sentiment"]
+    orig = spec["fn"]
+    spec["fn"] = lambda df, **kw: calls.append(1) or pd.Series(5.0, index=df.index)
+    try:
+        df = _df(50)
+        compute_indicator("news_sentiment", df, {"lookback": 1, "shift": 1})
+        compute_indicator("news_sentiment", df, {"lookback": 1, "shift": 1})
+    finally:
+        spec["fn"] = orig
+    assert len(calls) == 2 and registry.result_cache_info()["entries"] == 0
+
+
+if __name__ == "__main__":
+    fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    failed = 0
+    for fn in fns:
+        try:
+            fn()
+            print(f"  ok  {fn.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"FAIL  {fn.__name__}: {e}")
+    print(f"\n{len(fns) - failed}/{len(fns)} passed")
+    sys.exit(1 if failed else 0)
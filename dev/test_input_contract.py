@@ -0,0 +1,115 @@
+"""Read-only input contract: load_td hands out float64 OHLCV, indicators never write to it.
+
+Run standalone:   python dev/test_input_contract.py
+Or with pytest:   pytest dev/test_input_contract.py
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import stonkslib.utils.load_td as load_td_mod
+from stonkslib.indicators.registry import INDICATORS, compute_indicator, resolve_kwargs, clear_result_cache
+from stonkslib.indicators.rsi import rsi
+from stonkslib.indicators.obv import obv
+from stonkslib.indicators.markov import markov_signals
+
+
+def _frozen(n=300, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    df = pd.DataFrame({"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close,
+                       "Volume": rng.integers(1_000, 50_000, n).astype(float)},
+                      index=pd.date_range("2023-01-02", periods=n, freq="D", tz="UTC"))
+    df.attrs["ticker"] = "AAA"
+    return load_td_mod._freeze(df)
+
+
+# Reference copies of the pre-contract implementations (copy + to_numeric + dropna).
+def _rsi_ref(df, period=14):
+    df = df.copy()
+    df["Close"] = pd.to_numeric(df["Close"], errors="coerce")
+    df = df.dropna(subset=["Close"])
+    delta = df["Close"].diff()
+    avg_gain = delta.clip(lower=0).rolling(window=period, min_periods=period).mean()
+    avg_loss = (-delta.clip(upper=0)).rolling(window=period, min_periods=period).mean()
+    return (100 - (100 / (1 + avg_gain / avg_loss))).reindex(df.index)
+
+
+def _obv_ref(df):
+    df = df.copy()
+    df["Close"] = pd.to_numeric(df["Close"], errors="coerce")
+    df["Volume"] = pd.to_numeric(df["Volume"], errors="coerce")
+    df = df.dropna(subset=["Close", "Volume"])
+    direction = np.sign(df["Close"].diff()).fillna(0)
+    return pd.DataFrame({"OBV": (direction * df["Volume"]).cumsum()}, index=df.index)
+
+
+def test_indicators_run_on_read_only_frames_without_copying():
+    clear_result_cache()
+    df = _frozen()
+    before = df.to_numpy().copy()
+    copies = []
+    orig = pd.DataFrame.copy
+
+    def counting(self, deep=True):
+        if deep and self.shape == df.shape:
+            copies.append(1)
+        return orig(self, deep=deep)
+
+    pd.DataFrame.copy = counting
+    try:
+        for key in INDICATORS:
+            if key != "news_sentiment":
+                compute_indicator(key, df, resolve_kwargs(key, None))
+    finally:
+        pd.DataFrame.copy = orig
+    assert not copies, f"{len(copies)} full-frame copies"
+    np.testing.assert_array_equal(df.to_numpy(), before)
+
+
+def test_dirty_input_matches_pre_contract_results():
+    df = _frozen().copy()
+    df = df.astype({"Close": object, "Volume": object})
+    df.iloc[40, df.columns.get_loc("Close")] = "n/a"         # junk cell → NaN → dropped
+    df.iloc[90, df.columns.get_loc("Volume")] = None
+    pd.testing.assert_series_equal(rsi(df), _rsi_ref(df))
+    pd.testing.assert_frame_equal(obv(df), _obv_ref(df))
+    mk = markov_signals(df, lookback=30)
+    assert len(mk) == len(df) - 1 and df.index[40] not in mk.index
+
+
+def test_load_td_validates_ohlcv_dtypes():
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp) / "clean"
+        (base / "AAA").mkdir(parents=True)
+        idx = pd.date_range("2024-01-01", periods=5, freq="D", tz="UTC")
+        pd.DataFrame({"open": [1, 2, 3, 4, 5], "high": [2, 3, 4, 5, 6], "low": [0, 1, 2, 3, 4],
+                      "close": ["1.5", "2.5", "bad", "4.5", "5.5"], "volume": [10, 20, 30, 40, 50]},
+                     index=idx).to_parquet(base / "AAA" / "1d.parquet")
+        load_td_mod.clear_cache()
+        df = load_td_mod.load_td(["AAA"], "1d", base_dir=base)["AAA"]
+    for col in ("Open", "High", "Low", "Close", "Volume"):
+        assert df[col].dtype == np.float64, col
+        assert not df[col].to_numpy().flags.writeable, col
+    assert np.isnan(df["Close"].iloc[2]) and df.attrs["ticker"] == "AAA"
+
+
+if __name__ == "__main__":
+    fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    failed = 0
+    for fn in fns:
+        try:
+            fn()
+            print(f"  ok  {fn.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"FAIL  {fn.__name__}: {e}")
+    print(f"\n{len(fns) - failed}/{len(fns)} passed")
+    sys.exit(1 if failed else 0)
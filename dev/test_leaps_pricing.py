@@ -0,0 +1,464 @@
+"""Array Black-Scholes pricing (backtest/black_scholes.py) and the LEAP fill loop.
+
+Run standalone:   python dev/test_leaps_pricing.py
+Or with pytest:   pytest dev/test_leaps_pricing.py
+"""
+
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import stonkslib.backtest.leaps as leaps
+from stonkslib.backtest.black_scholes import RISK_FREE_RATE, bs_greeks, bs_price
+from stonkslib.backtest.strategy import load_strategy
+
+
+# Reference copies of the scalar pricing the LEAP backtester used before.
+def _bs_price_ref(S, K, T, sigma, option_type, r=RISK_FREE_RATE):
+    if T <= 0 or sigma <= 0 or S <= 0 or K <= 0:
+        return max(S - K, 0.0) if option_type == "call" else max(K - S, 0.0)
+    d1 = (math.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * math.sqrt(T))
+    d2 = d1 - sigma * math.sqrt(T)
+    if option_type == "call":
+        return S * norm.cdf(d1) - K * math.exp(-r * T) * norm.cdf(d2)
+    else:
+        return K * math.exp(-r * T) * norm.cdf(-d2) - S * norm.cdf(-d1)
+
+
+def _bs_delta_ref(S, K, T, sigma, option_type, r=RISK_FREE_RATE):
+    if T <= 0 or sigma <= 0 or S <= 0 or K <= 0:
+        return 1.0 if option_type == "call" else -1.0
+    d1 = (math.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * math.sqrt(T))
+    return norm.cdf(d1) if option_type == "call" else norm.cdf(d1) - 1.0
+
+
+def _realized_vol_ref(close_series, window=30):
+    log_ret = np.log(close_series / close_series.shift(1))
+    return log_ret.rolling(window).std() * math.sqrt(252)
+
+
+# The position half of the old per-bar loop in run_leaps_backtest, verbatim apart
+# from reading the precomputed buy/sell signals.
+def _fills_ref(df, buy, sell, option_type, leap_days, strike_moneyness, stop_loss_pct,
+               start_cash, risk_per_trade, bar_years):
+    vol_series = _realized_vol_ref(df["Close"])
+    cash = float(start_cash)
+    contracts = 0
+    entry_premium = entry_T = entry_strike = entry_option_type = entry_bar_idx = None
+    trades = []
+    pending = None
+    pending_reason = ""
+    pending_signal = None
+    for idx in range(len(df)):
+        row = df.iloc[idx]
+        S = float(row.get("Close") or 0)
+        S_open = float(row.get("Open") or S)
+        date = df.index[idx]
+        if S <= 0:
+            continue
+        vol = float(vol_series.iloc[idx]) if not pd.isna(vol_series.iloc[idx]) else 0.30
+        vol = max(vol, 0.05)
+        if pending and S_open > 0:
+            if pending == "enter" and contracts == 0:
+                T = leap_days / 365.0
+                K = round(S_open * strike_moneyness, 2)
+                premium = _bs_price_ref(S_open, K, T, vol, pending_signal)
+                n = max(1, int((start_cash * risk_per_trade) / (premium * 100))) if premium > 0 else 0
+                if n > 0 and premium > 0:
+                    cost = min(n * premium * 100, cash)
+                    n = int(cost / (premium * 100))
+                    if n == 0:
+                        pending = None
+                        pending_reason = ""
+                        pending_signal = None
+                        continue
+                    cost = n * premium * 100
+                    cash -= cost
+                    contracts = n
+                    entry_premium = premium
+                    entry_T = T
+                    entry_strike = K
+                    entry_option_type = pending_signal
+                    entry_bar_idx = idx
+                    delta = _bs_delta_ref(S_open, K, T, vol, pending_signal)
+                    trades.append({"action": "BUY_LEAP", "option_type": pending_signal.upper(),
+                                   "date": str(date), "spot": round(S_open, 2), "strike": K,
+                                   "T_years": round(T, 3), "premium": round(premium, 2),
+                                   "contracts": n, "delta": round(delta, 3), "vol": round(vol, 3),
+                                   "cash": round(cash, 2), "reason": pending_reason})
+            elif pending == "exit" and contracts > 0:
+                elapsed = (idx - entry_bar_idx) * bar_years
+                remaining_T = max(entry_T - elapsed, 0.001)
+                exit_premium = _bs_price_ref(S_open, entry_strike, remaining_T, vol, entry_option_type)
+                proceeds = contracts * exit_premium * 100
+                cost_basis = contracts * entry_premium * 100
+                pnl = proceeds - cost_basis
+                cash += proceeds
+                trades.append({"action": "SELL_LEAP", "option_type": entry_option_type.upper(),
+                               "date": str(date), "spot": round(S_open, 2), "strike": entry_strike,
+                               "remaining_T": round(remaining_T, 3), "premium": round(exit_premium, 2),
+                               "contracts": contracts, "vol": round(vol, 3), "pnl": round(pnl, 2),
+                               "pnl_pct": round(pnl / cost_basis * 100, 1) if cost_basis > 0 else 0,
+                               "cash": round(cash, 2), "reason": pending_reason})
+                contracts = 0
+                entry_premium = entry_T = entry_strike = entry_option_type = entry_bar_idx = None
+            pending = None
+            pending_reason = ""
+            pending_signal = None
+        enters_on_buy = option_type in ("call", "auto")
+        enters_on_sell = option_type in ("put", "auto")
+        if contracts == 0 and pending is None:
+            if enters_on_buy and buy[idx]:
+                pending, pending_reason, pending_signal = "enter", "Bullish signal → CALL", "call"
+            elif enters_on_sell and sell[idx]:
+                pending, pending_reason, pending_signal = "enter", "Bearish signal → PUT", "put"
+        elif contracts > 0 and pending is None:
+            elapsed = (idx - entry_bar_idx) * bar_years
+            remaining_T = max(entry_T - elapsed, 0.001)
+            current_val = _bs_price_ref(S, entry_strike, remaining_T, vol, entry_option_type)
+            if current_val < entry_premium * (1 - stop_loss_pct):
+                pending, pending_reason = "exit", f"Stop loss ({stop_loss_pct:.0%} of premium)"
+            elif remaining_T < 14 / 365:
+                pending, pending_reason = "exit", "Approaching expiry (< 2 weeks)"
+    if contracts > 0:
+        last_S = float(df["Close"].iloc[-1])
+        last_vol = float(vol_series.iloc[-1]) if not pd.isna(vol_series.iloc[-1]) else 0.30
+        elapsed = (len(df) - 1 - entry_bar_idx) * bar_years
+        remaining_T = max(entry_T - elapsed, 0.001)
+        exit_premium = _bs_price_ref(last_S, entry_strike, remaining_T, max(last_vol, 0.05), entry_option_type)
+        proceeds = contracts * exit_premium * 100
+        cost_basis = contracts * entry_premium * 100
+        pnl = proceeds - cost_basis
+        cash += proceeds
+        trades.append({"action": "SELL_LEAP_END", "option_type": entry_option_type.upper(),
+                       "date": str(df.index[-1]), "spot": round(last_S, 2), "strike": entry_strike,
+                       "remaining_T": round(remaining_T, 3), "premium": round(exit_premium, 2),
+                       "contracts": contracts, "pnl": round(pnl, 2),
+                       "pnl_pct": round(pnl / cost_basis * 100, 1) if cost_basis > 0 else 0,
+                       "cash": round(cash, 2), "reason": "End of backtest"})
+    return trades, cash
+
+
+# The signal half of the old per-bar loop (legacy strategies), verbatim.
+def _legacy_signals_ref(df, strategy):
+    from stonkslib.indicators.rsi import rsi as calc_rsi
+    from stonkslib.indicators.macd import macd as calc_macd
+    from stonkslib.indicators.bollinger import bollinger_bands
+    from stonkslib.indicators.moving_avg_double import moving_averages
+    from stonkslib.indicators.supertrend import supertrend as calc_supertrend
+    from stonkslib.indicators.rsi_divergence import rsi_divergence as calc_rsi_div
+    from stonkslib.indicators.markov import markov_signals as calc_markov
+    ind = strategy.get("indicators", {})
+    rsi_series = None
+    rsi_overbought, rsi_oversold = 70, 30
+    if ind.get("rsi", {}).get("enabled"):
+        p = ind["rsi"].get("params", {})
+        rsi_overbought, rsi_oversold = p.get("overbought", 70), p.get("oversold", 30)
+        rsi_series = calc_rsi(df, period=p.get("period", 14))
+    macd_series = None
+    if ind.get("macd", {}).get("enabled"):
+        p = ind["macd"].get("params", {})
+        macd_series = calc_macd(df, short_window=p.get("short", 12), long_window=p.get("long", 26),
+                                signal_window=p.get("signal", 9))["MACD"]
+    bb_upper = bb_lower = None
+    if ind.get("bollinger", {}).get("enabled"):
+        p = ind["bollinger"].get("params", {})
+        bb_out = bollinger_bands(df, window=p.get("window", 20), num_std_dev=p.get("num_std_dev", 2))
+        bb_upper, bb_lower = bb_out["Upper_Band"], bb_out["Lower_Band"]
+    ma_swing_series = ma_long_series = None
+    if ind.get("ma_double", {}).get("enabled"):
+        p = ind["ma_double"].get("params", {})
+        ma_out = moving_averages(df, swing_window=p.get("swing", 20), long_window=p.get("long", 50), ma_type="EMA")
+        ma_swing_series, ma_long_series = ma_out["MA_Swing"], ma_out["MA_Long"]
+    st_series = None
+    if ind.get("supertrend", {}).get("enabled"):
+        p = ind["supertrend"].get("params", {})
+        st_series = calc_supertrend(df, period=p.get("period", 10), multiplier=p.get("multiplier", 3.0))
+    div_series = None
+    if ind.get("rsi_divergence", {}).get("enabled"):
+        p = ind["rsi_divergence"].get("params", {})
+        div_series = calc_rsi_div(df, period=p.get("period", 14), lookback=p.get("lookback", 20))
+    mk_series = None
+    mk_bull_thr = mk_bear_thr = 0.6
+    if ind.get("markov", {}).get("enabled"):
+        p = ind["markov"].get("params", {})
+        mk_bull_thr, mk_bear_thr = p.get("bull_threshold", 0.6), p.get("bear_threshold", 0.6)
+        mk_series = calc_markov(df, states=p.get("states", 3), lookback=p.get("lookback", 60))
+
+    buy, sell = np.zeros(len(df), dtype=bool), np.zeros(len(df), dtype=bool)
+    for idx in range(len(df)):
+        S = float(df.iloc[idx].get("Close") or 0)
+        if S <= 0:
+            continue
+        r  = float(rsi_series.iloc[idx])      if rsi_series      is not None and idx < len(rsi_series)      else None
+        m  = float(macd_series.iloc[idx])     if macd_series     is not None and idx < len(macd_series)     else None
+        bu = float(bb_upper.iloc[idx])        if bb_upper        is not None and idx < len(bb_upper)        else None
+        bl = float(bb_lower.iloc[idx])        if bb_lower        is not None and idx < len(bb_lower)        else None
+        sw = float(ma_swing_series.iloc[idx]) if ma_swing_series is not None and idx < len(ma_swing_series) else None
+        ml = float(ma_long_series.iloc[idx])  if ma_long_series  is not None and idx < len(ma_long_series)  else None
+        mk_bull = float(mk_series["bull_prob"].iloc[idx]) if mk_series is not None and idx < len(mk_series) and not pd.isna(mk_series["bull_prob"].iloc[idx]) else None
+        mk_bear = float(mk_series["bear_prob"].iloc[idx]) if mk_series is not None and idx < len(mk_series) and not pd.isna(mk_series["bear_prob"].iloc[idx]) else None
+        bb_and_rsi = bl is not None and rsi_series is not None
+        buy_signal = sell_signal = False
+        if bb_and_rsi:
+            # The old loop raised TypeError here once RSI (computed on the
+            # NaN-dropped closes) ran out of bars; those bars now carry no signal.
+            if r is not None and r < rsi_oversold and not pd.isna(bl) and S < bl:
+                buy_signal = True
+            if r is not None and r > rsi_overbought:
+                sell_signal = True
+            if bu is not None and not pd.isna(bu) and S > bu:
+                sell_signal = True
+        else:
+            if r is not None and m is not None and r < rsi_oversold and m > 0:
+                buy_signal = True
+            elif r is not None and m is None and r < rsi_oversold:
+                buy_signal = True
+            elif bl is not None and not pd.isna(bl) and S < bl:
+                buy_signal = True
+            if r is not None and r > rsi_overbought:
+                sell_signal = True
+            if bu is not None and not pd.isna(bu) and S > bu:
+                sell_signal = True
+        if sw is not None and ml is not None and idx > 0:
+            prev_sw = float(ma_swing_series.iloc[idx - 1])
+            prev_ml = float(ma_long_series.iloc[idx - 1])
+            if prev_sw <= prev_ml and sw > ml:
+                buy_signal = True
+            elif prev_sw >= prev_ml and sw < ml:
+                sell_signal = True
+        if st_series is not None and idx > 0:
+            prev_dir = st_series["Direction"].iloc[idx - 1]
+            curr_dir = st_series["Direction"].iloc[idx]
+            if prev_dir == -1 and curr_dir == 1:
+                buy_signal = True
+            elif prev_dir == 1 and curr_dir == -1:
+                sell_signal = True
+        if div_series is not None:
+            if div_series["Bullish_Divergence"].iloc[idx]:
+                buy_signal = True
+            if div_series["Bearish_Divergence"].iloc[idx]:
+                sell_signal = True
+        if mk_bull is not None and mk_bull > mk_bull_thr:
+            buy_signal = True
+        if mk_bear is not None and mk_bear > mk_bear_thr:
+            sell_signal = True
+        buy[idx], sell[idx] = buy_signal, sell_signal
+    return buy, sell
+
+
+def _frame(n, seed, holes=False, level=120.0):
+    rng = np.random.default_rng(seed)
+    close = level * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    open_ = close * (1 + rng.normal(0, 0.006, n))
+    if holes:
+        open_[rng.choice(n, n // 30, replace=False)] = 0.0
+        close[rng.choice(n, n // 40, replace=False)] = np.nan
+    df = pd.DataFrame({"Open": open_, "High": open_, "Low": close, "Close": close,
+                       "Volume": np.full(n, 1e5)},
+                      index=pd.date_range("2021-01-01", periods=n, freq="B", tz="UTC"))
+    buy = rng.random(n) < 0.06
+    sell = rng.random(n) < 0.06
+    return df, buy, sell
+
+
+def _arrays(df):
+    close = df["Close"].to_numpy(dtype=np.float64)
+    open_ = np.where(df["Open"].to_numpy() == 0, close, df["Open"].to_numpy())
+    return close, open_, leaps._leap_vol(df, "AAA", "1d")
+
+
+def test_prices_and_delta_match_scalar_formula():
+    rng = np.random.default_rng(0)
+    S = rng.uniform(5, 500, 2000)
+    K = np.round(S * rng.uniform(0.7, 1.3, S.size), 2)
+    T = rng.uniform(0.001, 2, S.size)
+    sigma = rng.uniform(0.05, 1.5, S.size)
+    for kind in ("call", "put"):
+        got = bs_greeks(S, K, T, sigma, kind)
+        ref_p = [_bs_price_ref(*args, kind) for args in zip(S.tolist(), K.tolist(), T.tolist(), sigma.tolist())]
+        ref_d = [_bs_delta_ref(*args, kind) for args in zip(S.tolist(), K.tolist(), T.tolist(), sigma.tolist())]
+        np.testing.assert_array_equal(got["price"], ref_p)
+        np.testing.assert_array_equal(got["delta"], ref_d)
+        np.testing.assert_array_equal(bs_price(S, K, T, sigma, kind), ref_p)
+        for args in [(100.0, 90.0, 0.0, 0.3), (100.0, 110.0, 1.0, 0.0), (0.0, 50.0, 1.0, 0.3)]:
+            assert bs_price(*args, kind) == _bs_price_ref(*args, kind)
+            assert bs_greeks(*args, kind)["delta"] == _bs_delta_ref(*args, kind)
+
+
+def test_greeks_match_finite_differences():
+    S, K, T, sigma, h = 150.0, 160.0, 0.8, 0.35, 1e-4
+    for kind in ("call", "put"):
+        g = bs_greeks(S, K, T, sigma, kind)
+        assert abs(g["delta"] - (bs_price(S + h, K, T, sigma, kind) - bs_price(S - h, K, T, sigma, kind)) / (2 * h)) < 1e-6
+        gamma = (bs_price(S + 0.01, K, T, sigma, kind) - 2 * g["price"] + bs_price(S - 0.01, K, T, sigma, kind)) / 1e-4
+        assert abs(g["gamma"] - gamma) < 1e-5
+        assert abs(g["vega"] - (bs_price(S, K, T, sigma + h, kind) - bs_price(S, K, T, sigma - h, kind)) / (2 * h)) < 1e-5
+        assert abs(g["theta"] + (bs_price(S, K, T + h, sigma, kind) - bs_price(S, K, T - h, sigma, kind)) / (2 * h)) < 1e-4
+
+
+def _floor_sensitive(premium, start_cash, risk):
+    """Whether a one-ulp change in the entry premium changes the contract count."""
+    def size(p):
+        n = max(1, int((start_cash * risk) / (p * 100)))
+        return int(min(n * p * 100, start_cash) / (p * 100))
+    return any(size(p) != size(premium) for p in (np.nextafter(premium, 0), np.nextafter(premium, np.inf)))
+
+
+def test_fills_match_scalar_loop():
+    cases = [dict(option_type="call", leap_days=365, strike_moneyness=1.0, stop_loss_pct=0.5),
+             dict(option_type="put", leap_days=180, strike_moneyness=0.95, stop_loss_pct=0.3),
+             dict(option_type="auto", leap_days=60, strike_moneyness=1.1, stop_loss_pct=0.2)]
+    for seed in range(4):
+        for holes in (False, True):
+            df, buy, sell = _frame(756, seed, holes)
+            close, open_, vol = _arrays(df)
+            for case in cases:
+                for start_cash, risk in ((10_000, 0.2), (1_000, 0.05)):
+                    ref = _fills_ref(df, buy, sell, start_cash=start_cash, risk_per_trade=risk,
+                                     bar_years=1 / 252, **case)
+                    got = leaps._leap_fills(df.index, close, open_, vol, buy, sell,
+                                            start_cash=start_cash, risk_per_trade=risk,
+                                            bar_years=1 / 252, **case)
+                    assert json.dumps(got[0]) == json.dumps(ref[0])
+                    assert abs(got[1] - ref[1]) < 1e-6
+
+
+def test_fills_match_across_sizing_boundaries():
+    # Contract sizing floors cash / (premium * 100), so premiums one ulp apart can buy a
+    # different number of contracts. Random price levels, contracts and budgets put
+    # plenty of entries on that boundary; every run must still match the scalar loop.
+    global _bs_price_ref
+    rng = np.random.default_rng(2024)
+    scalar_price = _bs_price_ref
+    entries, sensitive = [], 0
+
+    def recording_price(S, K, T, sigma, option_type, r=RISK_FREE_RATE):
+        p = scalar_price(S, K, T, sigma, option_type, r)
+        if T == case["leap_days"] / 365.0:         # an entry fill, not a mark
+            entries.append(p)
+        return p
+
+    for seed in range(60):
+        level = float(np.exp(rng.uniform(np.log(3), np.log(800))))
+        df, buy, sell = _frame(300, 100 + seed, holes=seed % 3 == 0, level=level)
+        close, open_, vol = _arrays(df)
+        case = dict(option_type=("call", "put", "auto")[seed % 3],
+                    leap_days=int(rng.choice([90, 180, 365, 540, 730])),
+                    strike_moneyness=float(rng.choice([0.8, 0.9, 0.95, 1.0, 1.05, 1.1, 1.2])),
+                    stop_loss_pct=float(rng.choice([0.25, 0.5, 0.8])))
+        start_cash = float(rng.choice([500, 1_000, 2_500, 10_000, 25_000]))
+        risk = float(rng.choice([0.05, 0.1, 0.2, 0.35]))
+        entries.clear()
+        _bs_price_ref = recording_price
+        try:
+            ref = _fills_ref(df, buy, sell, start_cash=start_cash, risk_per_trade=risk,
+                             bar_years=1 / 252, **case)
+        finally:
+            _bs_price_ref = scalar_price
+        sensitive += sum(_floor_sensitive(p, start_cash, risk) for p in entries if p > 0)
+        got = leaps._leap_fills(df.index, close, open_, vol, buy, sell, start_cash=start_cash,
+                                risk_per_trade=risk, bar_years=1 / 252, **case)
+        assert json.dumps(got[0]) == json.dumps(ref[0]), (seed, level, case, start_cash, risk)
+        assert got[1] == ref[1]
+    print(f"    {sensitive} entries one ulp from a different contract count")
+    assert sensitive >= 10, sensitive
+
+
+def test_legacy_signals_match_per_bar_rules():
+    strat_dir = os.path.join(os.path.dirname(__file__), "..", "stonkslib", "strategies")
+    mixed = {"name": "mixed", "indicators": {
+        "rsi": {"enabled": True, "params": {"period": 9, "oversold": 40, "overbought": 60}},
+        "macd": {"enabled": True}, "ma_double": {"enabled": True, "params": {"swing": 5, "long": 15}},
+        "supertrend": {"enabled": True}, "rsi_divergence": {"enabled": True},
+        "markov": {"enabled": True, "params": {"lookback": 40}}}}
+    strategies = [load_strategy(os.path.join(strat_dir, f)) for f in sorted(os.listdir(strat_dir))
+                  if f.endswith(".yaml") and "v2" not in f and "sentiment" not in f] + [mixed]
+    for seed, holes in ((0, False), (1, True)):
+        df, _, _ = _frame(400, seed, holes)
+        for strategy in strategies:
+            got_buy, got_sell = leaps._legacy_signals(df, strategy)
+            ref_buy, ref_sell = _legacy_signals_ref(df, strategy)
+            np.testing.assert_array_equal(got_buy, ref_buy, err_msg=strategy["name"])
+            np.testing.assert_array_equal(got_sell, ref_sell, err_msg=strategy["name"])
+
+
+def test_v2_strategy_runs_on_engine_signals():
+    from stonkslib.backtest.strategy import v2_signals
+    df, _, _ = _frame(756, 4)
+    strategy = load_strategy(os.path.join(os.path.dirname(__file__), "..", "stonkslib",
+                                          "strategies", "rsi_macd_v2.yaml"))
+    strategy["entry"], strategy["exit"] = "rsi < 40", "rsi > 60"
+    orig = leaps.load_td
+    leaps.load_td = lambda tickers, interval: {tickers[0]: df}
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            m = leaps.run_leaps_backtest("AAA", "1d", strategy, option_type="call",
+                                         output_dir=tmp, use_cache=False)
+            trades = pd.read_csv(os.path.join(tmp, "AAA", "1d", "rsi_macd_classic_v2_call.csv"))
+    finally:
+        leaps.load_td = orig
+    entry, exit_ = v2_signals(df, strategy)
+    assert m["trades"] > 0 and (trades["reason"] == "Exit signal").any()
+    signal_bars = df.index.get_indexer(pd.to_datetime(trades["date"])) - 1
+    buys = trades["action"] == "BUY_LEAP"
+    assert entry.to_numpy()[signal_bars[buys]].all()
+    assert exit_.to_numpy()[signal_bars[trades["reason"] == "Exit signal"]].all()
+
+
+def test_backtest_end_to_end():
+    df, _, _ = _frame(756, 9)
+    strategy = load_strategy(os.path.join(os.path.dirname(__file__), "..", "stonkslib",
+                                          "strategies", "bollinger.yaml"))
+    orig = leaps.load_td
+    leaps.load_td = lambda tickers, interval: {tickers[0]: df}
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            t0 = time.perf_counter()
+            m = leaps.run_leaps_backtest("AAA", "1d", strategy, output_dir=tmp, use_cache=False)
+            elapsed = time.perf_counter() - t0
+    finally:
+        leaps.load_td = orig
+    assert m is not None and m["trades"] > 0 and m["pricing_note"].startswith("Black-Scholes")
+    print(f"    run_leaps_backtest (756 bars): {elapsed * 1e3:.0f} ms")
+
+
+def test_mark_to_market_speed():
+    df, buy, sell = _frame(2_000, 3)
+    buy[:] = False
+    buy[5] = True
+    sell[:] = False
+    close, open_, vol = _arrays(df)
+    kw = dict(option_type="call", leap_days=3650, strike_moneyness=1.0, stop_loss_pct=0.99,
+              start_cash=10_000, risk_per_trade=0.2, bar_years=1 / 252)
+    t0 = time.perf_counter()
+    ref = _fills_ref(df, buy, sell, **kw)
+    t1 = time.perf_counter()
+    got = leaps._leap_fills(df.index, close, open_, vol, buy, sell, **kw)
+    t2 = time.perf_counter()
+    assert json.dumps(got[0]) == json.dumps(ref[0])
+    print(f"    2000 bars held: scalar {(t1 - t0) * 1e3:.0f} ms → arrays {(t2 - t1) * 1e3:.1f} ms")
+    assert t2 - t1 < t1 - t0
+
+
+if __name__ == "__main__":
+    fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    failed = 0
+    for fn in fns:
+        try:
+            fn()
+            print(f"  ok  {fn.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"FAIL  {fn.__name__}: {e}")
+    print(f"\n{len(fns) - failed}/{len(fns)} passed")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,132 @@
+"""LEAP contract sweeps (backtest/leaps_sweep.py): one pass must match per-combo fills.
+
+Run standalone:   python dev/test_leaps_sweep.py
+Or with pytest:   pytest dev/test_leaps_sweep.py
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from click.testing import CliRunner
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import stonkslib.backtest.leaps as leaps
+import stonkslib.backtest.leaps_sweep as leaps_sweep
+from stonkslib.backtest.leaps_sweep import run_leaps_sweep, SWEEP_COLUMNS, METRIC_COLUMNS
+from stonkslib.backtest.strategy import load_strategy
+import stonkslib.cli.leaps_backtest as cli
+
+logging.getLogger("stonkslib").setLevel(logging.WARNING)
+
+STRATEGY_DIR = os.path.join(os.path.dirname(__file__), "..", "stonkslib", "strategies")
+GRID = dict(leap_days=[90, 365, 730], strike_moneyness=[0.9, 1.0, 1.1],
+            stop_loss_pct=[0.2, 0.5, 0.9])
+
+
+def _frame(n, seed, holes=False):
+    rng = np.random.default_rng(seed)
+    close = 120 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    open_ = close * (1 + rng.normal(0, 0.006, n))
+    if holes:
+        open_[rng.choice(n, n // 30, replace=False)] = 0.0
+        open_[rng.choice(n, n // 30, replace=False)] = np.nan
+        close[rng.choice(n, n // 40, replace=False)] = np.nan
+    return pd.DataFrame({"Open": open_, "High": open_, "Low": close, "Close": close,
+                         "Volume": np.full(n, 1e5)},
+                        index=pd.date_range("2021-01-01", periods=n, freq="B", tz="UTC"))
+
+
+def _fills_metrics(df, strategy, option_type, days, moneyness, stop):
+    close, open_, buy, sell, signal_exits = leaps._leap_inputs(df, "AAA", strategy)
+    vol = leaps._leap_vol(df, "AAA", "1d")
+    trades, cash = leaps._leap_fills(df.index, close, open_, vol, buy, sell, option_type, days,
+                                     moneyness, stop, 10000, 0.20, 1 / 252,
+                                     signal_exits=signal_exits)
+    sells = [t for t in trades if "SELL" in t["action"]]
+    entries = len([t for t in trades if t["action"] == "BUY_LEAP"])
+    wins = len([t for t in sells if t["pnl"] > 0])
+    return {"final_cash": round(cash, 2), "net_pnl": round(sum(t["pnl"] for t in sells), 2),
+            "trades": entries, "win_rate": round(wins / entries, 3) if entries else 0.0,
+            "avg_pnl_pct": round(sum(t["pnl_pct"] for t in sells) / len(sells), 1) if sells else 0.0}
+
+
+def test_sweep_matches_fill_loop():
+    v2 = load_strategy(os.path.join(STRATEGY_DIR, "rsi_macd_v2.yaml"))
+    v2["entry"], v2["exit"] = "rsi < 40", "rsi > 60"
+    strategies = [load_strategy(os.path.join(STRATEGY_DIR, "bollinger.yaml")),
+                  load_strategy(os.path.join(STRATEGY_DIR, "rsi.yaml")), v2]
+    for seed, holes in ((0, False), (1, True)):
+        df = _frame(756, seed, holes)
+        for strategy in strategies:
+            for option_type in ("call", "put", "auto"):
+                table = run_leaps_sweep("AAA", "1d", strategy, option_type=option_type,
+                                        df_override=df, **GRID)
+                assert len(table) == 27
+                for _, row in table.iterrows():
+                    ref = _fills_metrics(df, strategy, option_type,
+                                         *(row[c] for c in SWEEP_COLUMNS))
+                    for col in METRIC_COLUMNS:
+                        assert row[col] == ref[col], (strategy["name"], option_type,
+                                                      dict(row[SWEEP_COLUMNS]), col)
+    assert table["trades"].sum() > 0
+
+
+def test_cli_writes_one_cube():
+    df = _frame(756, 3)
+    orig = leaps_sweep._leap_frame, cli.TICKER_YAML
+    leaps_sweep._leap_frame = lambda ticker, interval: df
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            cli.TICKER_YAML = os.path.join(tmp, "tickers.yaml")
+            with open(cli.TICKER_YAML, "w") as f:
+                f.write("stocks: [AAA, BBB]\n")
+            out = os.path.join(tmp, "cube.parquet")
+            result = CliRunner().invoke(cli.leaps_backtest, [
+                "stocks", "--strategy", "bollinger.yaml", "--sweep",
+                "--sweep-days", "180,365", "--sweep-moneyness", "1.0",
+                "--sweep-stops", "0.3,0.5,0.7", "--sweep-out", out])
+            assert result.exit_code == 0, result.output
+            cube = pd.read_parquet(out)
+    finally:
+        leaps_sweep._leap_frame, cli.TICKER_YAML = orig
+    assert len(cube) == 12 and list(cube["ticker"].unique()) == ["AAA", "BBB"]
+    assert list(cube.columns[:8]) == ["ticker", "interval", "strategy", "option_type", "vol_model",
+                                      "leap_days", "strike_moneyness", "stop_loss_pct"]
+
+
+def test_sweep_speed():
+    df = _frame(756, 4)
+    strategy = load_strategy(os.path.join(STRATEGY_DIR, "rsi.yaml"))
+    t0 = time.perf_counter()
+    table = run_leaps_sweep("AAA", "1d", strategy, df_override=df)   # default 5×5×5 grid
+    t1 = time.perf_counter()
+    close, open_, buy, sell, _ = leaps._leap_inputs(df, "AAA", strategy)
+    vol = leaps._leap_vol(df, "AAA", "1d")
+    for days, moneyness, stop in table[SWEEP_COLUMNS].head(10).itertuples(index=False):
+        leaps._leap_fills(df.index, close, open_, vol, buy, sell, "auto", days, moneyness, stop,
+                          10000, 0.20, 1 / 252)
+    t2 = time.perf_counter()
+    per_combo = (t2 - t1) / 10
+    print(f"    {len(table)} combos: sweep {(t1 - t0) * 1e3:.0f} ms vs "
+          f"~{per_combo * len(table) * 1e3:.0f} ms one fill loop per combo")
+    assert len(table) == 125 and t1 - t0 < per_combo * len(table)
+
+
+if __name__ == "__main__":
+    fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    failed = 0
+    for fn in fns:
+        try:
+            fn()
+            print(f"  ok  {fn.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"FAIL  {fn.__name__}: {e}")
+    print(f"\n{len(fns) - failed}/{len(fns)} passed")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,127 @@
+"""Parity tests for the sliding-window Markov regime detector.
+
+`_reference_markov` is the original full-recompute-per-bar implementation, kept
+here so the incremental engine can be checked against it.
+
+Run standalone:   python dev/test_markov.py          (also prints a micro-benchmark)
+Or with pytest:   pytest dev/test_markov.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from stonkslib.indicators.markov import markov_signals
+
+
+def _reference_markov(df, states=3, lookback=60):
+    df = df.copy()
+    df["Close"] = pd.to_numeric(df["Close"], errors="coerce")
+    df = df.dropna(subset=["Close"])
+    n = len(df)
+
+    log_ret = np.log(df["Close"] / df["Close"].shift(1)).values
+    quantile_levels = np.array([j / states for j in range(1, states)])
+
+    state_arr = np.full(n, np.nan)
+    bull_arr = np.full(n, np.nan)
+    bear_arr = np.full(n, np.nan)
+
+    for i in range(lookback, n):
+        window = log_ret[i - lookback : i + 1]
+        if np.isnan(window).any():
+            continue
+        boundaries = np.quantile(window, quantile_levels)
+        if len(np.unique(boundaries)) < len(boundaries):
+            continue
+        state_seq = np.digitize(window, boundaries)
+        trans = np.zeros((states, states))
+        for t in range(len(state_seq) - 1):
+            trans[state_seq[t], state_seq[t + 1]] += 1
+        row_sums = trans.sum(axis=1, keepdims=True)
+        row_sums[row_sums == 0] = 1
+        trans /= row_sums
+        cur = state_seq[-1]
+        state_arr[i] = float(cur)
+        bull_arr[i] = trans[cur, states - 1]
+        bear_arr[i] = trans[cur, 0]
+
+    return pd.DataFrame(
+        {"state": state_arr, "bull_prob": bull_arr, "bear_prob": bear_arr},
+        index=df.index,
+    )
+
+
+def _close(n, seed=0, decimals=None):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    if decimals is not None:
+        close = np.round(close, decimals)  # tick-rounded prices -> tied returns
+    idx = pd.date_range("2015-01-01", periods=n, freq="D")
+    return pd.DataFrame({"Close": close}, index=idx)
+
+
+def _assert_matches(a, b):
+    assert list(a.columns) == list(b.columns)
+    assert a.index.equals(b.index)
+    for col in a.columns:
+        np.testing.assert_allclose(a[col].to_numpy(), b[col].to_numpy(), rtol=0, atol=1e-12,
+                                   equal_nan=True, err_msg=col)
+
+
+def test_parity_param_sweep():
+    df = _close(600)
+    for states in (2, 3, 5):
+        for lookback in (10, 30, 60):
+            _assert_matches(markov_signals(df, states, lookback), _reference_markov(df, states, lookback))
+
+
+def test_parity_with_ties():
+    # Rounded prices produce many identical returns, exercising tied quantile ranks.
+    df = _close(800, seed=1, decimals=0)
+    for states in (3, 4):
+        _assert_matches(markov_signals(df, states, 40), _reference_markov(df, states, 40))
+
+
+def test_parity_with_gaps_and_flat_runs():
+    df = _close(400, seed=2)
+    df.iloc[[50, 51, 200], 0] = np.nan          # dropped rows
+    df.iloc[100:180, 0] = 123.0                 # flat run -> degenerate windows
+    _assert_matches(markov_signals(df, 3, 30), _reference_markov(df, 3, 30))
+
+
+def test_short_frame():
+    df = _close(20)
+    _assert_matches(markov_signals(df, 3, 60), _reference_markov(df, 3, 60))
+
+
+def benchmark(n=20_000, lookback=250):
+    df = _close(n)
+    t0 = time.perf_counter()
+    markov_signals(df, 3, lookback)
+    fast = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    _reference_markov(df, 3, lookback)
+    ref = time.perf_counter() - t0
+    print(f"\nmarkov_signals on {n} bars, lookback={lookback}: rolling {fast:.2f}s, "
+          f"full recompute {ref:.2f}s ({ref / fast:,.1f}x)")
+
+
+if __name__ == "__main__":
+    fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    failed = 0
+    for fn in fns:
+        try:
+            fn()
+            print(f"  ok  {fn.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"FAIL  {fn.__name__}: {e}")
+    print(f"\n{len(fns) - failed}/{len(fns)} passed")
+    benchmark()
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,146 @@
+"""Tests for the pipelined optimizer (llm/optimizer.py: optimize_many).
+
+Run standalone:   python dev/test_optimizer_workers.py
+Or with pytest:   pytest dev/test_optimizer_workers.py
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import yaml
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import stonkslib.llm.optimizer as optimizer
+
+logging.getLogger("stonkslib").setLevel(logging.WARNING)
+
+STRATEGY = {"version": 2, "name": "Fake RSI", "indicators": {"rsi": {"params": {"period": 14}}},
+            "entry": "rsi < 30", "exit": "rsi > 70", "risk": {"start_cash": 10000}}
+
+
+class _Fakes:
+    """Stand-in backtest + LLM: P&L peaks at RSI period 10, the LLM always proposes 10."""
+
+    def __init__(self, llm_delay=0.05):
+        self.llm_delay = llm_delay
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def backtest(self, ticker, interval, strategy):
+        time.sleep(0.01)
+        period = strategy["indicators"]["rsi"]["params"]["period"]
+        return {"ticker": ticker, "interval": interval,
+                "net_pnl": 100.0 - abs(period - 10) * (1 + len(ticker)),
+                "win_rate": 0.5, "trades": 4, "max_drawdown": 0.1}
+
+    def chat(self, messages, model=None, json_mode=False):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.llm_delay)
+        with self.lock:
+            self.active -= 1
+        return json.dumps({"reasoning": "try 10", "indicators": {"rsi": {"params": {"period": 10}}}})
+
+    def __enter__(self):
+        self.saved = (optimizer.run_strategy_backtest, optimizer.client.chat, optimizer.OPTIMIZED_DIR)
+        self.tmp = tempfile.TemporaryDirectory()
+        optimizer.run_strategy_backtest = self.backtest
+        optimizer.client.chat = self.chat
+        optimizer.OPTIMIZED_DIR = Path(self.tmp.name) / "optimized"
+        return self
+
+    def __exit__(self, *exc):
+        optimizer.run_strategy_backtest, optimizer.client.chat, optimizer.OPTIMIZED_DIR = self.saved
+        self.tmp.cleanup()
+
+
+def _jobs(strategy_path, tickers):
+    return [(f"Fake RSI / {t}", dict(strategy_path=strategy_path, tickers=[t], output_ticker=t,
+                                     interval="1d", iterations=3)) for t in tickers]
+
+
+def test_pipelined_matches_serial():
+    tickers = ["A", "BB", "CCC", "DDDD", "EE", "F"]
+    with _Fakes() as fakes:
+        path = Path(fakes.tmp.name) / "fake_rsi.yaml"
+        path.write_text(yaml.dump(STRATEGY))
+        serial = {label: optimizer.optimize(**kw) for label, kw in _jobs(path, tickers)}
+        serial_files = {p.name: p.read_text() for p in optimizer.OPTIMIZED_DIR.iterdir()}
+        for p in optimizer.OPTIMIZED_DIR.iterdir():
+            p.unlink()
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            piped = optimizer.optimize_many(_jobs(path, tickers), workers=3, llm_workers=2, pool=pool)
+        piped_files = {p.name: p.read_text() for p in optimizer.OPTIMIZED_DIR.iterdir()}
+
+    assert list(piped) == list(serial)
+    for label in serial:
+        assert piped[label]["best_strategy"] == serial[label]["best_strategy"], label
+        assert [h["score"] for h in piped[label]["history"]] == \
+               [h["score"] for h in serial[label]["history"]], label
+    assert piped_files == serial_files and "fake_rsi_A_optimized.yaml" in piped_files
+    assert fakes.peak <= 2
+
+
+def test_llm_concurrency_is_bounded_and_overlapped():
+    with _Fakes(llm_delay=0.1) as fakes:
+        path = Path(fakes.tmp.name) / "fake_rsi.yaml"
+        path.write_text(yaml.dump(STRATEGY))
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            optimizer.optimize_many(_jobs(path, list("ABCDEFGH")), workers=4, llm_workers=3, pool=pool)
+    # 8 jobs share 3 LLM slots: all three fill, none beyond.
+    assert fakes.peak == 3, fakes.peak
+
+
+def test_failed_job_does_not_sink_the_rest():
+    with _Fakes() as fakes:
+        path = Path(fakes.tmp.name) / "fake_rsi.yaml"
+        path.write_text(yaml.dump(STRATEGY))
+
+        def flaky(ticker, interval, strategy):
+            if ticker == "BAD":
+                raise RuntimeError("boom")
+            return fakes.backtest(ticker, interval, strategy)
+
+        optimizer.run_strategy_backtest = flaky
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            out = optimizer.optimize_many(_jobs(path, ["A", "BAD", "C"]), workers=2, pool=pool)
+    assert out["Fake RSI / BAD"] == {} and out["Fake RSI / A"]["out_path"] and out["Fake RSI / C"]
+
+
+def test_default_process_pool():
+    # pool=None spins up the spawn pool; the workers run the real backtest, which finds
+    # no data for these tickers, so each job stops before ever asking the LLM.
+    with _Fakes() as fakes:
+        path = Path(fakes.tmp.name) / "fake_rsi.yaml"
+        path.write_text(yaml.dump(STRATEGY))
+        out = optimizer.optimize_many(_jobs(path, ["NO_SUCH_TICKER_1", "NO_SUCH_TICKER_2"]),
+                                      workers=2)
+        assert not optimizer.OPTIMIZED_DIR.exists()
+    assert list(out) == ["Fake RSI / NO_SUCH_TICKER_1", "Fake RSI / NO_SUCH_TICKER_2"]
+    assert all(r["out_path"] is None and r["history"] == [] for r in out.values())
+    assert fakes.peak == 0
+
+
+if __name__ == "__main__":
+    fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    failed = 0
+    for fn in fns:
+        try:
+            fn()
+            print(f"  ok  {fn.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"FAIL  {fn.__name__}: {e}")
+    print(f"\n{len(fns) - failed}/{len(fns)} passed")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,200 @@
+"""Options-chain cache (fetch/chains.py) and the LEAP scanner running on it.
+
+The chain source is an in-memory stand-in passed as `source=`, so nothing touches
+the network.
+
+Run standalone:   python dev/test_options_chain_cache.py
+Or with pytest:   pytest dev/test_options_chain_cache.py
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import stonkslib.leaps.scanner as scanner
+from stonkslib.fetch.chains import ChainCache
+from stonkslib.fetch.throttle import TokenBucket
+
+logging.getLogger("stonkslib").setLevel(logging.ERROR)
+
+
+class _FakeChains:
+    """Expirations 3–24 months out, a strike ladder around 100, a flat-ish VIX.
+
+    Counts every call and the peak number in flight; `delay` holds each call open so
+    overlapping ones show up.
+    """
+
+    def __init__(self, delay=0.0, fail=False):
+        today = datetime.now().date()
+        self.expiries = [(today + timedelta(days=d)).isoformat() for d in (90, 200, 400, 470, 720)]
+        self.delay = delay
+        self.fail = fail
+        self.calls = []
+        self.in_flight = self.peak = 0
+        self._lock = threading.Lock()
+
+    def _enter(self, *call):
+        with self._lock:
+            self.calls.append(call)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        if self.fail:
+            raise ConnectionError("offline")
+
+    def expirations(self, ticker):
+        self._enter("expirations", ticker)
+        return self.expiries
+
+    def chain(self, ticker, expiry):
+        self._enter("chain", ticker, expiry)
+        strikes = np.arange(80.0, 121.0, 5.0)
+        side = pd.DataFrame({"contractSymbol": [f"{ticker}{expiry}{k:g}" for k in strikes],
+                             "strike": strikes, "bid": 10.0, "ask": 10.5,
+                             "impliedVolatility": 0.25, "openInterest": 100})
+        return side, side.assign(bid=9.0, ask=9.5)
+
+    def vix(self):
+        self._enter("vix")
+        return pd.Series(np.linspace(12.0, 30.0, 250),
+                         index=pd.date_range("2025-01-01", periods=250, freq="B"), name="Close")
+
+
+def _cache(tmp, source, **kw):
+    return ChainCache(root=Path(tmp) / "chains", source=source,
+                      throttle=TokenBucket(rate=1000, capacity=1000), **kw)
+
+
+def _age(path, hours):
+    t = time.time() - hours * 3600
+    os.utime(path, (t, t))
+
+
+def test_fresh_entries_skip_the_source():
+    src = _FakeChains()
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = _cache(tmp, src)
+        first = scanner._best_leap_option("AAA", 100.0, "CALL", cache)
+        n = len(src.calls)
+        assert [c[0] for c in src.calls] == ["expirations", "chain"]
+
+        again = _cache(tmp, src)            # a new process: disk only
+        assert scanner._best_leap_option("AAA", 100.0, "CALL", again) == first
+        put = scanner._best_leap_option("AAA", 100.0, "PUT", again)
+        assert len(src.calls) == n and again.stats["hits"] == 4
+        files = sorted(p.name for p in (Path(tmp) / "chains" / "AAA").iterdir())
+    assert first == {"expiry": src.expiries[3], "strike": 95.0, "bid": 10.0, "ask": 10.5,
+                     "iv": 25.0, "open_interest": 100}
+    assert put["strike"] == 100.0 and put["bid"] == 9.0
+    assert files == [f"{src.expiries[3]}_{datetime.now().date().isoformat()}.parquet",
+                     "expirations.json"]
+
+
+def test_stale_entries_refetch_and_fall_back():
+    src = _FakeChains()
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = _cache(tmp, src, ttl_hours=6)
+        expiry = src.expiries[3]
+        cache.chain("AAA", expiry)
+        snap = Path(tmp) / "chains" / "AAA" / f"{expiry}_{datetime.now().date().isoformat()}.parquet"
+        _age(snap, 5)
+        cache.chain("AAA", expiry)
+        assert len(src.calls) == 1
+        _age(snap, 7)
+        cache.chain("AAA", expiry)
+        assert len(src.calls) == 2 and cache.stats["fetches"] == 2
+
+        _age(snap, 7)
+        src.fail = True                     # offline: serve the stale snapshot
+        calls, puts = cache.chain("AAA", expiry)
+        assert cache.stats["stale"] == 1 and len(calls) == len(puts) == 9
+        try:
+            cache.chain("AAA", src.expiries[0])
+            raise AssertionError("missing entry served while offline")
+        except ConnectionError:
+            pass
+
+
+def test_refetch_prunes_older_snapshots():
+    src = _FakeChains()
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = _cache(tmp, src)
+        live, other = src.expiries[3], src.expiries[4]
+        today = datetime.now().date()
+        cache.chain("AAA", live)
+        cache.chain("AAA", other)
+        ticker_dir = Path(tmp) / "chains" / "AAA"
+        # Yesterday's copy of `live` (stale), and a chain whose contracts have expired.
+        yesterday = ticker_dir / f"{live}_{(today - timedelta(days=1)).isoformat()}.parquet"
+        (ticker_dir / f"{live}_{today.isoformat()}.parquet").rename(yesterday)
+        _age(yesterday, 30)
+        expired = (today - timedelta(days=3)).isoformat()
+        (ticker_dir / f"{expired}_{(today - timedelta(days=10)).isoformat()}.parquet").write_bytes(
+            yesterday.read_bytes())
+
+        cache.chain("AAA", live)
+        assert len(src.calls) == 3
+        files = sorted(p.name for p in ticker_dir.iterdir())
+    assert files == [f"{live}_{today.isoformat()}.parquet", f"{other}_{today.isoformat()}.parquet"]
+
+
+def test_vix_is_cached():
+    src = _FakeChains()
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = _cache(tmp, src, vix_ttl_hours=12)
+        assert scanner.get_vix_rank(cache) == (30.0, 100.0)
+        assert scanner.get_vix_rank(_cache(tmp, src)) == (30.0, 100.0)
+        assert src.calls == [("vix",)]
+        _age(Path(tmp) / "chains" / "vix.parquet", 13)
+        scanner.get_vix_rank(cache)
+        assert src.calls == [("vix",), ("vix",)]
+
+
+def test_scan_fetches_concurrently():
+    tickers = [f"T{i}" for i in range(8)]
+    src = _FakeChains(delay=0.05)
+    bars = pd.DataFrame({"Close": [100.0]}, index=pd.date_range("2025-01-01", periods=1))
+    orig = scanner.load_td, scanner.check_signals
+    scanner.load_td = lambda names, interval: {names[0]: bars}
+    scanner.check_signals = lambda ticker, interval, strat: [{"type": "BUY", "reason": "test"}]
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = _cache(tmp, src)
+            results, vix, rank = scanner.scan_leaps(tickers, "1wk", cache=cache, workers=4)
+            n = len(src.calls)
+            again, _, _ = scanner.scan_leaps(tickers, "1wk", cache=cache, workers=4)
+    finally:
+        scanner.load_td, scanner.check_signals = orig
+    # 1 VIX + 2 per ticker, with lookups overlapping; the rerun is served from disk.
+    assert n == 17 and len(src.calls) == 17 and src.peak > 1
+    assert (vix, rank) == (30.0, 100.0)
+    assert [r["ticker"] for r in results] == tickers
+    assert all(r["option"]["strike"] == 95.0 and r["vix_rank"] == 100.0 for r in results)
+    assert again == results
+
+
+if __name__ == "__main__":
+    fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    failed = 0
+    for fn in fns:
+        try:
+            fn()
+            print(f"  ok  {fn.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"FAIL  {fn.__name__}: {e}")
+    print(f"\n{len(fns) - failed}/{len(fns)} passed")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,129 @@
+"""Tests for run_param_grid (backtest/grid.py): one pass must match per-combo backtests.
+
+Run standalone:   python dev/test_param_grid.py
+Or with pytest:   pytest dev/test_param_grid.py
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import stonkslib.strategies.engine as engine
+from stonkslib.backtest.grid import run_param_grid, apply_params, expand_grid, METRIC_COLUMNS
+from stonkslib.backtest.strategy import run_strategy_backtest, load_strategy
+from stonkslib.indicators.registry import set_result_cache_budget
+
+logging.getLogger("stonkslib").setLevel(logging.WARNING)
+
+STRATEGY = load_strategy(os.path.join(os.path.dirname(__file__), "..", "stonkslib",
+                                      "strategies", "rsi_macd_v2.yaml"))
+
+
+def _prices(n=756, seed=21):
+    rng = np.random.default_rng(seed)
+    close = 80 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    open_ = close * (1 + rng.normal(0, 0.004, n))
+    return pd.DataFrame({"Open": open_, "High": np.maximum(open_, close) * 1.01,
+                         "Low": np.minimum(open_, close) * 0.99, "Close": close,
+                         "Volume": np.full(n, 2e5)},
+                        index=pd.date_range("2021-01-04", periods=n, freq="D", tz="UTC"))
+
+
+GRID = {"rsi.period": [5, 7, 14], "macd.short": [8, 12], "risk.stop_loss_pct": [0.05, 0.1]}
+
+
+def test_grid_matches_individual_backtests():
+    df = _prices()
+    table = run_param_grid("AAA", "1d", STRATEGY, GRID, df_override=df)
+    assert len(table) == 12 and list(table.columns[:5]) == ["ticker", "interval", "rsi.period",
+                                                            "macd.short", "risk.stop_loss_pct"]
+    with tempfile.TemporaryDirectory() as tmp:
+        for _, row in table.iterrows():
+            params = {k: row[k] for k in GRID}
+            ref = run_strategy_backtest("AAA", "1d", apply_params(STRATEGY, params),
+                                        output_dir=tmp, df_override=df, use_cache=False)
+            for col in METRIC_COLUMNS:
+                assert row[col] == ref[col], (params, col, row[col], ref[col])
+    assert table["trades"].sum() > 0
+
+
+def test_each_indicator_parameterization_runs_once():
+    set_result_cache_budget(0)        # prove the dedupe doesn't lean on the result cache
+    calls = []
+    orig = engine.compute_indicator
+    engine.compute_indicator = lambda key, df, kwargs: calls.append(key) or orig(key, df, kwargs)
+    try:
+        run_param_grid("AAA", "1d", STRATEGY, GRID, df_override=_prices(300))
+    finally:
+        engine.compute_indicator = orig
+        set_result_cache_budget(256)
+    assert sorted(calls) == ["macd", "macd", "rsi", "rsi", "rsi"]
+
+
+def test_trailing_stop_and_sizing_options():
+    df = _prices(400, seed=4)
+    combos = expand_grid({"rsi.period": [7, 10]})
+    table = run_param_grid("AAA", "1d", STRATEGY, combos, df_override=df,
+                           trailing_stop_pct=0.1, per_signal_amount=500)
+    with tempfile.TemporaryDirectory() as tmp:
+        for params, (_, row) in zip(combos, table.iterrows()):
+            ref = run_strategy_backtest("AAA", "1d", apply_params(STRATEGY, params), output_dir=tmp,
+                                        df_override=df, trailing_stop_pct=0.1, per_signal_amount=500,
+                                        use_cache=False)
+            assert all(row[c] == ref[c] for c in METRIC_COLUMNS), params
+
+
+def test_bad_keys_and_legacy_strategies_are_rejected():
+    for bad in ({"period": [7]}, {"bollinger.window": [20]}):
+        try:
+            run_param_grid("AAA", "1d", STRATEGY, bad, df_override=_prices(100))
+        except ValueError:
+            continue
+        raise AssertionError(f"{bad} should be rejected")
+    legacy = {"name": "old", "indicators": {"rsi": {"enabled": True}}}
+    try:
+        run_param_grid("AAA", "1d", legacy, GRID, df_override=_prices(100))
+    except ValueError:
+        return
+    raise AssertionError("legacy strategy should be rejected")
+
+
+def test_grid_is_faster_than_looping_backtests():
+    df = _prices()
+    grid = {"rsi.period": [5, 7, 9, 14], "rsi.overbought": [65, 70, 75], "macd.short": [8, 12]}
+    t0 = time.perf_counter()
+    run_param_grid("AAA", "1d", STRATEGY, grid, df_override=df)
+    batched = time.perf_counter() - t0
+    set_result_cache_budget(0)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            t0 = time.perf_counter()
+            for params in expand_grid(grid):
+                run_strategy_backtest("AAA", "1d", apply_params(STRATEGY, params), output_dir=tmp,
+                                      df_override=df, use_cache=False)
+            looped = time.perf_counter() - t0
+    finally:
+        set_result_cache_budget(256)
+    print(f"    24 combos: grid {batched * 1e3:.0f} ms vs loop {looped * 1e3:.0f} ms")
+    assert batched < looped
+
+
+if __name__ == "__main__":
+    fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    failed = 0
+    for fn in fns:
+        try:
+            fn()
+            print(f"  ok  {fn.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"FAIL  {fn.__name__}: {e}")
+    print(f"\n{len(fns) - failed}/{len(fns)} passed")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,177 @@
+"""Tests for the staged pipeline runner (cli/pipeline.py: run_pipeline_concurrent).
+
+yf.download is replaced with an in-memory stand-in (the `downloader=` hook) and the
+clean/analyze stage runs on a thread pool with a recording _process, so nothing
+touches the network or data/.
+
+Run standalone:   python dev/test_pipeline_concurrent.py
+Or with pytest:   pytest dev/test_pipeline_concurrent.py
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import stonkslib.cli.pipeline as pipeline
+import stonkslib.fetch.td as td
+
+# cli/pipeline.py and fetch/td.py point the root logger at files in the repo's log/ on
+# import; keep test runs out of them.
+for _h in [h for h in logging.getLogger().handlers if isinstance(h, logging.FileHandler)
+           and Path(h.baseFilename).parent == td.PROJECT_ROOT / "log"]:
+    logging.getLogger().removeHandler(_h)
+    _h.close()
+
+TICKERS = [f"T{i:02d}" for i in range(11)]
+
+
+class _FakeYahoo:
+    """Daily bars ending yesterday for every requested symbol; records each request."""
+
+    def __init__(self):
+        end = pd.Timestamp.now().normalize() - pd.Timedelta(days=1)
+        self.index = pd.date_range(end=end, periods=300, freq="D", name="Date")
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def download(self, tickers, interval=None, period=None, start=None, group_by=None, progress=False):
+        with self.lock:
+            self.calls.append(list(tickers))
+        parts = {}
+        for t in tickers:
+            px = 50 + np.arange(len(self.index), dtype=float) + int(t[1:])
+            parts[t] = pd.DataFrame(np.column_stack([px, px + 1, px - 1, px, px * 10]),
+                                    index=self.index,
+                                    columns=["Close", "High", "Low", "Open", "Volume"])
+        return pd.concat(parts, axis=1, names=["Ticker", "Price"])
+
+
+class _Stage:
+    """Recording stand-in for _process: reads the raw CSV the fetch stage handed over."""
+
+    def __init__(self, raw_dir, crash=()):
+        self.raw_dir = Path(raw_dir)
+        self.crash = set(crash)
+        self.seen = {}
+        self.lock = threading.Lock()
+
+    def __call__(self, ticker, interval, force=False, analyze=True, rebuild=False):
+        if ticker in self.crash:
+            raise RuntimeError("worker died")
+        rows = len(pd.read_csv(self.raw_dir / ticker / f"{interval}.csv", skiprows=[1, 2]))
+        with self.lock:
+            self.seen[ticker] = (interval, analyze, rows)
+        return True
+
+
+def _patched(tmp, stage):
+    """Point the pipeline's config at `tmp` and its process stage at `stage`."""
+    yaml_file = Path(tmp) / "tickers.yaml"
+    yaml_file.write_text("stocks:\n" + "".join(f"  - {t}\n" for t in TICKERS))
+    cfg = {"project": {"ticker_yaml": str(yaml_file), "ticker_data_dir": str(Path(tmp) / "raw")}}
+    orig = pipeline._config, pipeline._process
+    pipeline._config = lambda: cfg
+    pipeline._process = stage
+    return orig
+
+
+def _restore(orig):
+    pipeline._config, pipeline._process = orig
+
+
+def test_concurrent_matches_serial():
+    with tempfile.TemporaryDirectory() as serial_tmp, tempfile.TemporaryDirectory() as conc_tmp:
+        serial = _Stage(Path(serial_tmp) / "raw")
+        orig = _patched(serial_tmp, serial)
+        try:
+            fake = _FakeYahoo()
+            ok_serial = sum(pipeline.run_pipeline(t, "1d", analyze=False, downloader=fake.download)
+                            for t in TICKERS)
+        finally:
+            _restore(orig)
+
+        conc = _Stage(Path(conc_tmp) / "raw")
+        orig = _patched(conc_tmp, conc)
+        try:
+            fake = _FakeYahoo()
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                ok_conc = pipeline.run_pipeline_concurrent(TICKERS, "1d", analyze=False,
+                                                           batch_size=4, downloader=fake.download,
+                                                           pool=pool)
+        finally:
+            _restore(orig)
+
+        # 11 tickers in batches of 4 → 3 requests, each ticker processed once.
+        assert sorted(len(c) for c in fake.calls) == [3, 4, 4]
+        assert ok_serial == ok_conc == len(TICKERS)
+        assert serial.seen == conc.seen and set(conc.seen) == set(TICKERS)
+        assert all(v == ("1d", False, 300) for v in conc.seen.values())
+        for t in TICKERS:
+            a = Path(serial_tmp) / "raw" / t / "1d.csv"
+            b = Path(conc_tmp) / "raw" / t / "1d.csv"
+            assert a.read_bytes() == b.read_bytes()
+
+
+def test_crashed_worker_fails_only_its_ticker():
+    with tempfile.TemporaryDirectory() as tmp:
+        stage = _Stage(Path(tmp) / "raw", crash={"T03", "T07"})
+        orig = _patched(tmp, stage)
+        try:
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                ok = pipeline.run_pipeline_concurrent(TICKERS, "1d", batch_size=5,
+                                                      downloader=_FakeYahoo().download, pool=pool)
+        finally:
+            _restore(orig)
+    assert ok == len(TICKERS) - 2
+    assert set(stage.seen) == set(TICKERS) - {"T03", "T07"}
+
+
+def test_failed_batch_retries_per_ticker():
+    calls = []
+    real_fetch_all = td.fetch_all
+
+    def flaky_fetch_all(tickers=None, **kwargs):
+        calls.append(list(tickers))
+        if "T05" in tickers:
+            raise RuntimeError("bad symbol")
+        return real_fetch_all(tickers=tickers, **kwargs)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stage = _Stage(Path(tmp) / "raw")
+        orig = _patched(tmp, stage)
+        td.fetch_all = flaky_fetch_all
+        try:
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                ok = pipeline.run_pipeline_concurrent(TICKERS, "1d", batch_size=4,
+                                                      downloader=_FakeYahoo().download, pool=pool)
+        finally:
+            td.fetch_all = real_fetch_all
+            _restore(orig)
+    # The batch holding T05 (T04–T07) is retried one ticker at a time.
+    assert ["T04", "T05", "T06", "T07"] in calls
+    assert [["T04"], ["T05"], ["T06"], ["T07"]] == [c for c in calls if len(c) == 1]
+    assert ok == len(TICKERS) - 1 and "T05" not in stage.seen
+    assert {"T04", "T06", "T07"} <= set(stage.seen)
+
+
+if __name__ == "__main__":
+    fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    failed = 0
+    for fn in fns:
+        try:
+            fn()
+            print(f"  ok  {fn.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"FAIL  {fn.__name__}: {e}")
+    print(f"\n{len(fns) - failed}/{len(fns)} passed")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,121 @@
+"""Tests for the consolidated Arrow price store and load_td's read-through.
+
+Run standalone:   python dev/test_price_store.py
+Or with pytest:   pytest dev/test_price_store.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from stonkslib.utils.load_td import cache_info, clear_cache, load_td, set_cache_budget
+from stonkslib.utils.price_store import build_price_store, open_price_store
+
+
+def _write_clean(clean_dir, ticker, n, seed):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    idx = pd.DatetimeIndex(pd.date_range("2020-01-01", periods=n, freq="D", tz="UTC"), name="date")
+    df = pd.DataFrame({"open": close, "high": close + 1, "low": close - 1, "close": close,
+                       "volume": rng.integers(1_000, 5_000, n).astype(float)}, index=idx)
+    path = Path(clean_dir) / ticker / "1d.parquet"
+    path.parent.mkdir(parents=True)
+    df.iloc[::-1].to_parquet(path)  # unsorted on disk, like a careless writer
+    return path
+
+
+def test_store_matches_parquet_and_is_zero_copy():
+    with tempfile.TemporaryDirectory() as root:
+        clean = Path(root) / "clean"
+        for i, t in enumerate(["AAA", "BBB", "CCC"]):
+            _write_clean(clean, t, 50 + i, seed=i)
+        from_parquet = load_td(["AAA", "BBB", "CCC"], "1d", base_dir=clean)
+
+        time.sleep(0.01)
+        assert build_price_store("1d", clean_dir=clean, store_dir=Path(root) / "store")
+        store = open_price_store("1d", Path(root) / "store")
+        assert store.tickers == ["AAA", "BBB", "CCC"]
+        assert open_price_store("1d", Path(root) / "store") is store  # mapping reused
+        assert store.scan().num_rows == 50 + 51 + 52
+
+        clear_cache()
+        from_store = load_td(["AAA", "BBB", "CCC"], "1d", base_dir=clean)
+        for t in from_parquet:
+            pd.testing.assert_frame_equal(from_store[t], from_parquet[t])
+            assert from_store[t].attrs["ticker"] == t
+            assert not from_store[t]["Close"].to_numpy().flags.writeable
+
+
+def test_stale_store_falls_back_to_parquet():
+    with tempfile.TemporaryDirectory() as root:
+        clean = Path(root) / "clean"
+        path = _write_clean(clean, "AAA", 30, seed=0)
+        build_price_store("1d", clean_dir=clean, store_dir=Path(root) / "store")
+
+        time.sleep(0.01)
+        df = pd.read_parquet(path).iloc[:10]
+        df.to_parquet(path)  # parquet now newer than the store
+        assert len(load_td(["AAA"], "1d", base_dir=clean)["AAA"]) == 10
+
+
+def test_load_td_cache_hits_and_protects_frames():
+    with tempfile.TemporaryDirectory() as root:
+        clean = Path(root) / "clean"
+        path = _write_clean(clean, "AAA", 30, seed=0)
+        clear_cache()
+        a = load_td(["AAA"], "1d", base_dir=clean)["AAA"]
+        b = load_td(["AAA"], "1d", base_dir=clean)["AAA"]
+        assert cache_info()["hits"] == 1 and cache_info()["misses"] == 1
+
+        b["Extra"] = 1.0                      # column assignment stays on the caller's copy
+        assert "Extra" not in a.columns
+        try:
+            b.iloc[0, 0] = -1.0               # in-place writes can't corrupt the cache
+            raise AssertionError("cached frame was writable")
+        except ValueError:
+            pass
+
+        time.sleep(0.01)
+        pd.read_parquet(path).iloc[:5].to_parquet(path)  # rewrite -> new (mtime, size) key
+        assert len(load_td(["AAA"], "1d", base_dir=clean)["AAA"]) == 5
+
+
+def test_disabled_cache_still_serves_read_only_frames():
+    budget_mb = cache_info()["budget"] / (1024 * 1024)
+    with tempfile.TemporaryDirectory() as root:
+        clean = Path(root) / "clean"
+        _write_clean(clean, "AAA", 30, seed=0)
+        clear_cache()
+        set_cache_budget(0)
+        try:
+            df = load_td(["AAA"], "1d", base_dir=clean)["AAA"]
+            assert cache_info()["entries"] == 0
+        finally:
+            set_cache_budget(budget_mb)
+    assert not any(df[c].to_numpy().flags.writeable for c in df.columns)
+    try:
+        df.iloc[0, 0] = -1.0
+        raise AssertionError("frame was writable with the cache disabled")
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    failed = 0
+    for fn in fns:
+        try:
+            fn()
+            print(f"  ok  {fn.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"FAIL  {fn.__name__}: {e}")
+    print(f"\n{len(fns) - failed}/{len(fns)} passed")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,81 @@
+"""Parity tests for the strided RSI divergence detector.
+
+`_reference_rsi_divergence` is the original per-bar slicing implementation.
+
+Run standalone:   python dev/test_rsi_divergence.py
+Or with pytest:   pytest dev/test_rsi_divergence.py
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from stonkslib.indicators.rsi import rsi as calc_rsi
+from stonkslib.indicators.rsi_divergence import rsi_divergence
+
+
+def _reference_rsi_divergence(df, period=14, lookback=20):
+    rsi_series = calc_rsi(df.copy(), period=period)
+    close = df["Close"]
+    bullish = pd.Series(False, index=df.index)
+    bearish = pd.Series(False, index=df.index)
+    for i in range(lookback, len(df)):
+        window_close = close.iloc[i - lookback: i + 1]
+        window_rsi = rsi_series.iloc[i - lookback: i + 1]
+        if window_close.isna().any() or window_rsi.isna().any():
+            continue
+        current_close = close.iloc[i]
+        current_rsi = rsi_series.iloc[i]
+        prior_close_min = window_close.iloc[:-1].min()
+        prior_rsi_at_min = window_rsi.iloc[window_close.iloc[:-1].argmin()]
+        if current_close < prior_close_min and current_rsi > prior_rsi_at_min:
+            bullish.iloc[i] = True
+        prior_close_max = window_close.iloc[:-1].max()
+        prior_rsi_at_max = window_rsi.iloc[window_close.iloc[:-1].argmax()]
+        if current_close > prior_close_max and current_rsi < prior_rsi_at_max:
+            bearish.iloc[i] = True
+    return pd.DataFrame({
+        "Bullish_Divergence": bullish,
+        "Bearish_Divergence": bearish,
+        "RSI": rsi_series,
+    }, index=df.index)
+
+
+def _close(n, seed=0, decimals=2):
+    rng = np.random.default_rng(seed)
+    close = np.round(100 + np.cumsum(rng.normal(0, 1, n)), decimals)
+    idx = pd.date_range("2015-01-01", periods=n, freq="D")
+    return pd.DataFrame({"Close": close}, index=idx)
+
+
+def test_parity_param_sweep():
+    for seed, decimals in [(0, 2), (1, 0)]:  # decimals=0 -> tied lows/highs (first-occurrence argmin)
+        df = _close(1500, seed, decimals)
+        for period, lookback in [(14, 20), (7, 5), (21, 50)]:
+            got = rsi_divergence(df, period, lookback)
+            ref = _reference_rsi_divergence(df, period, lookback)
+            pd.testing.assert_frame_equal(got, ref)
+            assert got["Bullish_Divergence"].any() and got["Bearish_Divergence"].any()
+
+
+def test_short_frame():
+    df = _close(10)
+    pd.testing.assert_frame_equal(rsi_divergence(df), _reference_rsi_divergence(df))
+
+
+if __name__ == "__main__":
+    fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    failed = 0
+    for fn in fns:
+        try:
+            fn()
+            print(f"  ok  {fn.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"FAIL  {fn.__name__}: {e}")
+    print(f"\n{len(fns) - failed}/{len(fns)} passed")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,169 @@
+"""Parity tests for the array-based v2 fill simulator (backtest/simulate.py).
+
+Run standalone:   python dev/test_simulate.py
+Or with pytest:   pytest dev/test_simulate.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from stonkslib.backtest.simulate import simulate_signals
+from stonkslib.backtest.strategy import run_strategy_backtest, load_strategy
+
+
+def _reference(df, entry_sig, exit_sig, cash, risk_per_trade, slippage, stop_loss_pct,
+               trailing_stop_pct=None, per_signal_amount=0):
+    """The v2 part of the old iterrows loop in run_strategy_backtest, verbatim."""
+    total_signal_invested = 0.0
+    pos = 0.0
+    entry_price = None
+    peak_price = None
+    trades = []
+    equity_curve = []
+    pending = None
+    pending_reason = ""
+    for idx, (i, row) in enumerate(df.iterrows()):
+        open_price = row.get("Open")
+        close = row.get("Close")
+        if pending and open_price and not pd.isna(open_price):
+            if pending == "buy" and pos == 0:
+                fill = open_price * (1 + slippage)
+                if per_signal_amount > 0:
+                    amount = min(float(per_signal_amount), cash)
+                    size   = amount / fill
+                else:
+                    amount = cash * risk_per_trade
+                    size   = amount / fill
+                if size > 0.00001:
+                    pos = size
+                    entry_price = fill
+                    peak_price = fill
+                    cash -= amount
+                    total_signal_invested += amount
+                    trades.append({"action": "BUY", "date": str(i),
+                                   "price": round(fill, 4), "size": round(pos, 8),
+                                   "cash": round(float(cash), 2), "reason": pending_reason})
+            elif pending == "sell" and pos > 0:
+                fill = open_price * (1 - slippage)
+                cash += pos * fill
+                pnl = (fill - entry_price) * pos
+                trades.append({"action": "SELL", "date": str(i),
+                                "price": round(fill, 4), "size": round(pos, 8),
+                                "cash": round(float(cash), 2),
+                                "pnl": round(float(pnl), 2), "reason": pending_reason})
+                pos = 0
+                entry_price = None
+                peak_price = None
+            pending = None
+            pending_reason = ""
+        if close is None or pd.isna(close):
+            continue
+        portfolio_val = float(cash) + (pos * float(close) if pos > 0 else 0)
+        equity_curve.append({"date": str(i), "value": round(portfolio_val, 2)})
+        if trailing_stop_pct and pos > 0 and peak_price is not None and pending is None:
+            peak_price = max(peak_price, float(close))
+            if float(close) < peak_price * (1 - trailing_stop_pct):
+                pending = "sell"
+                pending_reason = f"Trailing Stop ({trailing_stop_pct:.0%} from ${peak_price:.2f})"
+                continue
+        if pos == 0 and pending is None:
+            if bool(entry_sig.iloc[idx]):
+                pending, pending_reason = "buy", "Entry signal"
+        elif pos > 0 and pending is None and not trailing_stop_pct:
+            if bool(exit_sig.iloc[idx]):
+                pending, pending_reason = "sell", "Exit signal"
+            elif stop_loss_pct > 0 and entry_price and close < entry_price * (1 - stop_loss_pct):
+                pending, pending_reason = "sell", "Stop Loss"
+    return {"trades": trades, "equity_curve": equity_curve, "cash": cash,
+            "invested": total_signal_invested, "pos": pos, "entry_price": entry_price}
+
+
+def _frame(n, seed, holes=False):
+    rng = np.random.default_rng(seed)
+    close = 50 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    open_ = close * (1 + rng.normal(0, 0.005, n))
+    if holes:
+        open_[rng.choice(n, n // 20, replace=False)] = np.nan
+        close[rng.choice(n, n // 25, replace=False)] = np.nan
+        open_[5] = 0.0
+    df = pd.DataFrame({"Open": open_, "High": open_, "Low": close, "Close": close,
+                       "Volume": np.full(n, 1e5)},
+                      index=pd.date_range("2018-01-01", periods=n, freq="D", tz="UTC"))
+    entry = pd.Series(rng.random(n) < 0.08, index=df.index)
+    exit_ = pd.Series(rng.random(n) < 0.05, index=df.index)
+    return df, entry, exit_
+
+
+def _same(got, ref):
+    assert json.dumps(got["trades"]) == json.dumps(ref["trades"])
+    curve = [{"date": str(d), "value": v} for d, v in zip(got["equity_index"], got["equity"].tolist())]
+    assert json.dumps(curve) == json.dumps(ref["equity_curve"])
+    for key in ("cash", "invested", "pos", "entry_price"):
+        assert got[key] == ref[key] or (got[key] is None and ref[key] is None), key
+    assert round(got["invested"], 2) == round(ref["invested"], 2)
+
+
+CASES = [
+    dict(risk_per_trade=0.2, slippage=0.0005, stop_loss_pct=0.1),
+    dict(risk_per_trade=1.0, slippage=0.001, stop_loss_pct=0.03),
+    dict(risk_per_trade=0.5, slippage=0.0, stop_loss_pct=0.0),
+    dict(risk_per_trade=0.2, slippage=0.0005, stop_loss_pct=0.1, trailing_stop_pct=0.08),
+    dict(risk_per_trade=0.2, slippage=0.0005, stop_loss_pct=0.1, per_signal_amount=750),
+    dict(risk_per_trade=0.2, slippage=0.0005, stop_loss_pct=0.05, per_signal_amount=25_000),
+]
+
+
+def test_matches_row_loop():
+    for seed in range(6):
+        for holes in (False, True):
+            df, entry, exit_ = _frame(600, seed, holes)
+            for case in CASES:
+                ref = _reference(df, entry, exit_, 10_000.0, **case)
+                got = simulate_signals(df, entry, exit_, start_cash=10_000.0, **case)
+                _same(got, ref)
+
+
+def test_open_position_is_handed_back():
+    df, entry, exit_ = _frame(50, 1)
+    entry[:] = False
+    entry.iloc[45] = True
+    exit_[:] = False
+    got = simulate_signals(df, entry, exit_, 10_000.0, 0.2, 0.0005, 0.1)
+    assert got["pos"] > 0 and got["trades"][-1]["action"] == "BUY"
+    assert abs(got["entry_price"] - got["trades"][-1]["price"]) < 1e-4
+
+
+def test_backtest_end_to_end():
+    df, _, _ = _frame(800, 11)
+    strategy = load_strategy(os.path.join(os.path.dirname(__file__), "..", "stonkslib",
+                                          "strategies", "rsi_macd_v2.yaml"))
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        metrics = run_strategy_backtest("AAA", "1d", strategy, output_dir=tmp, df_override=df,
+                                        use_cache=False)
+        elapsed = time.perf_counter() - t0
+    assert metrics is not None and len(metrics["equity_curve"]) == len(df)
+    assert metrics["final_cash"] == round(metrics["start_cash"] + metrics["net_pnl"], 2)
+    print(f"    run_strategy_backtest (800 bars, v2): {elapsed * 1e3:.0f} ms")
+
+
+if __name__ == "__main__":
+    fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    failed = 0
+    for fn in fns:
+        try:
+            fn()
+            print(f"  ok  {fn.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"FAIL  {fn.__name__}: {e}")
+    print(f"\n{len(fns) - failed}/{len(fns)} passed")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,135 @@
+"""Parity tests for the array-based supertrend kernel.
+
+`_reference_supertrend` is the original per-bar `.iloc` implementation, kept here
+verbatim so the kernel can be checked bit-for-bit against it.
+
+Run standalone:   python dev/test_supertrend.py          (also prints a micro-benchmark)
+Or with pytest:   pytest dev/test_supertrend.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from stonkslib.indicators.supertrend import supertrend
+
+
+def _reference_supertrend(df, period=10, multiplier=3.0):
+    high = df["High"]
+    low = df["Low"]
+    close = df["Close"]
+
+    tr = pd.concat([
+        high - low,
+        (high - close.shift(1)).abs(),
+        (low - close.shift(1)).abs(),
+    ], axis=1).max(axis=1)
+    atr = tr.ewm(span=period, adjust=False).mean()
+
+    hl_avg = (high + low) / 2
+    upper_band = hl_avg + multiplier * atr
+    lower_band = hl_avg - multiplier * atr
+
+    supertrend = pd.Series(index=df.index, dtype=float)
+    direction = pd.Series(index=df.index, dtype=int)
+
+    for i in range(1, len(df)):
+        if upper_band.iloc[i] < upper_band.iloc[i - 1] or close.iloc[i - 1] > upper_band.iloc[i - 1]:
+            upper_band.iloc[i] = upper_band.iloc[i]
+        else:
+            upper_band.iloc[i] = upper_band.iloc[i - 1]
+
+        if lower_band.iloc[i] > lower_band.iloc[i - 1] or close.iloc[i - 1] < lower_band.iloc[i - 1]:
+            lower_band.iloc[i] = lower_band.iloc[i]
+        else:
+            lower_band.iloc[i] = lower_band.iloc[i - 1]
+
+        if i == 1:
+            direction.iloc[i] = 1
+        elif supertrend.iloc[i - 1] == upper_band.iloc[i - 1]:
+            direction.iloc[i] = -1 if close.iloc[i] > upper_band.iloc[i] else 1
+        else:
+            direction.iloc[i] = 1 if close.iloc[i] < lower_band.iloc[i] else -1
+
+        supertrend.iloc[i] = lower_band.iloc[i] if direction.iloc[i] == 1 else upper_band.iloc[i]
+
+    return pd.DataFrame({
+        "Supertrend": supertrend,
+        "Direction": direction,
+        "Upper_Band": upper_band,
+        "Lower_Band": lower_band,
+    }, index=df.index)
+
+
+def _ohlc(n, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    spread = np.abs(rng.normal(0, 1, n))
+    idx = pd.date_range("2015-01-01", periods=n, freq="h")
+    return pd.DataFrame({"High": close + spread, "Low": close - spread, "Close": close}, index=idx)
+
+
+def _assert_identical(a, b):
+    assert list(a.columns) == list(b.columns)
+    for col in a.columns:
+        x = a[col].to_numpy(dtype=float)
+        y = b[col].to_numpy(dtype=float)
+        assert np.array_equal(x, y, equal_nan=True), col
+
+
+def test_parity_random_walk():
+    df = _ohlc(2000)
+    for period, mult in [(10, 3.0), (7, 2.0), (20, 1.5)]:
+        _assert_identical(supertrend(df, period, mult), _reference_supertrend(df, period, mult))
+
+
+def test_parity_with_gaps():
+    df = _ohlc(500, seed=3)
+    df.iloc[[5, 40, 41, 300], :] = np.nan
+    _assert_identical(supertrend(df), _reference_supertrend(df))
+
+
+def test_short_frames():
+    for n in (0, 1, 2, 3):
+        df = _ohlc(n)
+        _assert_identical(supertrend(df), _reference_supertrend(df))
+
+
+def test_does_not_mutate_input():
+    df = _ohlc(200)
+    before = df.copy()
+    supertrend(df)
+    pd.testing.assert_frame_equal(df, before)
+
+
+def benchmark(n=50_000):
+    df = _ohlc(n)
+    supertrend(df.iloc[:100])  # warm up (JIT compile when numba is installed)
+    t0 = time.perf_counter()
+    supertrend(df)
+    fast = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    _reference_supertrend(df)
+    ref = time.perf_counter() - t0
+    print(f"\nsupertrend on {n} bars: kernel {fast * 1e9 / n:,.0f} ns/bar, "
+          f".iloc loop {ref * 1e9 / n:,.0f} ns/bar ({ref / fast:,.0f}x)")
+
+
+if __name__ == "__main__":
+    fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    failed = 0
+    for fn in fns:
+        try:
+            fn()
+            print(f"  ok  {fn.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"FAIL  {fn.__name__}: {e}")
+    print(f"\n{len(fns) - failed}/{len(fns)} passed")
+    benchmark()
+    sys.exit(1 if failed else 0)
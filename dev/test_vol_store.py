@@ -0,0 +1,160 @@
+"""Per-ticker vol store (utils/vol_store.py) and its use by the LEAP backtester.
+
+Run standalone:   python dev/test_vol_store.py
+Or with pytest:   pytest dev/test_vol_store.py
+"""
+
+import logging
+import math
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import stonkslib.backtest.leaps as leaps
+import stonkslib.utils.vol_store as vol_store
+from stonkslib.backtest.strategy import load_strategy
+import stonkslib.cli.leaps_backtest as cli
+from stonkslib.utils.vol_store import (DEFAULT_VOL_MODEL, VOL_MODELS, build_vol_store,
+                                       compute_vol, fit_garch, garch_params, load_vol, vol_frame)
+
+logging.getLogger("stonkslib").setLevel(logging.WARNING)
+
+
+# Reference copy of leaps._realized_vol before the vol store.
+def _realized_vol_ref(close_series, window=30):
+    log_ret = np.log(close_series / close_series.shift(1))
+    return log_ret.rolling(window).std() * math.sqrt(252)
+
+
+def _garch_prices(n, seed, omega=2e-6, alpha=0.08, beta=0.90):
+    rng = np.random.default_rng(seed)
+    var, rets = omega / (1 - alpha - beta), np.empty(n)
+    for i in range(n):
+        rets[i] = rng.normal() * math.sqrt(var)
+        var = omega + alpha * rets[i] ** 2 + beta * var
+    close = 100 * np.exp(np.cumsum(rets))
+    open_ = close * (1 + rng.normal(0, 0.003, n))
+    return pd.DataFrame({"Open": open_, "High": open_, "Low": close, "Close": close,
+                         "Volume": np.full(n, 1e5)},
+                        index=pd.date_range("2012-01-02", periods=n, freq="B", tz="UTC"))
+
+
+def test_models_match_their_recursions():
+    close = _garch_prices(600, 0)["Close"]
+    close.iloc[[100, 101, 400]] = np.nan
+    pd.testing.assert_series_equal(compute_vol(close, "rv_30"), _realized_vol_ref(close),
+                                   check_names=False)
+
+    r = np.log(close / close.shift(1)).to_numpy()
+    var, ewma = None, []
+    for x in r[1:]:
+        if not np.isnan(x):
+            var = x * x if var is None else 0.94 * var + 0.06 * x * x
+        ewma.append(var)
+    got = compute_vol(close, "ewma").to_numpy()[1:]
+    np.testing.assert_allclose(got[40:], np.sqrt(ewma[40:]) * math.sqrt(252), rtol=1e-12)
+    assert np.isnan(got[:28]).all()
+
+    frame = vol_frame(close)
+    p = frame.attrs["garch"]
+    eps2 = (r[~np.isnan(r)] - p["mean"]) ** 2
+    sig2, loop = p["var"], []
+    for e2 in eps2:
+        loop.append(math.sqrt(p["omega"] + p["alpha"] * e2 + p["beta"] * sig2) * math.sqrt(252))
+        sig2 = p["omega"] + p["alpha"] * e2 + p["beta"] * sig2
+    np.testing.assert_allclose(frame["garch"].to_numpy()[~np.isnan(r)], loop, rtol=1e-10)
+    assert list(frame.columns) == VOL_MODELS
+
+
+def test_cli_vol_models_match_the_store():
+    # The CLI keeps its own copy so `stonks` doesn't import scipy/pyarrow at startup.
+    option = next(p for p in cli.leaps_backtest.params if p.name == "vol_model")
+    assert cli.VOL_MODELS == VOL_MODELS
+    assert list(option.type.choices) == VOL_MODELS and option.default == DEFAULT_VOL_MODEL
+
+
+def test_garch_fit_recovers_parameters():
+    close = _garch_prices(4000, 1)["Close"]
+    p = fit_garch(np.diff(np.log(close.to_numpy())))
+    assert abs(p["alpha"] - 0.08) < 0.03 and abs(p["beta"] - 0.90) < 0.04
+    assert fit_garch(np.zeros(50)) is None
+
+
+def test_store_round_trip_and_staleness():
+    df = _garch_prices(800, 2)
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "AAA" / "1d.parquet"
+        src.parent.mkdir()
+        df.rename(columns=str.lower).to_parquet(src)
+        assert load_vol("AAA", "1d", "garch", clean_dir=tmp) is None
+        path = build_vol_store("AAA", "1d", clean_dir=tmp)
+        assert path.name == "1d_vol.parquet"
+
+        stored = load_vol("AAA", "1d", "garch", clean_dir=tmp)
+        expected = vol_frame(df["Close"])
+        pd.testing.assert_series_equal(stored, expected["garch"], check_names=False,
+                                       check_index_type=False, check_freq=False)
+        assert garch_params("AAA", "1d", clean_dir=tmp) == expected.attrs["garch"]
+        window = df.index[-100:]
+        assert load_vol("AAA", "1d", "rv_90", window, clean_dir=tmp).notna().all()
+        longer = window.append(pd.DatetimeIndex([window[-1] + pd.Timedelta(days=7)]))
+        assert load_vol("AAA", "1d", "rv_30", longer, clean_dir=tmp) is None
+
+        os.utime(src, (time.time() + 5, time.time() + 5))   # parquet rewritten after the store
+        assert load_vol("AAA", "1d", "rv_30", clean_dir=tmp) is None
+        try:
+            load_vol("AAA", "1d", "rv_7", clean_dir=tmp)
+            raise AssertionError("unknown model accepted")
+        except ValueError:
+            pass
+
+
+def test_leaps_backtest_prices_off_the_store():
+    full = _garch_prices(1200, 3)
+    strategy = load_strategy(os.path.join(os.path.dirname(__file__), "..", "stonkslib",
+                                          "strategies", "bollinger.yaml"))
+    orig = leaps.load_td, leaps.load_vol, vol_store.fit_garch
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "AAA" / "1d.parquet"
+        src.parent.mkdir()
+        full.to_parquet(src)
+        build_vol_store("AAA", "1d", clean_dir=tmp)
+        leaps.load_td = lambda tickers, interval: {tickers[0]: full}
+        leaps.load_vol = lambda t, i, m, index: load_vol(t, i, m, index, clean_dir=tmp)
+
+        def no_refit(*a, **kw):
+            raise AssertionError("GARCH refit at backtest time")
+        vol_store.fit_garch = no_refit
+        try:
+            window = full.iloc[-756:]
+            vol = leaps._leap_vol(window, "AAA", "1d", "garch")
+            stored = load_vol("AAA", "1d", "garch", clean_dir=tmp).iloc[-756:].to_numpy()
+            np.testing.assert_array_equal(vol, np.maximum(stored, 0.05))
+            # History before the window warms up the rolling windows too.
+            assert (leaps._leap_vol(window, "AAA", "1d", "rv_90")[:90] != 0.30).all()
+            m = leaps.run_leaps_backtest("AAA", "1d", strategy, output_dir=tmp, use_cache=False,
+                                         vol_model="garch")
+        finally:
+            leaps.load_td, leaps.load_vol, vol_store.fit_garch = orig
+    assert m["vol_model"] == "garch" and "GARCH" in m["pricing_note"] and m["trades"] > 0
+
+
+if __name__ == "__main__":
+    fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    failed = 0
+    for fn in fns:
+        try:
+            fn()
+            print(f"  ok  {fn.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"FAIL  {fn.__name__}: {e}")
+    print(f"\n{len(fns) - failed}/{len(fns)} passed")
+    sys.exit(1 if failed else 0)
@@ -10,7 +10,7 @@ from stonkslib.indicators.moving_avg_double import moving_averages
 from stonkslib.indicators.supertrend import supertrend as calc_supertrend
 from stonkslib.indicators.rsi_divergence import rsi_divergence as calc_rsi_div
 from stonkslib.indicators.markov import markov_signals as calc_markov
-from stonkslib.strategies.engine import is_v2, build_namespace, entry_signals, exit_signals, vote_signals
+from stonkslib.strategies.engine import is_v2, build_namespace, evaluate_strategy
 from stonkslib.utils.load_td import load_td
 
 logger = logging.getLogger(__name__)
@@ -25,7 +25,7 @@ def _weekly_trend(ticker: str) -> str:
         df = data.get(ticker)
         if df is None or df.empty or len(df) < 60:
             return "neutral"
-        ma_out = moving_averages(df.tail(100).copy(), swing_window=20, long_window=50, ma_type="EMA")
+        ma_out = moving_averages(df.tail(100), swing_window=20, long_window=50, ma_type="EMA")
         swing = ma_out["MA_Swing"].iloc[-1]
         long_ = ma_out["MA_Long"].iloc[-1]
         if pd.isna(swing) or pd.isna(long_):
@@ -107,7 +107,7 @@ def check_signals(ticker, interval, strategy, min_signals: int = 1,
     stop_loss_pct = float(risk.get("stop_loss_pct", 0.1))
 
     # Need enough bars for indicator warmup — use last 100
-    df = df.tail(100).copy()
+    df = df.tail(100)
     # Re-assert ticker after slicing so ticker-aware indicators resolve it.
     df.attrs["ticker"] = ticker
 
@@ -123,13 +123,13 @@ def check_signals(ticker, interval, strategy, min_signals: int = 1,
         p = rsi_cfg.get("params", {})
         rsi_overbought = p.get("overbought", 70)
         rsi_oversold = p.get("oversold", 30)
-        rsi_series = calc_rsi(df.copy(), period=p.get("period", 14))
+        rsi_series = calc_rsi(df, period=p.get("period", 14))
 
     macd_series = None
     macd_cfg = ind.get("macd", {})
     if not _v2 and macd_cfg.get("enabled"):
         p = macd_cfg.get("params", {})
-        macd_out = calc_macd(df.copy(), short_window=p.get("short", 12),
+        macd_out = calc_macd(df, short_window=p.get("short", 12),
                              long_window=p.get("long", 26), signal_window=p.get("signal", 9))
         macd_series = macd_out["MACD"]
 
@@ -137,7 +137,7 @@ def check_signals(ticker, interval, strategy, min_signals: int = 1,
     bb_cfg = ind.get("bollinger", {})
     if not _v2 and bb_cfg.get("enabled"):
         p = bb_cfg.get("params", {})
-        bb_out = bollinger_bands(df.copy(), window=p.get("window", 20),
+        bb_out = bollinger_bands(df, window=p.get("window", 20),
                                  num_std_dev=p.get("num_std_dev", 2))
         bb_upper = bb_out["Upper_Band"]
         bb_lower = bb_out["Lower_Band"]
@@ -146,7 +146,7 @@ def check_signals(ticker, interval, strategy, min_signals: int = 1,
     ma_cfg = ind.get("ma_double", {})
     if not _v2 and ma_cfg.get("enabled"):
         p = ma_cfg.get("params", {})
-        ma_out = moving_averages(df.copy(), swing_window=p.get("swing", 20),
+        ma_out = moving_averages(df, swing_window=p.get("swing", 20),
                                  long_window=p.get("long", 50), ma_type="EMA")
         ma_swing_series = ma_out["MA_Swing"]
         ma_long_series = ma_out["MA_Long"]
@@ -155,7 +155,7 @@ def check_signals(ticker, interval, strategy, min_signals: int = 1,
     st_cfg = ind.get("supertrend", {})
     if not _v2 and st_cfg.get("enabled"):
         p = st_cfg.get("params", {})
-        st_out = calc_supertrend(df.copy(), period=p.get("period", 10),
+        st_out = calc_supertrend(df, period=p.get("period", 10),
                                  multiplier=p.get("multiplier", 3.0))
         st_series = st_out
 
@@ -163,7 +163,7 @@ def check_signals(ticker, interval, strategy, min_signals: int = 1,
     div_cfg = ind.get("rsi_divergence", {})
     if not _v2 and div_cfg.get("enabled"):
         p = div_cfg.get("params", {})
-        div_series = calc_rsi_div(df.copy(), period=p.get("period", 14),
+        div_series = calc_rsi_div(df, period=p.get("period", 14),
                                   lookback=p.get("lookback", 20))
 
     mk_series = None
@@ -174,7 +174,7 @@ def check_signals(ticker, interval, strategy, min_signals: int = 1,
         p = mk_cfg.get("params", {})
         mk_bull_thr = p.get("bull_threshold", 0.6)
         mk_bear_thr = p.get("bear_threshold", 0.6)
-        mk_series = calc_markov(df.copy(), states=p.get("states", 3),
+        mk_series = calc_markov(df, states=p.get("states", 3),
                                 lookback=p.get("lookback", 60))
 
     # Check only the last two bars (need previous bar for crossover detection)
@@ -270,14 +270,15 @@ def check_signals(ticker, interval, strategy, min_signals: int = 1,
     # strategy's own entry/exit expression as an authoritative composite signal.
     if _v2:
         _ns = build_namespace(df, strategy)
-        votes = vote_signals(df, strategy, _ns)
+        plan = evaluate_strategy(df, strategy, _ns)
+        votes = plan["votes"]
         for direction in ("BUY", "SELL"):
             for src, series in votes[direction].items():
                 if bool(series.iloc[last_idx]):
                     signals.append(sig(direction, f"{src} {direction.lower()} vote", src))
-        if bool(entry_signals(df, strategy, _ns).iloc[last_idx]) and not any(s["type"] == "BUY" for s in signals):
+        if bool(plan["entry"].iloc[last_idx]) and not any(s["type"] == "BUY" for s in signals):
             signals.append(sig("BUY", "Entry signal", "strategy"))
-        if bool(exit_signals(df, strategy, _ns).iloc[last_idx]) and not any(s["type"] == "SELL" for s in signals):
+        if bool(plan["exit"].iloc[last_idx]) and not any(s["type"] == "SELL" for s in signals):
             signals.append(sig("SELL", "Exit signal", "strategy"))
 
     if not signals:
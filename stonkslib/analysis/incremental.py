@@ -0,0 +1,268 @@
+# stonkslib/analysis/incremental.py
+
+import json
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from stonkslib.indicators.bollinger import bollinger_bands, generate_bollinger_signals
+from stonkslib.indicators.macd import macd, generate_macd_signals
+from stonkslib.indicators.obv import obv, generate_obv_signals
+from stonkslib.indicators.rsi import rsi, generate_rsi_signals
+from stonkslib.indicators.moving_avg_double import moving_averages, generate_ma_signals
+from stonkslib.indicators.moving_avg_triple import moving_averages_triple, generate_triple_ma_signals
+
+# Tail-only indicator updates for aggregate_and_save.
+#
+# After a full run the state needed to resume each indicator is saved next to its
+# CSVs (`.indicators.json`): the EMA values behind MACD and the MA crossovers, the
+# running OBV total, a tail of closes long enough to refill the RSI/Bollinger rolling
+# windows, and each indicator's last output row (signals compare against it). When
+# the pipeline appends bars, only those bars are computed and appended to the CSVs.
+#
+# EMAs and OBV resume bit-exactly (pandas' adjust=False recursion seeded with the
+# stored value); RSI/Bollinger are re-rolled over the stored tail and agree with a
+# full recompute to float rounding (~1e-12). verify=True checks the appended bars
+# against a full recompute and falls back to it on any mismatch.
+
+STATE_NAME = ".indicators.json"
+STATE_VERSION = 1
+
+# Indicator parameters used by aggregate_and_save; the state records them, so changing
+# one invalidates saved state instead of resuming with the wrong windows.
+PARAMS = {
+    "rsi": {"period": 14},
+    "macd": {"short_window": 12, "long_window": 26, "signal_window": 9},
+    "bollinger": {"window": 20, "num_std_dev": 2},
+    "ma_double": {"swing_window": 20, "long_window": 50, "ma_type": "EMA"},
+    "ma_triple": {"short_window": 9, "medium_window": 21, "long_window": 50, "ma_type": "EMA"},
+}
+
+# Closes kept to refill the rolling windows (RSI needs period+1, Bollinger window).
+_TAIL = max(PARAMS["rsi"]["period"] + 1, PARAMS["bollinger"]["window"])
+
+PARITY_RTOL = 1e-9
+PARITY_ATOL = 1e-9
+
+
+def _f(x):
+    return None if x is None or pd.isna(x) else float(x)
+
+
+def _nan(x):
+    return np.nan if x is None else x
+
+
+def state_path(outdir):
+    return os.path.join(outdir, STATE_NAME)
+
+
+def clear_state(outdir):
+    try:
+        os.remove(state_path(outdir))
+    except FileNotFoundError:
+        pass
+
+
+def build_state(df, rsi_series, macd_out, bands, obv_df, ma_df, triple_ma_df):
+    """Resume state from a full run's outputs (their last rows)."""
+    return {
+        "version": STATE_VERSION,
+        "params": PARAMS,
+        "rows": len(df),
+        "last": str(df.index[-1]),
+        "close": [float(c) for c in df["Close"].iloc[-_TAIL:]],
+        "rsi": _f(rsi_series.iloc[-1]),
+        "macd": {
+            "ema_short": _f(df["Close"].ewm(span=PARAMS["macd"]["short_window"], adjust=False).mean().iloc[-1]),
+            "ema_long": _f(df["Close"].ewm(span=PARAMS["macd"]["long_window"], adjust=False).mean().iloc[-1]),
+            "macd": _f(macd_out["MACD"].iloc[-1]),
+            "signal": _f(macd_out["Signal_Line"].iloc[-1]),
+        },
+        "bollinger": [_f(bands["Close"].iloc[-1]), _f(bands["Upper_Band"].iloc[-1]),
+                      _f(bands["Lower_Band"].iloc[-1])],
+        "obv": _f(obv_df["OBV"].iloc[-1]),
+        "ma_double": [_f(ma_df["MA_Swing"].iloc[-1]), _f(ma_df["MA_Long"].iloc[-1])],
+        "ma_triple": [_f(triple_ma_df["MA_Short"].iloc[-1]), _f(triple_ma_df["MA_Medium"].iloc[-1]),
+                      _f(triple_ma_df["MA_Long"].iloc[-1])],
+    }
+
+
+def write_state(outdir, state):
+    tmp = state_path(outdir) + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, state_path(outdir))
+
+
+def load_state(outdir):
+    try:
+        with open(state_path(outdir)) as f:
+            state = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if state.get("version") != STATE_VERSION or state.get("params") != json.loads(json.dumps(PARAMS)):
+        return None
+    return state
+
+
+def _resumable(df, state):
+    """Bars after the state's last bar, or None if df's history no longer matches it
+    (rewritten/adjusted history, truncation) and a full recompute is needed."""
+    n = state["rows"]
+    if len(df) < n or str(df.index[n - 1]) != state["last"]:
+        return None
+    tail = df["Close"].iloc[max(0, n - len(state["close"])):n].to_numpy(dtype=float)
+    if not np.array_equal(tail, np.asarray(state["close"], dtype=float)):
+        return None
+    return df.iloc[n:]
+
+
+def _ema(seed, values, span):
+    """Continue an adjust=False EMA from `seed` — identical to the full-series recursion."""
+    s = pd.Series(np.concatenate([[seed], values])).ewm(span=span, adjust=False).mean()
+    return s.to_numpy()[1:]
+
+
+def compute_tail(df, state):
+    """Indicator outputs for the bars after `state` (as frames indexed like df's new bars)
+    plus the updated state. Returns (None, None) when the state can't be resumed."""
+    new = _resumable(df, state)
+    if new is None:
+        return None, None
+    if new.empty:
+        return {}, state
+
+    idx = new.index
+    close = new["Close"].to_numpy(dtype=float)
+    n_new = len(new)
+    prior = df.iloc[max(0, state["rows"] - _TAIL):state["rows"]]
+    window = pd.concat([prior, new])
+    out = {}
+
+    # RSI / Bollinger: re-roll over the stored tail of closes.
+    rsi_new = rsi(window[["Close"]], **PARAMS["rsi"]).iloc[-n_new:]
+    out["rsi"] = rsi_new
+    bands = bollinger_bands(window, **PARAMS["bollinger"]).iloc[-n_new:]
+    out["bollinger"] = bands
+
+    # MACD: resume both EMAs and the signal line.
+    p, m = PARAMS["macd"], state["macd"]
+    ema_s = _ema(m["ema_short"], close, p["short_window"])
+    ema_l = _ema(m["ema_long"], close, p["long_window"])
+    macd_line = ema_s - ema_l
+    sig = _ema(m["signal"], macd_line, p["signal_window"])
+    out["macd"] = pd.DataFrame({"MACD": macd_line, "Signal_Line": sig}, index=idx)
+
+    # OBV: continue the cumulative sum from the last total.
+    prev_close = np.concatenate([[state["close"][-1]], close[:-1]])
+    direction = np.sign(close - prev_close)
+    flow = pd.Series(np.concatenate([[state["obv"]], direction * new["Volume"].to_numpy(dtype=float)]))
+    out["obv"] = pd.DataFrame({"OBV": flow.cumsum().to_numpy()[1:]}, index=idx)
+
+    # EMA crossovers.
+    d = PARAMS["ma_double"]
+    sw, lg = state["ma_double"]
+    out["ma_double"] = pd.DataFrame({
+        "MA_Swing": _ema(sw, close, d["swing_window"]),
+        "MA_Long": _ema(lg, close, d["long_window"]),
+        "Close": new["Close"],
+    }, index=idx)
+    t = PARAMS["ma_triple"]
+    sh, md, lg3 = state["ma_triple"]
+    out["ma_triple"] = pd.DataFrame({
+        "MA_Short": _ema(sh, close, t["short_window"]),
+        "MA_Medium": _ema(md, close, t["medium_window"]),
+        "MA_Long": _ema(lg3, close, t["long_window"]),
+        "Close": new["Close"],
+    }, index=idx)
+
+    last = lambda frame, col: _f(frame[col].iloc[-1])  # noqa: E731
+    new_state = dict(state)
+    new_state.update({
+        "rows": len(df),
+        "last": str(idx[-1]),
+        "close": [float(c) for c in df["Close"].iloc[-_TAIL:]],
+        "rsi": _f(rsi_new.iloc[-1]),
+        "macd": {"ema_short": float(ema_s[-1]), "ema_long": float(ema_l[-1]),
+                 "macd": float(macd_line[-1]), "signal": float(sig[-1])},
+        "bollinger": [last(bands, "Close"), last(bands, "Upper_Band"), last(bands, "Lower_Band")],
+        "obv": last(out["obv"], "OBV"),
+        "ma_double": [last(out["ma_double"], "MA_Swing"), last(out["ma_double"], "MA_Long")],
+        "ma_triple": [last(out["ma_triple"], "MA_Short"), last(out["ma_triple"], "MA_Medium"),
+                      last(out["ma_triple"], "MA_Long")],
+    })
+    return out, new_state
+
+
+def tail_signals(out, state, ticker=None, interval=None):
+    """Signal rows for the new bars: each generator sees the previous bar (from state)
+    followed by the new ones, exactly the pairs a full run compares."""
+    prev_ts = pd.Timestamp(state["last"])
+    prev_close = state["close"][-1]
+
+    def with_prev(frame, row):
+        head = pd.DataFrame([row], index=pd.DatetimeIndex([prev_ts], name=frame.index.name))
+        return pd.concat([head, frame[list(row)]])
+
+    m = state["macd"]
+    b = state["bollinger"]
+    sw, lg = state["ma_double"]
+    sh, md, lg3 = state["ma_triple"]
+    rsi_seq = pd.concat([pd.Series([_nan(state["rsi"])], index=pd.DatetimeIndex([prev_ts], name=out["rsi"].index.name)),
+                         out["rsi"]])
+    return {
+        "rsi_14_signals": generate_rsi_signals(rsi_seq),
+        "macd_signals": generate_macd_signals(
+            with_prev(out["macd"], {"MACD": _nan(m["macd"]), "Signal_Line": _nan(m["signal"])})),
+        "bollinger_signals": generate_bollinger_signals(
+            with_prev(out["bollinger"], {"Close": _nan(b[0]), "Upper_Band": _nan(b[1]),
+                                         "Lower_Band": _nan(b[2])}))[["Close", "Signal"]],
+        "obv_signals": generate_obv_signals(with_prev(out["obv"], {"OBV": _nan(state["obv"])})),
+        "ma_double_signals": generate_ma_signals(
+            with_prev(out["ma_double"], {"MA_Swing": sw, "MA_Long": lg, "Close": prev_close}),
+            ticker=ticker, interval=interval),
+        "ma_triple_signals": generate_triple_ma_signals(
+            with_prev(out["ma_triple"], {"MA_Short": sh, "MA_Medium": md, "MA_Long": lg3,
+                                         "Close": prev_close}),
+            ticker=ticker, interval=interval),
+    }
+
+
+def output_frames(out):
+    """The appended rows of each indicator CSV, in the same layout aggregate_and_save writes."""
+    return {
+        "rsi_14": pd.DataFrame({f"RSI_{PARAMS['rsi']['period']}": out["rsi"]}),
+        "macd": pd.DataFrame({"MACD_12_26_9": out["macd"]["MACD"]}),
+        "bollinger": pd.DataFrame({"BB_upper_20_2": out["bollinger"]["Upper_Band"],
+                                   "BB_lower_20_2": out["bollinger"]["Lower_Band"]}),
+        "obv": out["obv"],
+        "ma_double": out["ma_double"],
+        "ma_triple": out["ma_triple"],
+    }
+
+
+def verify_tail(df, out):
+    """Compare the incremental rows with a full recompute; returns the names that differ."""
+    n = len(out["rsi"])
+    full = {
+        "rsi": rsi(df, **PARAMS["rsi"]).iloc[-n:].to_frame("RSI"),
+        "macd": macd(df, **PARAMS["macd"]).iloc[-n:],
+        "bollinger": bollinger_bands(df, **PARAMS["bollinger"]).iloc[-n:],
+        "obv": obv(df).iloc[-n:],
+        "ma_double": moving_averages(df, **PARAMS["ma_double"]).iloc[-n:],
+        "ma_triple": moving_averages_triple(df, **PARAMS["ma_triple"]).iloc[-n:],
+    }
+    bad = []
+    for name, ref in full.items():
+        got = out[name].to_frame("RSI") if name == "rsi" else out[name]
+        a = got[ref.columns].to_numpy(dtype=float)
+        b = ref.to_numpy(dtype=float)
+        if not (got.index.equals(ref.index)
+                and np.allclose(a, b, rtol=PARITY_RTOL, atol=PARITY_ATOL, equal_nan=True)):
+            bad.append(name)
+            logging.error(f"[!] Incremental {name} differs from full recompute "
+                          f"(max abs diff {np.nanmax(np.abs(a - b)) if a.shape == b.shape else 'shape'})")
+    return bad
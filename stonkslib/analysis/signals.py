@@ -17,7 +17,12 @@ from stonkslib.patterns.triangles import find_triangles
 from stonkslib.patterns.wedges import find_wedges
 from stonkslib.patterns.head_shoulders import find_head_shoulders
 
-from stonkslib.utils.load_td import load_td
+from stonkslib.utils.load_td import load_td, DEFAULT_CLEAN_DIR
+from stonkslib.utils.fingerprint import inputs_unchanged, write_stamp
+from stonkslib.analysis.incremental import (
+    PARAMS, build_state, write_state, load_state, clear_state, compute_tail, tail_signals,
+    output_frames, verify_tail,
+)
 
 # Suppress specific warnings
 warnings.filterwarnings("ignore", category=UserWarning, message="Could not infer format")
@@ -60,7 +65,65 @@ def save_csv(df, ticker, interval, name):
     os.makedirs(outdir, exist_ok=True)
     df.to_csv(os.path.join(outdir, f"{name}.csv"))
 
-def aggregate_and_save(ticker, interval):
+def append_csv(df, ticker, interval, name):
+    """Append rows to an output CSV (header-less), creating it like save_csv if missing."""
+    if df is None or df.empty:
+        return
+    path = os.path.join(BASE_ANALYSIS_DIR, ticker, interval, f"{name}.csv")
+    if os.path.exists(path):
+        df.to_csv(path, mode="a", header=False)
+    else:
+        save_csv(df, ticker, interval, name)
+
+# Input fingerprint of the last successful run, inside each signals/{ticker}/{interval} dir.
+STAMP_NAME = ".inputs.json"
+
+INDICATOR_FILES = ["rsi_14", "macd", "bollinger", "obv", "ma_double", "ma_triple"]
+
+def _append_indicators(ticker, interval, df, status, verify=False):
+    """Incremental mode: compute only the bars appended since the saved state and append
+    them to the indicator/signal CSVs. Returns False when a full recompute is needed."""
+    outdir = os.path.join(BASE_ANALYSIS_DIR, ticker, interval)
+    state = load_state(outdir)
+    if state is None or not all(os.path.exists(os.path.join(outdir, f"{n}.csv")) for n in INDICATOR_FILES):
+        return False
+    out, new_state = compute_tail(df, state)
+    if out is None:
+        logging.info(f"[{ticker} {interval}] History changed since last run — full recompute")
+        return False
+    if out:
+        if verify and verify_tail(df, out):
+            return False
+        # Drop the state first: if we die halfway through the appends, the next run
+        # recomputes in full instead of appending the same bars twice.
+        clear_state(outdir)
+        for name, frame in output_frames(out).items():
+            append_csv(frame, ticker, interval, name)
+        for name, frame in tail_signals(out, state, ticker, interval).items():
+            append_csv(frame, ticker, interval, name)
+        write_state(outdir, new_state)
+        logging.info(f"[↑] {ticker} ({interval}) indicators: appended {len(out['rsi'])} bar(s)"
+                     + (" (verified)" if verify else ""))
+    for key in ["rsi", "macd", "bollinger", "obv", "ma_double", "ma_triple"]:
+        status[key] = "ok"
+    return True
+
+def aggregate_and_save(ticker, interval, rebuild=False, incremental=True, verify=False):
+    """Compute every indicator/pattern CSV for ticker/interval; returns {name: status}.
+
+    Skipped (returning the previous run's status) when the cleaned parquet is unchanged
+    since the last fully successful run — pass rebuild=True to recompute anyway.
+    incremental: when only new bars were appended, resume RSI/MACD/Bollinger/OBV/MAs from
+    the saved state and append just those bars (analysis/incremental.py); rebuild=True
+    or a rewritten history recomputes in full. verify=True checks the appended bars
+    against a full recompute first and falls back to it on mismatch.
+    """
+    stamp_path = os.path.join(BASE_ANALYSIS_DIR, ticker, interval, STAMP_NAME)
+    unchanged, stamp, fp = inputs_unchanged(stamp_path, [DEFAULT_CLEAN_DIR / ticker / f"{interval}.parquet"])
+    if unchanged and not rebuild:
+        logging.info(f"[⏭] Skipping analysis {ticker} ({interval}) – input unchanged")
+        return stamp.get("status", {})
+
     status = {}
 
     try:
@@ -73,9 +136,17 @@ def aggregate_and_save(ticker, interval):
             status[key] = f"error: {e}"
         return status
 
+    if incremental and not rebuild and _append_indicators(ticker, interval, df, status, verify):
+        _fibonacci_and_patterns(ticker, interval, df, status)
+        if all(v == "ok" for v in status.values()):
+            write_stamp(stamp_path, fp, status=status)
+        return status
+
+    clear_state(os.path.join(BASE_ANALYSIS_DIR, ticker, interval))
+
     # --- RSI ---
     try:
-        series = rsi(df.copy(), period=14)
+        series = rsi(df, **PARAMS["rsi"])
         save_csv(pd.DataFrame({"RSI_14": series}), ticker, interval, "rsi_14")
         rsi_signals = generate_rsi_signals(series)
         if not rsi_signals.empty:
@@ -87,7 +158,7 @@ def aggregate_and_save(ticker, interval):
 
     # --- MACD ---
     try:
-        out = macd(df.copy(), short_window=12, long_window=26, signal_window=9)
+        out = macd(df, **PARAMS["macd"])
         save_csv(pd.DataFrame({"MACD_12_26_9": out["MACD"]}, index=df.index), ticker, interval, "macd")
         sigs = generate_macd_signals(out)
         if not sigs.empty:
@@ -99,7 +170,7 @@ def aggregate_and_save(ticker, interval):
 
     # --- Bollinger Bands ---
     try:
-        bands = bollinger_bands(df.copy(), window=20, num_std_dev=2)
+        bands = bollinger_bands(df, **PARAMS["bollinger"])
         bb_df = pd.DataFrame({
             "BB_upper_20_2": bands["Upper_Band"],
             "BB_lower_20_2": bands["Lower_Band"],
@@ -115,7 +186,7 @@ def aggregate_and_save(ticker, interval):
 
     # --- OBV ---
     try:
-        obv_df = obv(df.copy())
+        obv_df = obv(df)
         save_csv(obv_df, ticker, interval, "obv")
         obv_signals = generate_obv_signals(obv_df)
         if not obv_signals.empty:
@@ -127,7 +198,7 @@ def aggregate_and_save(ticker, interval):
 
     # --- Double MA ---
     try:
-        ma_df = moving_averages(df.copy(), swing_window=20, long_window=50, ma_type="EMA")
+        ma_df = moving_averages(df, **PARAMS["ma_double"])
         ma_signals_df = generate_ma_signals(ma_df, ticker=ticker, interval=interval)
         save_csv(ma_df, ticker, interval, "ma_double")
         save_csv(ma_signals_df, ticker, interval, "ma_double_signals")
@@ -138,7 +209,7 @@ def aggregate_and_save(ticker, interval):
 
     # --- Triple MA ---
     try:
-        triple_ma_df = moving_averages_triple(df.copy(), short_window=9, medium_window=21, long_window=50, ma_type="EMA")
+        triple_ma_df = moving_averages_triple(df, **PARAMS["ma_triple"])
         triple_ma_signals_df = generate_triple_ma_signals(triple_ma_df, ticker=ticker, interval=interval)
         save_csv(triple_ma_df, ticker, interval, "ma_triple")
         save_csv(triple_ma_signals_df, ticker, interval, "ma_triple_signals")
@@ -147,6 +218,20 @@ def aggregate_and_save(ticker, interval):
         logging.error(f"[{ticker} {interval}] Triple MA error: {e}")
         status["ma_triple"] = f"error: {e}"
 
+    if all(status[k] == "ok" for k in ["rsi", "macd", "bollinger", "obv", "ma_double", "ma_triple"]):
+        write_state(os.path.join(BASE_ANALYSIS_DIR, ticker, interval),
+                    build_state(df, series, out, bands, obv_df, ma_df, triple_ma_df))
+
+    _fibonacci_and_patterns(ticker, interval, df, status)
+
+    # Only stamp clean runs, so a stage that errored is retried next time.
+    if all(v == "ok" for v in status.values()):
+        write_stamp(stamp_path, fp, status=status)
+    return status
+
+def _fibonacci_and_patterns(ticker, interval, df, status):
+    """Fibonacci levels follow the trailing swing window and the pattern scans look at
+    the whole history, so these are recomputed on every run (incremental or not)."""
     # --- Fibonacci ---
     try:
         fib_data = calculate_fibonacci_levels(df, lookback=100)
@@ -200,8 +285,6 @@ def aggregate_and_save(ticker, interval):
         logging.error(f"[{ticker} {interval}] Head-Shoulders error: {e}")
         status["head_shoulders"] = f"error: {e}"
 
-    return status
-
 def main(intervals=["1m", "2m", "5m", "15m", "30m", "1h", "1d", "1wk"]):
     tickers = load_ticker_list()
     summary = {}
@@ -0,0 +1,193 @@
+"""Persistent backtest result cache (SQLite).
+
+The optimizer re-tests strategies it has already scored (the LLM proposes unchanged
+params, warm-start begins from an already-scored YAML) and the Backtest page re-runs
+identical backtests on every click. A backtest is a pure function of the strategy,
+its run kwargs, the price frame and the code that simulates it, so its result is
+stored under a hash of exactly those:
+
+    key = blake2b(canonical JSON of {kind, ticker, interval, strategy, kwargs},
+                  frame fingerprint of the sliced OHLCV, code fingerprint)
+
+The code fingerprint hashes the sources of backtest/, strategies/engine.py and
+indicators/, so editing the simulator or an indicator retires every old entry.
+Strategies using an indicator the registry marks `cache: False` (news_sentiment
+reads the news store, not just prices) are never cached.
+
+Payloads (metrics + trades + output file stem) are zlib-compressed JSON in one
+table of `data/db/backtests.sqlite` — stdlib only, safe across optimizer worker
+processes (WAL). Set STONKS_BT_CACHE_DB to move it, or to "off" to disable.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+from stonkslib.indicators.registry import INDICATORS, PRICE_OUTPUTS, frame_fingerprint
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_DB = PROJECT_ROOT / "data" / "db" / "backtests.sqlite"
+
+_env = os.getenv("STONKS_BT_CACHE_DB")
+_DB_PATH = None if (_env or "").lower() in ("off", "0", "none") else Path(_env) if _env else DEFAULT_DB
+
+_STATS_LOCK = threading.Lock()
+_STATS = {"hits": 0, "misses": 0, "stores": 0, "uncacheable": 0}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS backtest_results (
+    key        TEXT PRIMARY KEY,
+    kind       TEXT NOT NULL,
+    ticker     TEXT,
+    interval   TEXT,
+    strategy   TEXT,
+    payload    BLOB NOT NULL,
+    created_at TEXT,
+    hits       INTEGER NOT NULL DEFAULT 0,
+    last_hit   TEXT
+);
+"""
+
+_CODE_PATHS = ("backtest/*.py", "strategies/engine.py", "indicators/*.py")
+
+
+def set_backtest_cache(path):
+    """Point the cache at the SQLite file `path` (None disables it)."""
+    global _DB_PATH
+    _DB_PATH = Path(path) if path else None
+
+
+def _count(stat):
+    with _STATS_LOCK:
+        _STATS[stat] += 1
+
+
+@contextmanager
+def _connect():
+    _DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(_DB_PATH, timeout=30)
+    try:
+        con.execute("PRAGMA journal_mode=WAL")
+        con.executescript(_SCHEMA)
+        yield con
+        con.commit()
+    finally:
+        con.close()
+
+
+@functools.lru_cache(maxsize=1)
+def code_fingerprint() -> str:
+    """Hash of the source files a backtest result depends on."""
+    root = Path(__file__).resolve().parents[1]
+    h = hashlib.blake2b(digest_size=16)
+    for pattern in _CODE_PATHS:
+        for path in sorted(root.glob(pattern)):
+            h.update(path.name.encode())
+            h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def _cacheable(strategy: dict) -> bool:
+    for key, cfg in (strategy.get("indicators") or {}).items():
+        if isinstance(cfg, dict) and cfg.get("enabled") is False:
+            continue
+        if not INDICATORS.get(key, {}).get("cache", True):
+            return False
+    return True
+
+
+def backtest_cache_key(kind, ticker, interval, strategy, df, **kwargs) -> str | None:
+    """Cache key for one backtest run, or None if the cache is off or the run isn't
+    cacheable (see module docstring)."""
+    if _DB_PATH is None:
+        return None
+    if not _cacheable(strategy):
+        _count("uncacheable")
+        return None
+    columns = [c for c in PRICE_OUTPUTS.values() if c in df.columns]
+    fp = frame_fingerprint(df, columns)
+    if fp is None:
+        _count("uncacheable")
+        return None
+    try:
+        spec = json.dumps({"kind": kind, "ticker": ticker, "interval": interval,
+                           "strategy": strategy, "kwargs": kwargs},
+                          sort_keys=True, separators=(",", ":"), default=str)
+    except (TypeError, ValueError):
+        _count("uncacheable")
+        return None
+    h = hashlib.blake2b(digest_size=20)
+    for part in (spec, fp, code_fingerprint()):
+        h.update(part.encode())
+    return h.hexdigest()
+
+
+def cache_get(key: str) -> dict | None:
+    """Stored payload for `key` ({metrics, trades, stem}), or None on a miss."""
+    if key is None or _DB_PATH is None:
+        return None
+    try:
+        with _connect() as con:
+            row = con.execute("SELECT payload FROM backtest_results WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                con.execute("UPDATE backtest_results SET hits = hits + 1, last_hit = ? WHERE key = ?",
+                            (datetime.now(timezone.utc).isoformat(timespec="seconds"), key))
+        payload = json.loads(zlib.decompress(row[0])) if row is not None else None
+    except (sqlite3.Error, zlib.error, ValueError):
+        payload = None
+    _count("hits" if payload is not None else "misses")
+    return payload
+
+
+def cache_put(key: str, kind: str, ticker: str, interval: str, payload: dict):
+    """Store a finished run's payload. Best-effort: a locked/corrupt db never fails
+    the backtest itself."""
+    if key is None or _DB_PATH is None:
+        return
+    try:
+        blob = zlib.compress(json.dumps(payload, separators=(",", ":"), default=str).encode(), 6)
+        with _connect() as con:
+            con.execute(
+                "INSERT OR REPLACE INTO backtest_results "
+                "(key, kind, ticker, interval, strategy, payload, created_at) VALUES (?,?,?,?,?,?,?)",
+                (key, kind, ticker, interval, payload.get("metrics", {}).get("strategy"), blob,
+                 datetime.now(timezone.utc).isoformat(timespec="seconds")))
+        _count("stores")
+    except (sqlite3.Error, TypeError, ValueError):
+        pass
+
+
+def clear_backtest_cache(stats_only=False):
+    """Reset this process's hit/miss counters and (unless stats_only) drop every entry."""
+    with _STATS_LOCK:
+        _STATS.update(hits=0, misses=0, stores=0, uncacheable=0)
+    if not stats_only and _DB_PATH is not None and _DB_PATH.exists():
+        with _connect() as con:
+            con.execute("DELETE FROM backtest_results")
+
+
+def backtest_cache_info() -> dict:
+    """This process's hits/misses/stores and hit rate, plus the db's entry count, bytes
+    stored and lifetime hits (summed over every process that used it)."""
+    with _STATS_LOCK:
+        info = dict(_STATS)
+    lookups = info["hits"] + info["misses"]
+    info["hit_rate"] = round(info["hits"] / lookups, 3) if lookups else 0.0
+    info.update(db=str(_DB_PATH) if _DB_PATH else None, entries=0, bytes=0, lifetime_hits=0)
+    if _DB_PATH is not None and _DB_PATH.exists():
+        try:
+            with _connect() as con:
+                n, size, hits = con.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0), COALESCE(SUM(hits), 0) "
+                    "FROM backtest_results").fetchone()
+            info.update(entries=n, bytes=size, lifetime_hits=hits)
+        except sqlite3.Error:
+            pass
+    return info
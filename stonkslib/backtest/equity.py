@@ -0,0 +1,95 @@
+"""Compact equity curves for backtest results.
+
+A backtest's equity curve used to travel as a list of {"date": str, "value": float}
+dicts inside every metrics dict and `*_metrics.json` — thousands of per-bar objects
+that snapshot, the CLI and the optimizer parsed just to read a few scalars. Now:
+
+- in memory it is an `EquityCurve`: the bar timestamps (int64 ns) plus a float32
+  value array — what the Backtest page charts;
+- on disk it lives in a sidecar `<stem>_equity.parquet` next to the metrics JSON,
+  which keeps only scalars (plus the sidecar's file name under "equity_file");
+- `load_equity_curve(metrics_path)` is the lazy accessor: it reads the sidecar only
+  when a chart actually needs the curve — the Trades page charts the saved run it
+  shows — and still understands old metrics files that carry the inline list.
+
+Drawdown and the other metrics (backtest/metrics.py) are computed from the
+full-precision values before they are narrowed to float32; float32 only has to be
+good enough to draw.
+"""
+
+import base64
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+EQUITY_SUFFIX = "_equity.parquet"
+
+
+class EquityCurve:
+    """Portfolio value per bar: a DatetimeIndex (UTC) and a float32 value array."""
+
+    __slots__ = ("index", "values")
+
+    def __init__(self, index, values):
+        index = pd.DatetimeIndex(index, freq=None)
+        self.index = index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC")
+        self.values = np.asarray(values, dtype=np.float32)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __repr__(self):
+        if not len(self):
+            return "EquityCurve([])"
+        return (f"EquityCurve({len(self)} bars, {self.index[0]} → {self.index[-1]}, "
+                f"last={float(self.values[-1]):,.2f})")
+
+    def to_series(self) -> pd.Series:
+        return pd.Series(self.values, index=self.index.rename("date"), name="value")
+
+    def to_frame(self) -> pd.DataFrame:
+        """date/value columns, the shape the old list of dicts turned into."""
+        return pd.DataFrame({"date": self.index, "value": self.values})
+
+    def to_payload(self) -> dict:
+        """JSON-safe form (base64 of the raw int64 / float32 arrays)."""
+        return {"dates": base64.b64encode(self.index.asi8.tobytes()).decode(),
+                "values": base64.b64encode(self.values.tobytes()).decode()}
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "EquityCurve":
+        dates = np.frombuffer(base64.b64decode(payload["dates"]), dtype=np.int64)
+        values = np.frombuffer(base64.b64decode(payload["values"]), dtype=np.float32)
+        return cls(pd.to_datetime(dates, utc=True), values)
+
+    def save(self, path):
+        self.to_frame().to_parquet(path, index=False)
+
+    @classmethod
+    def read(cls, path) -> "EquityCurve":
+        df = pd.read_parquet(path)
+        return cls(df["date"], df["value"].to_numpy())
+
+
+def equity_path(metrics_path) -> Path:
+    """Sidecar parquet for a `<stem>_metrics.json` file."""
+    metrics_path = Path(metrics_path)
+    return metrics_path.with_name(metrics_path.name.replace("_metrics.json", EQUITY_SUFFIX))
+
+
+def load_equity_curve(metrics_path) -> EquityCurve | None:
+    """The equity curve belonging to a saved metrics JSON, or None if there is none."""
+    sidecar = equity_path(metrics_path)
+    if sidecar.exists():
+        return EquityCurve.read(sidecar)
+    try:
+        with open(metrics_path) as f:
+            inline = json.load(f).get("equity_curve")
+    except (OSError, ValueError):
+        return None
+    if not inline:
+        return None
+    return EquityCurve(pd.to_datetime([e["date"] for e in inline], utc=True),
+                       [e["value"] for e in inline])
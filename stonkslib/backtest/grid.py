@@ -0,0 +1,109 @@
+"""Batched parameter-grid backtests for v2 strategies.
+
+`run_param_grid` sweeps many parameter sets over one ticker in a single pass: the
+price frame is loaded once, each distinct indicator parameterization is computed
+once (combos that share an RSI period share the RSI series), every combo's
+entry/exit signals go into a bars × combos matrix, and `simulate_grid` runs the
+fills over that matrix. The result is a tidy table — one row per combo, the swept
+params as columns next to the same headline metrics run_strategy_backtest reports.
+
+Grid keys are dotted paths into the strategy:
+
+    {"rsi.period": [7, 14, 21],                 # indicators.rsi.params.period
+     "macd.short": [8, 12],
+     "risk.stop_loss_pct": [0.05, 0.1],         # risk.stop_loss_pct
+     "confluence.min_score": [0, 1.5]}
+
+and every combination (itertools.product) is evaluated.
+"""
+
+import copy
+import itertools
+import logging
+
+import numpy as np
+import pandas as pd
+
+from stonkslib.backtest.simulate import simulate_grid
+from stonkslib.backtest.strategy import _backtest_frame, v2_signals
+from stonkslib.strategies.engine import is_v2
+
+logger = logging.getLogger(__name__)
+
+METRIC_COLUMNS = ["final_cash", "net_pnl", "trades", "win_rate", "max_drawdown", "total_invested"]
+
+
+def expand_grid(grid: dict) -> list[dict]:
+    """Every combination of a {dotted_key: [values]} grid, as a list of {key: value}."""
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def apply_params(strategy: dict, params: dict) -> dict:
+    """Copy of `strategy` with dotted-key overrides applied (see module docstring)."""
+    updated = copy.deepcopy(strategy)
+    for path, value in params.items():
+        head, _, leaf = path.partition(".")
+        if not leaf:
+            raise ValueError(f"Grid key '{path}' must look like 'indicator.param' or 'risk.key'")
+        if head in ("risk", "confluence"):
+            updated.setdefault(head, {})[leaf] = value
+            continue
+        cfg = (updated.get("indicators") or {}).get(head)
+        if cfg is None:
+            raise ValueError(f"Grid key '{path}': indicator '{head}' is not in the strategy")
+        cfg.setdefault("params", {})[leaf] = value
+    return updated
+
+
+def run_param_grid(ticker, interval, strategy, grid, df_override=None, trailing_stop_pct=None,
+                   per_signal_amount=0):
+    """Backtest every parameter combination in `grid` for one ticker.
+
+    Args:
+        ticker, interval: as for run_strategy_backtest
+        strategy: a loaded v2 strategy dict (the base the overrides apply to)
+        grid: {dotted_key: [values]} (see module docstring) or a list of
+              {dotted_key: value} combos to evaluate as-is
+        df_override: price frame to use instead of load_td
+        trailing_stop_pct, per_signal_amount: as for run_strategy_backtest
+
+    Returns:
+        DataFrame with one row per combo: ticker, interval, the swept params and
+        METRIC_COLUMNS — or None if the ticker is excluded or has no data.
+    """
+    if not is_v2(strategy):
+        raise ValueError(f"run_param_grid needs a v2 strategy; '{strategy.get('name')}' is legacy")
+
+    combos = expand_grid(grid) if isinstance(grid, dict) else list(grid)
+    df = _backtest_frame(ticker, interval, strategy, df_override)
+    if df is None or not combos:
+        return None
+
+    results = {}   # (indicator, kwargs) -> output, shared by every combo
+    entries = np.zeros((len(df), len(combos)), dtype=bool)
+    exits = np.zeros_like(entries)
+    risk = {k: [] for k in ("start_cash", "risk_per_trade", "slippage", "stop_loss_pct")}
+    for j, params in enumerate(combos):
+        current = apply_params(strategy, params)
+        entry, exit_ = v2_signals(df, current, results)
+        entries[:, j] = entry.to_numpy(dtype=bool)
+        exits[:, j] = exit_.to_numpy(dtype=bool)
+
+        r = current.get("risk", {})
+        risk["start_cash"].append(float(r.get("start_cash", 10000)))
+        risk["risk_per_trade"].append(float(r.get("risk_per_trade", 0.2)))
+        risk["slippage"].append(float(r.get("slippage", 0.0005)))
+        risk["stop_loss_pct"].append(float(r.get("stop_loss_pct", 0.1)))
+
+    metrics = simulate_grid(df, entries, exits, trailing_stop_pct=trailing_stop_pct,
+                            per_signal_amount=per_signal_amount, **risk)
+
+    table = pd.DataFrame(combos, index=range(len(combos)))
+    table.insert(0, "ticker", ticker)
+    table.insert(1, "interval", interval)
+    for col in METRIC_COLUMNS:
+        table[col] = metrics[col]
+    logger.info(f"[✓] {ticker} ({interval}) — {len(combos)} param sets, "
+                f"{len(results)} distinct indicator runs")
+    return table
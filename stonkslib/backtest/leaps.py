@@ -2,17 +2,17 @@
 LEAP options backtester using Black-Scholes pricing.
 
 Since yfinance doesn't provide historical options data, premiums are approximated
-via Black-Scholes using rolling realized volatility from the underlying's price
-history. This is directionally sound but will differ from real IV-based pricing.
+via Black-Scholes using a volatility model of the underlying's price history —
+30-bar realized vol by default, or any model in the per-ticker vol store
+(utils/vol_store.py: rolling windows, EWMA, GARCH). This is directionally sound but
+will differ from real IV-based pricing.
 """
-import json
+import hashlib
 import logging
-import math
 import re
 import numpy as np
 import pandas as pd
 from pathlib import Path
-from scipy.stats import norm
 
 from stonkslib.indicators.rsi import rsi as calc_rsi
 from stonkslib.indicators.macd import macd as calc_macd
@@ -21,68 +21,34 @@ from stonkslib.indicators.moving_avg_double import moving_averages
 from stonkslib.indicators.supertrend import supertrend as calc_supertrend
 from stonkslib.indicators.rsi_divergence import rsi_divergence as calc_rsi_div
 from stonkslib.indicators.markov import markov_signals as calc_markov
+from stonkslib.backtest.black_scholes import RISK_FREE_RATE, bs_greeks, bs_price
+from stonkslib.backtest.cache import backtest_cache_key, cache_get, cache_put
+from stonkslib.backtest.strategy import _save_results, v2_signals
+from stonkslib.strategies.engine import is_v2
 from stonkslib.utils.load_td import load_td
+from stonkslib.utils.vol_store import DEFAULT_VOL_MODEL, compute_vol, describe_vol, load_vol
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 OUTPUT_BASE = PROJECT_ROOT / "data" / "backtest_results" / "leaps"
 logger = logging.getLogger(__name__)
 
-RISK_FREE_RATE = 0.045  # ~4.5% T-bill
 
+def _at(series, n):
+    """Positional float values of an indicator output, NaN-padded to n bars."""
+    values = np.full(n, np.nan)
+    if series is not None:
+        v = pd.to_numeric(pd.Series(series), errors="coerce").to_numpy(dtype=np.float64)[:n]
+        values[:len(v)] = v
+    return values
 
-def _bs_price(S, K, T, sigma, option_type, r=RISK_FREE_RATE):
-    """Black-Scholes option price. Returns intrinsic value if T<=0 or sigma<=0."""
-    if T <= 0 or sigma <= 0 or S <= 0 or K <= 0:
-        return max(S - K, 0.0) if option_type == "call" else max(K - S, 0.0)
-    d1 = (math.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * math.sqrt(T))
-    d2 = d1 - sigma * math.sqrt(T)
-    if option_type == "call":
-        return S * norm.cdf(d1) - K * math.exp(-r * T) * norm.cdf(d2)
-    else:
-        return K * math.exp(-r * T) * norm.cdf(-d2) - S * norm.cdf(-d1)
-
-
-def _bs_delta(S, K, T, sigma, option_type, r=RISK_FREE_RATE):
-    if T <= 0 or sigma <= 0 or S <= 0 or K <= 0:
-        return 1.0 if option_type == "call" else -1.0
-    d1 = (math.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * math.sqrt(T))
-    return norm.cdf(d1) if option_type == "call" else norm.cdf(d1) - 1.0
-
-
-def _realized_vol(close_series: pd.Series, window: int = 30) -> pd.Series:
-    """Rolling annualized realized volatility from log returns (252-day basis)."""
-    log_ret = np.log(close_series / close_series.shift(1))
-    return log_ret.rolling(window).std() * math.sqrt(252)
-
-
-def run_leaps_backtest(ticker, interval, strategy, option_type="auto",
-                       leap_days=365, strike_moneyness=1.0,
-                       stop_loss_pct=0.50, start_cash=10000,
-                       risk_per_trade=0.20, output_dir=None):
-    """
-    Backtest LEAP call or put options using Black-Scholes pricing.
-
-    Args:
-        ticker: ticker symbol
-        interval: price interval (1d or 1wk recommended)
-        strategy: loaded strategy dict
-        option_type: "call", "put", or "auto" (derives from net signal direction)
-        leap_days: option duration at entry in days (default 365)
-        strike_moneyness: strike as fraction of spot at entry (1.0 = ATM)
-        stop_loss_pct: close if option loses this fraction of entry premium
-        start_cash: starting capital
-        risk_per_trade: fraction of cash to risk per trade
-    """
-    data = load_td([ticker], interval)
-    df = data.get(ticker)
-    if df is None or df.empty:
-        logger.warning(f"[!] No data for {ticker} ({interval})")
-        return None
-
-    _lookback = {"1wk": 260, "1d": 756, "1h": 504}.get(interval, 252)
-    df = df.iloc[-_lookback:]
 
+def _legacy_signals(df, strategy):
+    """Buy/sell arrays for a legacy (enabled:-flag) strategy — the per-indicator
+    rules alerts/signals.py and strategy.py hardcode, evaluated over whole arrays.
+    Outputs are read positionally, as the per-bar loop did. Bars with a
+    non-positive close never signal."""
     ind = strategy.get("indicators", {})
+    n = len(df)
 
     # --- Build indicators ---
     rsi_series = None
@@ -93,13 +59,13 @@ def run_leaps_backtest(ticker, interval, strategy, option_type="auto",
         p = rsi_cfg.get("params", {})
         rsi_overbought = p.get("overbought", 70)
         rsi_oversold = p.get("oversold", 30)
-        rsi_series = calc_rsi(df.copy(), period=p.get("period", 14))
+        rsi_series = calc_rsi(df, period=p.get("period", 14))
 
     macd_series = None
     macd_cfg = ind.get("macd", {})
     if macd_cfg.get("enabled"):
         p = macd_cfg.get("params", {})
-        macd_series = calc_macd(df.copy(), short_window=p.get("short", 12),
+        macd_series = calc_macd(df, short_window=p.get("short", 12),
                                 long_window=p.get("long", 26),
                                 signal_window=p.get("signal", 9))["MACD"]
 
@@ -107,7 +73,7 @@ def run_leaps_backtest(ticker, interval, strategy, option_type="auto",
     bb_cfg = ind.get("bollinger", {})
     if bb_cfg.get("enabled"):
         p = bb_cfg.get("params", {})
-        bb_out = bollinger_bands(df.copy(), window=p.get("window", 20),
+        bb_out = bollinger_bands(df, window=p.get("window", 20),
                                  num_std_dev=p.get("num_std_dev", 2))
         bb_upper = bb_out["Upper_Band"]
         bb_lower = bb_out["Lower_Band"]
@@ -116,7 +82,7 @@ def run_leaps_backtest(ticker, interval, strategy, option_type="auto",
     ma_cfg = ind.get("ma_double", {})
     if ma_cfg.get("enabled"):
         p = ma_cfg.get("params", {})
-        ma_out = moving_averages(df.copy(), swing_window=p.get("swing", 20),
+        ma_out = moving_averages(df, swing_window=p.get("swing", 20),
                                  long_window=p.get("long", 50), ma_type="EMA")
         ma_swing_series = ma_out["MA_Swing"]
         ma_long_series = ma_out["MA_Long"]
@@ -125,14 +91,14 @@ def run_leaps_backtest(ticker, interval, strategy, option_type="auto",
     st_cfg = ind.get("supertrend", {})
     if st_cfg.get("enabled"):
         p = st_cfg.get("params", {})
-        st_series = calc_supertrend(df.copy(), period=p.get("period", 10),
+        st_series = calc_supertrend(df, period=p.get("period", 10),
                                     multiplier=p.get("multiplier", 3.0))
 
     div_series = None
     div_cfg = ind.get("rsi_divergence", {})
     if div_cfg.get("enabled"):
         p = div_cfg.get("params", {})
-        div_series = calc_rsi_div(df.copy(), period=p.get("period", 14),
+        div_series = calc_rsi_div(df, period=p.get("period", 14),
                                   lookback=p.get("lookback", 20))
 
     mk_series = None
@@ -143,44 +109,151 @@ def run_leaps_backtest(ticker, interval, strategy, option_type="auto",
         p = mk_cfg.get("params", {})
         mk_bull_thr = p.get("bull_threshold", 0.6)
         mk_bear_thr = p.get("bear_threshold", 0.6)
-        mk_series = calc_markov(df.copy(), states=p.get("states", 3),
+        mk_series = calc_markov(df, states=p.get("states", 3),
                                 lookback=p.get("lookback", 60))
 
-    vol_series = _realized_vol(df["Close"])
+    S = df["Close"].to_numpy(dtype=np.float64)
+    with np.errstate(invalid="ignore"):
+        r, m = _at(rsi_series, n), _at(macd_series, n)
+        bu, bl = _at(bb_upper, n), _at(bb_lower, n)
+        below_band = (S < bl) if bb_lower is not None else np.zeros(n, dtype=bool)
+        above_band = (S > bu) if bb_upper is not None else np.zeros(n, dtype=bool)
+
+        if bb_lower is not None and rsi_series is not None:
+            buy = (r < rsi_oversold) & below_band
+            sell = (r > rsi_overbought) | above_band
+        else:
+            buy = below_band.copy()
+            if rsi_series is not None:
+                buy |= (r < rsi_oversold) & ((m > 0) if macd_series is not None else True)
+            sell = above_band | ((r > rsi_overbought) if rsi_series is not None else False)
+
+        prev = np.arange(n) > 0
+        if ma_swing_series is not None and ma_long_series is not None:
+            sw, ml = _at(ma_swing_series, n), _at(ma_long_series, n)
+            psw, pml = np.roll(sw, 1), np.roll(ml, 1)
+            buy |= prev & (psw <= pml) & (sw > ml)
+            sell |= prev & (psw >= pml) & (sw < ml)
+
+        if st_series is not None:
+            d = _at(st_series["Direction"], n)
+            prev_d = np.roll(d, 1)
+            buy |= prev & (prev_d == -1) & (d == 1)
+            sell |= prev & (prev_d == 1) & (d == -1)
+
+        if div_series is not None:
+            for col, side in (("Bullish_Divergence", buy), ("Bearish_Divergence", sell)):
+                flags = div_series[col].to_numpy()[:n].astype(bool)   # NaN counts, as `if x:` did
+                side[:len(flags)] |= flags
 
-    bar_years = 1 / 52 if interval == "1wk" else 1 / 252
+        if mk_series is not None:
+            buy |= _at(mk_series["bull_prob"], n) > mk_bull_thr
+            sell |= _at(mk_series["bear_prob"], n) > mk_bear_thr
+
+    live = ~(S <= 0)
+    return buy & live, sell & live
+
+
+def _bar_years(interval):
+    """Years per bar, for stepping an option's time to expiry."""
+    return 1 / 52 if interval == "1wk" else 1 / 252
+
+
+def _leap_frame(ticker, interval):
+    """The price history a LEAP backtest runs over (most recent ~3 years), or None."""
+    data = load_td([ticker], interval)
+    df = data.get(ticker)
+    if df is None or df.empty:
+        logger.warning(f"[!] No data for {ticker} ({interval})")
+        return None
+
+    _lookback = {"1wk": 260, "1d": 756, "1h": 504}.get(interval, 252)
+    return df.iloc[-_lookback:]
+
+
+def _leap_vol(df, ticker, interval, vol_model=DEFAULT_VOL_MODEL):
+    """Annualized vol per bar for pricing: `vol_model` from the ticker's vol store,
+    aligned to the frame — or computed from the frame itself when the store is
+    missing or stale. Bars without a value price at 30%; the floor is 5%."""
+    vol = load_vol(ticker, interval, vol_model, df.index)
+    if vol is None:
+        vol = compute_vol(df["Close"], vol_model)
+    vol = vol.to_numpy(dtype=np.float64)
+    return np.maximum(np.where(np.isnan(vol), 0.30, vol), 0.05)
+
+
+def _leap_inputs(df, ticker, strategy):
+    """Prices and signals the fill loop reads from the frame and the strategy.
+
+    Returns:
+        (close, open_, buy, sell, signal_exits) — float64 close and open (a zero
+        open fills at the close), the whole-series buy/sell signals and whether
+        sell/buy also close a position.
+    """
+    close = df["Close"].to_numpy(dtype=np.float64)
+    open_ = df["Open"].to_numpy(dtype=np.float64) if "Open" in df.columns else close
+    open_ = np.where(open_ == 0, close, open_)   # a zero open fills at the close
+
+    # Whole-series entry/exit signals: v2 strategies through the expression engine,
+    # exactly as run_strategy_backtest evaluates them; legacy YAMLs through the
+    # hardcoded rules in _legacy_signals. The fill loop only tracks the position.
+    df.attrs["ticker"] = ticker
+    signal_exits = is_v2(strategy)
+    if signal_exits:
+        entry_sig, exit_sig = v2_signals(df, strategy)
+        buy, sell = entry_sig.to_numpy(dtype=bool), exit_sig.to_numpy(dtype=bool)
+    else:
+        buy, sell = _legacy_signals(df, strategy)
+    return close, open_, buy, sell, signal_exits
+
+
+def _leap_fills(index, close, open_, vol, buy, sell, option_type, leap_days, strike_moneyness,
+                stop_loss_pct, start_cash, risk_per_trade, bar_years, signal_exits=False):
+    """Run the LEAP position state machine over precomputed buy/sell signals.
+
+    A buy signal opens a call and a sell signal a put (as option_type allows);
+    positions close on the stop-loss or near expiry, and — with signal_exits, for
+    v2 strategies — on the opposite signal (a call on sell, a put on buy).
+    Entries and exits fill at the next bar's open. When a position opens, its
+    Black-Scholes value at every remaining bar's close (stop-loss checks) and open
+    (exit fills) is priced in one bs_price call; the bar loop only reads it back.
+
+    Returns:
+        (trades, cash) — the trade dicts and the cash left after closing any open
+        position at the last bar.
+    """
+    n_bars = len(close)
+    vols = vol.tolist()
+    enters_on_buy  = option_type in ("call", "auto")
+    enters_on_sell = option_type in ("put",  "auto")
 
-    # --- Backtest state ---
     cash = float(start_cash)
     contracts = 0
     entry_premium = None
-    entry_T = None
     entry_strike = None
     entry_option_type = None
     entry_bar_idx = None
+    remaining = mark_close = mark_open = None   # open position, per bar since entry
     trades = []
     pending = None        # "enter" or "exit"
     pending_reason = ""
     pending_signal = None  # "call" or "put"
 
-    for idx in range(len(df)):
-        row = df.iloc[idx]
-        S = float(row.get("Close") or 0)
-        S_open = float(row.get("Open") or S)
-        date = df.index[idx]
-
+    for idx in range(n_bars):
+        S = float(close[idx])
         if S <= 0:
             continue
-
-        vol = float(vol_series.iloc[idx]) if not pd.isna(vol_series.iloc[idx]) else 0.30
-        vol = max(vol, 0.05)
+        S_open = float(open_[idx])
+        vol_i = vols[idx]
+        date = index[idx]
 
         # --- Execute pending order at next bar open ---
         if pending and S_open > 0:
             if pending == "enter" and contracts == 0:
                 T = leap_days / 365.0
                 K = round(S_open * strike_moneyness, 2)
-                premium = _bs_price(S_open, K, T, vol, pending_signal)
+                quote = bs_greeks(S_open, K, T, vol_i, pending_signal)
+                premium = quote["price"]
                 # Fixed sizing on start_cash — avoids compounding distortion over many trades
                 n = max(1, int((start_cash * risk_per_trade) / (premium * 100))) if premium > 0 else 0
                 if n > 0 and premium > 0:
@@ -195,11 +268,13 @@ def run_leaps_backtest(ticker, interval, strategy, option_type="auto",
                     cash -= cost
                     contracts = n
                     entry_premium = premium
-                    entry_T = T
                     entry_strike = K
                     entry_option_type = pending_signal
                     entry_bar_idx = idx
-                    delta = _bs_delta(S_open, K, T, vol, pending_signal)
+                    steps = np.maximum(T - np.arange(n_bars - idx) * bar_years, 0.001)
+                    mark_close, mark_open = bs_price(np.stack([close[idx:], open_[idx:]]), K, steps,
+                                                     vol[idx:], pending_signal)
+                    remaining = steps.tolist()
                     trades.append({
                         "action": "BUY_LEAP",
                         "option_type": pending_signal.upper(),
@@ -209,16 +284,16 @@ def run_leaps_backtest(ticker, interval, strategy, option_type="auto",
                         "T_years": round(T, 3),
                         "premium": round(premium, 2),
                         "contracts": n,
-                        "delta": round(delta, 3),
-                        "vol": round(vol, 3),
+                        "delta": round(quote["delta"], 3),
+                        "vol": round(vol_i, 3),
                         "cash": round(cash, 2),
                         "reason": pending_reason,
                     })
 
             elif pending == "exit" and contracts > 0:
-                elapsed = (idx - entry_bar_idx) * bar_years
-                remaining_T = max(entry_T - elapsed, 0.001)
-                exit_premium = _bs_price(S_open, entry_strike, remaining_T, vol, entry_option_type)
+                k = idx - entry_bar_idx
+                remaining_T = remaining[k]
+                exit_premium = mark_open[k]
                 proceeds = contracts * exit_premium * 100
                 cost_basis = contracts * entry_premium * 100
                 pnl = proceeds - cost_basis
@@ -232,112 +307,46 @@ def run_leaps_backtest(ticker, interval, strategy, option_type="auto",
                     "remaining_T": round(remaining_T, 3),
                     "premium": round(exit_premium, 2),
                     "contracts": contracts,
-                    "vol": round(vol, 3),
+                    "vol": round(vol_i, 3),
                     "pnl": round(pnl, 2),
                     "pnl_pct": round(pnl / cost_basis * 100, 1) if cost_basis > 0 else 0,
                     "cash": round(cash, 2),
                     "reason": pending_reason,
                 })
                 contracts = 0
-                entry_premium = entry_T = entry_strike = entry_option_type = entry_bar_idx = None
+                entry_premium = entry_strike = entry_option_type = entry_bar_idx = None
 
             pending = None
             pending_reason = ""
             pending_signal = None
 
-        if S <= 0:
-            continue
-
-        # --- Read indicator values ---
-        r  = float(rsi_series.iloc[idx])      if rsi_series      is not None and idx < len(rsi_series)      else None
-        m  = float(macd_series.iloc[idx])     if macd_series     is not None and idx < len(macd_series)     else None
-        bu = float(bb_upper.iloc[idx])        if bb_upper        is not None and idx < len(bb_upper)        else None
-        bl = float(bb_lower.iloc[idx])        if bb_lower        is not None and idx < len(bb_lower)        else None
-        sw = float(ma_swing_series.iloc[idx]) if ma_swing_series is not None and idx < len(ma_swing_series) else None
-        ml = float(ma_long_series.iloc[idx])  if ma_long_series  is not None and idx < len(ma_long_series)  else None
-        mk_bull = float(mk_series["bull_prob"].iloc[idx]) if mk_series is not None and idx < len(mk_series) and not pd.isna(mk_series["bull_prob"].iloc[idx]) else None
-        mk_bear = float(mk_series["bear_prob"].iloc[idx]) if mk_series is not None and idx < len(mk_series) and not pd.isna(mk_series["bear_prob"].iloc[idx]) else None
-
-        bb_and_rsi = bl is not None and rsi_series is not None
-
-        # --- Signal detection (mirrors strategy.py and alerts/signals.py) ---
-        buy_signal = sell_signal = False
-
-        if bb_and_rsi:
-            if r < rsi_oversold and not pd.isna(bl) and S < bl:
-                buy_signal = True
-            if r > rsi_overbought:
-                sell_signal = True
-            if bu is not None and not pd.isna(bu) and S > bu:
-                sell_signal = True
-        else:
-            if r is not None and m is not None and r < rsi_oversold and m > 0:
-                buy_signal = True
-            elif r is not None and m is None and r < rsi_oversold:
-                buy_signal = True
-            elif bl is not None and not pd.isna(bl) and S < bl:
-                buy_signal = True
-            if r is not None and r > rsi_overbought:
-                sell_signal = True
-            if bu is not None and not pd.isna(bu) and S > bu:
-                sell_signal = True
-
-        if sw is not None and ml is not None and idx > 0:
-            prev_sw = float(ma_swing_series.iloc[idx - 1])
-            prev_ml = float(ma_long_series.iloc[idx - 1])
-            if prev_sw <= prev_ml and sw > ml:
-                buy_signal = True
-            elif prev_sw >= prev_ml and sw < ml:
-                sell_signal = True
-
-        if st_series is not None and idx > 0:
-            prev_dir = st_series["Direction"].iloc[idx - 1]
-            curr_dir = st_series["Direction"].iloc[idx]
-            if prev_dir == -1 and curr_dir == 1:
-                buy_signal = True
-            elif prev_dir == 1 and curr_dir == -1:
-                sell_signal = True
-
-        if div_series is not None:
-            if div_series["Bullish_Divergence"].iloc[idx]:
-                buy_signal = True
-            if div_series["Bearish_Divergence"].iloc[idx]:
-                sell_signal = True
-
-        if mk_bull is not None and mk_bull > mk_bull_thr:
-            buy_signal = True
-        if mk_bear is not None and mk_bear > mk_bear_thr:
-            sell_signal = True
-
-        # Map option_type to entry direction
-        enters_on_buy  = option_type in ("call", "auto")
-        enters_on_sell = option_type in ("put",  "auto")
-
         # --- Entry ---
         if contracts == 0 and pending is None:
-            if enters_on_buy and buy_signal:
+            if enters_on_buy and buy[idx]:
                 pending, pending_reason, pending_signal = "enter", "Bullish signal → CALL", "call"
-            elif enters_on_sell and sell_signal:
+            elif enters_on_sell and sell[idx]:
                 pending, pending_reason, pending_signal = "enter", "Bearish signal → PUT", "put"
 
         # --- Exit / stop-loss ---
         elif contracts > 0 and pending is None:
-            elapsed = (idx - entry_bar_idx) * bar_years
-            remaining_T = max(entry_T - elapsed, 0.001)
-            current_val = _bs_price(S, entry_strike, remaining_T, vol, entry_option_type)
-
-            if current_val < entry_premium * (1 - stop_loss_pct):
+            k = idx - entry_bar_idx
+            remaining_T = remaining[k]
+            current_val = mark_close[k]
+            reverse = sell[idx] if entry_option_type == "call" else buy[idx]
+
+            if signal_exits and reverse:
+                pending, pending_reason = "exit", "Exit signal"
+            elif current_val < entry_premium * (1 - stop_loss_pct):
                 pending, pending_reason = "exit", f"Stop loss ({stop_loss_pct:.0%} of premium)"
             elif remaining_T < 14 / 365:
                 pending, pending_reason = "exit", "Approaching expiry (< 2 weeks)"
 
     # --- Close open position at last bar ---
     if contracts > 0:
-        last_S = float(df["Close"].iloc[-1])
-        last_vol = float(vol_series.iloc[-1]) if not pd.isna(vol_series.iloc[-1]) else 0.30
-        elapsed = (len(df) - 1 - entry_bar_idx) * bar_years
-        remaining_T = max(entry_T - elapsed, 0.001)
-        exit_premium = _bs_price(last_S, entry_strike, remaining_T, max(last_vol, 0.05), entry_option_type)
+        last_S = float(close[-1])
+        k = n_bars - 1 - entry_bar_idx
+        remaining_T = remaining[k]
+        exit_premium = mark_close[k]
         proceeds = contracts * exit_premium * 100
         cost_basis = contracts * entry_premium * 100
         pnl = proceeds - cost_basis
@@ -345,7 +354,7 @@ def run_leaps_backtest(ticker, interval, strategy, option_type="auto",
         trades.append({
             "action": "SELL_LEAP_END",
             "option_type": entry_option_type.upper(),
-            "date": str(df.index[-1]),
+            "date": str(index[-1]),
             "spot": round(last_S, 2),
             "strike": entry_strike,
             "remaining_T": round(remaining_T, 3),
@@ -356,8 +365,54 @@ def run_leaps_backtest(ticker, interval, strategy, option_type="auto",
             "cash": round(cash, 2),
             "reason": "End of backtest",
         })
+    return trades, cash
+
+
+def run_leaps_backtest(ticker, interval, strategy, option_type="auto",
+                       leap_days=365, strike_moneyness=1.0,
+                       stop_loss_pct=0.50, start_cash=10000,
+                       risk_per_trade=0.20, output_dir=None, use_cache=True,
+                       vol_model=DEFAULT_VOL_MODEL):
+    """
+    Backtest LEAP call or put options using Black-Scholes pricing.
+
+    Args:
+        ticker: ticker symbol
+        interval: price interval (1d or 1wk recommended)
+        strategy: loaded strategy dict
+        option_type: "call", "put", or "auto" (derives from net signal direction)
+        leap_days: option duration at entry in days (default 365)
+        strike_moneyness: strike as fraction of spot at entry (1.0 = ATM)
+        stop_loss_pct: close if option loses this fraction of entry premium
+        start_cash: starting capital
+        risk_per_trade: fraction of cash to risk per trade
+        use_cache: reuse a stored result for an identical run (backtest/cache.py)
+        vol_model: pricing vol, one of utils/vol_store.VOL_MODELS (default 30-bar
+                   realized); read from the ticker's vol store when it is current
+    """
+    df = _leap_frame(ticker, interval)
+    if df is None:
+        return None
+    vol = _leap_vol(df, ticker, interval, vol_model)
+
+    # Stored vol can depend on history before the window, so key on the values too.
+    cache_key = backtest_cache_key(
+        "leaps", ticker, interval, strategy, df, option_type=option_type, leap_days=leap_days,
+        strike_moneyness=strike_moneyness, stop_loss_pct=stop_loss_pct, start_cash=start_cash,
+        risk_per_trade=risk_per_trade, vol_model=vol_model,
+        vol=hashlib.blake2b(vol.tobytes(), digest_size=16).hexdigest()) if use_cache else None
+    cached = cache_get(cache_key)
+    if cached is not None:
+        _save_results(output_dir or OUTPUT_BASE, ticker, interval, cached["stem"],
+                      cached["trades"], cached["metrics"])
+        logger.info(f"[cache] {ticker} LEAP {option_type} ({interval}) — stored result")
+        return cached["metrics"]
+
+    close, open_, buy, sell, signal_exits = _leap_inputs(df, ticker, strategy)
+    trades, cash = _leap_fills(df.index, close, open_, vol, buy, sell, option_type, leap_days,
+                               strike_moneyness, stop_loss_pct, start_cash, risk_per_trade,
+                               _bar_years(interval), signal_exits=signal_exits)
 
-    results_df = pd.DataFrame(trades)
     sell_trades = [t for t in trades if "SELL" in t["action"]]
     total_pnl = sum(t.get("pnl", 0) for t in sell_trades)
     num_entries = len([t for t in trades if t["action"] == "BUY_LEAP"])
@@ -380,15 +435,15 @@ def run_leaps_backtest(ticker, interval, strategy, option_type="auto",
         "win_rate": win_rate,
         "avg_pnl_pct": round(avg_pnl_pct, 1),
         "start_cash": start_cash,
-        "pricing_note": "Black-Scholes with 30-bar realized vol — approximate",
+        "vol_model": vol_model,
+        "pricing_note": f"Black-Scholes with {describe_vol(vol_model)} — approximate",
     }
 
     strategy_slug = re.sub(r"[^a-z0-9]+", "_", strategy.get("name", "unknown").lower()).strip("_")
-    out_dir = Path(output_dir or OUTPUT_BASE) / ticker / interval
-    out_dir.mkdir(parents=True, exist_ok=True)
-    results_df.to_csv(out_dir / f"{strategy_slug}_{option_type}.csv", index=False)
-    with open(out_dir / f"{strategy_slug}_{option_type}_metrics.json", "w") as f:
-        json.dump(metrics, f, indent=2)
+    stem = f"{strategy_slug}_{option_type}"
+    _save_results(output_dir or OUTPUT_BASE, ticker, interval, stem, trades, metrics)
+    cache_put(cache_key, "leaps", ticker, interval,
+              {"metrics": metrics, "trades": trades, "stem": stem})
 
     logger.info(
         f"[✓] {ticker} LEAP {option_type} ({interval}) — "
@@ -0,0 +1,210 @@
+"""LEAP contract sweeps: leap_days × strike_moneyness × stop_loss_pct in one pass.
+
+`run_leaps_sweep` loads a ticker and computes its entry/exit signals once, then
+replays run_leaps_backtest's position rules for every combination of contract
+(days to expiry, strike as a fraction of spot) and stop-loss. The expensive part,
+Black-Scholes marks, is shared: a position can only open at the fill bar after a
+signal, so for each contract every candidate entry is priced over all of its
+remaining bars in one bs_price call, and each stop-loss level just finds the first
+bar its exit rules fire on. What's left per combo is a short walk from one trade to
+the next. The result is a tidy table — one row per combo, the swept values next to
+the headline metrics run_leaps_backtest reports — that the CLI stacks into a single
+Parquet cube (`stonks leaps-backtest --sweep`).
+"""
+
+import itertools
+import logging
+
+import numpy as np
+import pandas as pd
+
+from stonkslib.backtest.black_scholes import bs_price
+from stonkslib.backtest.leaps import OUTPUT_BASE, _bar_years, _leap_frame, _leap_inputs, _leap_vol
+from stonkslib.utils.vol_store import DEFAULT_VOL_MODEL
+
+logger = logging.getLogger(__name__)
+
+LEAP_DAYS_GRID = [180, 270, 365, 540, 730]
+MONEYNESS_GRID = [0.9, 0.95, 1.0, 1.05, 1.1]
+STOP_LOSS_GRID = [0.25, 0.35, 0.5, 0.65, 0.8]
+
+SWEEP_COLUMNS = ["leap_days", "strike_moneyness", "stop_loss_pct"]
+METRIC_COLUMNS = ["final_cash", "net_pnl", "trades", "win_rate", "avg_pnl_pct"]
+
+
+def sweep_path(option_type, interval):
+    """Default location of the results cube for one CLI sweep."""
+    return OUTPUT_BASE / f"sweep_{option_type}_{interval}.parquet"
+
+
+def _next_true(mask):
+    """For each bar, the first bar at or after it where mask is set (len(mask) if
+    none), with one extra slot so lookups at len(mask) are safe."""
+    n = len(mask)
+    pos = np.append(np.where(mask, np.arange(n), n), n)
+    return np.minimum.accumulate(pos[::-1])[::-1]
+
+
+def _contract_exits(close, open_, vol, active, next_fill, reverse, fills, is_call, T,
+                    strike_moneyness, stop_losses, bar_years, signal_exits):
+    """Price one contract at every candidate entry and resolve each stop level's exit.
+
+    Each candidate's remaining bars (its fill bar to the end) are laid end to end in
+    one flat array, so a contract is priced in a single bs_price call per option type
+    and the first exit bar of every candidate is one minimum.reduceat.
+
+    Returns:
+        (premium, exit_bar, exit_premium) — entry premium per candidate, and per
+        candidate × stop level the exit fill bar (n for end of backtest) and the
+        premium received there.
+    """
+    n = len(close)
+    premium = np.empty(len(fills))
+    exit_bar = np.full((len(fills), len(stop_losses)), n)
+    exit_premium = np.empty((len(fills), len(stop_losses)))
+    for typ, rows in (("call", np.flatnonzero(is_call)), ("put", np.flatnonzero(~is_call))):
+        if not len(rows):
+            continue
+        f = fills[rows]
+        K = np.array([round(s * strike_moneyness, 2) for s in open_[f].tolist()])
+        premium[rows] = bs_price(open_[f], K, T, vol[f], typ)
+
+        lengths = n - f
+        starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        seg = np.repeat(np.arange(len(rows)), lengths)
+        k = np.arange(len(seg)) - starts[seg]                # bars since entry
+        bars = f[seg] + k
+        steps = np.maximum(T - k * bar_years, 0.001)
+        mark_close = bs_price(close[bars], K[seg], steps, vol[bars], typ)
+        fixed = steps < 14 / 365
+        if signal_exits:
+            fixed = fixed | reverse[typ][bars]
+        last = starts + lengths - 1
+        for j, stop in enumerate(stop_losses):
+            with np.errstate(invalid="ignore"):
+                fire = active[bars] & (fixed | (mark_close < premium[rows][seg] * (1 - stop)))
+            first = np.minimum.reduceat(np.where(fire, bars, n), starts)
+            y = np.where(first < n, next_fill[np.minimum(first + 1, n)], n)
+            exit_bar[rows, j] = y
+            exit_premium[rows, j] = mark_close[last]
+            filled = y < n
+            if filled.any():
+                yi = y[filled]
+                exit_premium[rows[filled], j] = bs_price(
+                    open_[yi], K[filled], steps[starts[filled] + (yi - f[filled])], vol[yi], typ)
+    return premium, exit_bar, exit_premium
+
+
+def _walk(next_sig, next_fill, cand_of_sig, premium, exit_bar, exit_premium, start_cash,
+          risk_per_trade, n):
+    """Replay the flat → pending entry → open → pending exit cycle of _leap_fills from
+    precomputed per-candidate entry premiums and exits. Returns the metrics dict.
+
+    Premiums stay NumPy scalars, as bs_greeks returns them to _leap_fills, so the
+    P&L arithmetic and rounding match it exactly."""
+    cash = float(start_cash)
+    pnls, pcts = [], []
+    entries = 0
+    bar = 0
+    while True:
+        s = next_sig[bar]
+        if s >= n or next_fill[s + 1] >= n:
+            break
+        f = next_fill[s + 1]
+        c = cand_of_sig[s]
+        entry_premium = premium[c]
+        if not entry_premium > 0:
+            bar = f                  # order dropped; the fill bar can signal again
+            continue
+        contracts = max(1, int((start_cash * risk_per_trade) / (entry_premium * 100)))
+        cost = min(contracts * entry_premium * 100, cash)
+        contracts = int(cost / (entry_premium * 100))
+        if contracts == 0:
+            bar = f + 1
+            continue
+        cash -= contracts * entry_premium * 100
+        entries += 1
+        proceeds = contracts * exit_premium[c] * 100
+        cost_basis = contracts * entry_premium * 100
+        pnl = proceeds - cost_basis
+        cash += proceeds
+        pnls.append(round(pnl, 2))
+        pcts.append(round(pnl / cost_basis * 100, 1) if cost_basis > 0 else 0)
+        if exit_bar[c] >= n:
+            break
+        bar = exit_bar[c]
+
+    wins = len([p for p in pnls if p > 0])
+    return {
+        "final_cash": round(cash, 2),
+        "net_pnl": round(sum(pnls), 2),
+        "trades": entries,
+        "win_rate": round(wins / entries, 3) if entries > 0 else 0.0,
+        "avg_pnl_pct": round(sum(pcts) / len(pcts), 1) if pcts else 0.0,
+    }
+
+
+def run_leaps_sweep(ticker, interval, strategy, option_type="auto", leap_days=None,
+                    strike_moneyness=None, stop_loss_pct=None, start_cash=10000,
+                    risk_per_trade=0.20, df_override=None, vol_model=DEFAULT_VOL_MODEL):
+    """Backtest every leap_days × strike_moneyness × stop_loss_pct combination.
+
+    Args:
+        ticker, interval, strategy, option_type, start_cash, risk_per_trade, vol_model:
+            as for run_leaps_backtest
+        leap_days, strike_moneyness, stop_loss_pct: lists of values to sweep
+            (default LEAP_DAYS_GRID, MONEYNESS_GRID, STOP_LOSS_GRID)
+        df_override: price frame to use instead of load_td (already trimmed)
+
+    Returns:
+        DataFrame with one row per combo: ticker, interval, strategy, option_type,
+        vol_model, SWEEP_COLUMNS and METRIC_COLUMNS — or None if the ticker has no data.
+    """
+    leap_days = list(leap_days or LEAP_DAYS_GRID)
+    strike_moneyness = list(strike_moneyness or MONEYNESS_GRID)
+    stop_loss_pct = list(stop_loss_pct or STOP_LOSS_GRID)
+    df = _leap_frame(ticker, interval) if df_override is None else df_override
+    if df is None or df.empty:
+        return None
+
+    close, open_, buy, sell, signal_exits = _leap_inputs(df, ticker, strategy)
+    vol = _leap_vol(df, ticker, interval, vol_model)
+    n = len(close)
+    active = ~(close <= 0)                                   # bars the fill loop visits
+    next_fill = _next_true(active & (open_ > 0))
+    call_sig = active & buy & (option_type in ("call", "auto"))
+    put_sig = active & sell & (option_type in ("put", "auto")) & ~call_sig
+    next_sig = _next_true(call_sig | put_sig)
+
+    # Candidate entries: (fill bar, call/put) for every signal that could place an order.
+    sig_bars = np.flatnonzero(call_sig | put_sig)
+    sig_fills = next_fill[sig_bars + 1]
+    keys = sig_fills * 2 + call_sig[sig_bars]
+    uniq, inverse = np.unique(keys[sig_fills < n], return_inverse=True)
+    cand_of_sig = np.zeros(n, dtype=np.int64)
+    cand_of_sig[sig_bars[sig_fills < n]] = inverse
+    fills, is_call = uniq // 2, (uniq % 2).astype(bool)
+    reverse = {"call": sell, "put": buy}
+    by = _bar_years(interval)
+
+    rows = []
+    walk_args = (next_sig.tolist(), next_fill.tolist(), cand_of_sig.tolist())
+    for days, moneyness in itertools.product(leap_days, strike_moneyness):
+        premium, exit_bar, exit_premium = _contract_exits(
+            close, open_, vol, active, next_fill, reverse, fills, is_call, days / 365.0,
+            moneyness, stop_loss_pct, by, signal_exits)
+        for j, stop in enumerate(stop_loss_pct):
+            m = _walk(*walk_args, premium, exit_bar[:, j].tolist(), exit_premium[:, j],
+                      start_cash, risk_per_trade, n)
+            rows.append({"leap_days": days, "strike_moneyness": moneyness,
+                         "stop_loss_pct": stop, **m})
+
+    table = pd.DataFrame(rows, columns=SWEEP_COLUMNS + METRIC_COLUMNS)
+    table.insert(0, "ticker", ticker)
+    table.insert(1, "interval", interval)
+    table.insert(2, "strategy", strategy.get("name", "unknown"))
+    table.insert(3, "option_type", option_type)
+    table.insert(4, "vol_model", vol_model)
+    logger.info(f"[✓] {ticker} LEAP {option_type} ({interval}) — {len(table)} contract/stop "
+                f"combos over {len(fills)} candidate entries")
+    return table
@@ -0,0 +1,123 @@
+"""Array-based backtest metrics and the buy-and-hold benchmark.
+
+Everything here works on the plain arrays a backtest already has at the end of a
+run — the equity values at each bar with a close, the bar timestamps, which bars
+held a position and any cash contributed on a bar — instead of looping over
+per-bar Python objects:
+
+- `max_drawdown` — cumulative-max drawdown, the figure reported as "max_drawdown";
+- `performance_stats` — Sharpe, Sortino, exposure, CAGR and max drawdown from one
+  set of bar returns (time-weighted, so DCA contributions don't count as gains);
+- `buy_and_hold_positions` — the shares held after each bar when the start cash is
+  invested at the first tradable open and DCA contributions are bought on their
+  contribution bars;
+- `return_pct` — net P&L over the capital put in, as the Backtest page shows it.
+
+Sharpe and Sortino are annualised with the bar frequency implied by the index
+(≈252 for daily bars) and a zero risk-free rate.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+
+def max_drawdown(values):
+    """Largest peak-to-trough fall of an equity series, as a fraction of the peak.
+    For a bars × curves matrix, one figure per column (an array)."""
+    values = np.asarray(values, dtype=np.float64)
+    if not len(values):
+        return 0.0 if values.ndim == 1 else np.zeros(values.shape[1])
+    peak = np.maximum.accumulate(values, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dd = np.where(peak > 0, (peak - values) / peak, 0.0)
+    if values.ndim == 1:
+        return max(float(dd.max()), 0.0)
+    return np.maximum(dd.max(axis=0), 0.0)
+
+
+def _years(index) -> float:
+    if len(index) < 2:
+        return 0.0
+    return (index[-1] - index[0]).total_seconds() / (365.25 * 86400)
+
+
+def performance_stats(index, values, held=None, flows=None) -> dict:
+    """Risk/return summary of an equity curve.
+
+    Args:
+        index: DatetimeIndex of the equity points
+        values: portfolio value at each point
+        held: bool per point, True while a position was open (exposure); default:
+              every point with a positive value
+        flows: cash added to the portfolio at each point (DCA contributions), taken
+               out of that bar's return
+
+    Returns:
+        dict with sharpe, sortino, exposure, cagr and max_drawdown (rounded).
+    """
+    index = pd.DatetimeIndex(index)
+    values = np.asarray(values, dtype=np.float64)
+    held = values > 0 if held is None else np.asarray(held, dtype=bool)
+    stats = {"sharpe": 0.0, "sortino": 0.0, "exposure": 0.0, "cagr": 0.0,
+             "max_drawdown": round(max_drawdown(values), 4)}
+    if not len(values):
+        return stats
+    stats["exposure"] = round(float(held.mean()), 4)
+
+    prev, cur = values[:-1], values[1:]
+    if flows is not None:
+        cur = cur - np.asarray(flows, dtype=np.float64)[1:]
+    live = prev > 0   # no return before the first position / after a wipe-out
+    rets = cur[live] / prev[live] - 1.0
+    years = _years(index)
+    if len(rets) < 2 or years <= 0:
+        return stats
+
+    per_year = (len(values) - 1) / years
+    mean, std = rets.mean(), rets.std(ddof=1)
+    downside = math.sqrt(float(np.mean(np.minimum(rets, 0.0) ** 2)))
+    if std > 0:
+        stats["sharpe"] = round(float(mean / std * math.sqrt(per_year)), 3)
+    if downside > 0:
+        stats["sortino"] = round(float(mean / downside * math.sqrt(per_year)), 3)
+    growth = float(np.prod(1.0 + rets))
+    if growth > 0:
+        stats["cagr"] = round(growth ** (1.0 / years) - 1.0, 4)
+    return stats
+
+
+def buy_and_hold_positions(open_, start_cash, slippage, dca_amount=0.0, dca_bars=0):
+    """Shares held after each bar's open for the buy-and-hold benchmark.
+
+    The start cash is invested at the first bar with a usable open; when dca_amount
+    and dca_bars are set, dca_amount is added and bought at every dca_bars-th bar
+    (not the first) whose open is usable.
+
+    Returns:
+        (pos, contributions) — float64 shares held per bar and the cash contributed
+        on each bar (0 where none).
+    """
+    open_ = np.asarray(open_, dtype=np.float64)
+    n = len(open_)
+    tradable = ~np.isnan(open_) & (open_ != 0)
+    contributions = np.zeros(n)
+    if dca_amount > 0 and dca_bars > 0:
+        bar = np.arange(n)
+        contributions[(bar > 0) & (bar % dca_bars == 0) & tradable] = float(dca_amount)
+
+    spend = contributions.copy()
+    first = np.flatnonzero(tradable)
+    if len(first) and start_cash > 0:
+        spend[first[0]] += float(start_cash)
+    fill = open_ * (1 + slippage)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shares = np.where(spend > 0, spend / fill, 0.0)
+    return np.cumsum(shares), contributions
+
+
+def return_pct(m: dict) -> float:
+    """Net P&L as a percentage of the capital a run put in (0 when nothing was)."""
+    invested = m.get("total_invested", m.get("start_cash", 10000))
+    return m.get("net_pnl", 0) / invested * 100 if invested else 0.0
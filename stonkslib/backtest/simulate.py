@@ -0,0 +1,305 @@
+"""Array-based fill simulator for v2 strategies.
+
+A v2 strategy's entry/exit signals are whole boolean Series computed up front by the
+expression engine, so the per-bar work left in `run_strategy_backtest` is pure state
+bookkeeping: next-bar-open fills with slippage, the fixed stop-loss and the trailing
+stop. `simulate_signals` runs that state machine over plain arrays (under Numba when
+it is installed, over Python lists otherwise) instead of `df.iterrows()`, and only
+materialises the trade dicts and the equity array at the end.
+
+Output is identical to the old per-row loop — same trades, same rounding, same
+equity curve — including the quirk that prices/sizes were rounded as NumPy scalars
+(they came out of an iterrows row) while cash and P&L were rounded as Python floats.
+"""
+
+import numpy as np
+import pandas as pd
+
+from stonkslib.backtest.metrics import max_drawdown
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# event kinds / reasons written by the kernel
+_BUY, _SELL = 1, 2
+_ENTRY, _EXIT, _STOP, _TRAIL = 1, 2, 3, 4
+_REASONS = {_ENTRY: "Entry signal", _EXIT: "Exit signal", _STOP: "Stop Loss"}
+
+
+def _run(open_, close, entry, exit_, cash, risk_per_trade, per_signal_amount, slippage,
+         stop_loss_pct, trailing_stop_pct, equity, held,
+         ev_bar, ev_kind, ev_reason, ev_fill, ev_size, ev_cash, ev_pnl, ev_peak):
+    """The per-bar state machine, over plain sequences.
+
+    Writes one event per fill into the ev_* buffers and the portfolio value of every
+    bar with a valid close into `equity` (`held` marks bars with an open position).
+    Returns (events, cash, invested, pos, entry_price, invested_np); an entry price
+    of 0.0 stands for "none", exactly as the loop's truthiness checks treated it.
+    """
+    n_ev = 0
+    pos = 0.0
+    entry_price = 0.0
+    peak = 0.0
+    has_peak = False
+    pending = 0
+    reason = 0
+    reason_peak = 0.0
+    invested = 0.0
+    sold = False
+    invested_np = False
+
+    for i in range(len(close)):
+        o = open_[i]
+        c = close[i]
+
+        # --- Execute pending order at this bar's open ---
+        if pending != 0 and o != 0.0 and o == o:
+            if pending == _BUY and pos == 0:
+                fill = o * (1 + slippage)
+                capped = False
+                if per_signal_amount > 0:
+                    capped = cash < per_signal_amount
+                    amount = cash if capped else per_signal_amount
+                else:
+                    amount = cash * risk_per_trade
+                size = amount / fill
+                if size > 0.00001:
+                    pos = size
+                    entry_price = fill
+                    peak = fill
+                    has_peak = True
+                    cash -= amount
+                    invested += amount
+                    # min(psa, cash) handed back the (NumPy) cash once a sell had run
+                    invested_np = invested_np or (capped and sold)
+                    ev_bar[n_ev] = i
+                    ev_kind[n_ev] = _BUY
+                    ev_reason[n_ev] = reason
+                    ev_fill[n_ev] = fill
+                    ev_size[n_ev] = pos
+                    ev_cash[n_ev] = cash
+                    n_ev += 1
+            elif pending == _SELL and pos > 0:
+                fill = o * (1 - slippage)
+                cash += pos * fill
+                ev_bar[n_ev] = i
+                ev_kind[n_ev] = _SELL
+                ev_reason[n_ev] = reason
+                ev_fill[n_ev] = fill
+                ev_size[n_ev] = pos
+                ev_cash[n_ev] = cash
+                ev_pnl[n_ev] = (fill - entry_price) * pos
+                ev_peak[n_ev] = reason_peak
+                n_ev += 1
+                pos = 0.0
+                entry_price = 0.0
+                has_peak = False
+                sold = True
+            pending = 0
+            reason = 0
+
+        if c != c:
+            continue
+
+        # --- Equity curve ---
+        if pos > 0:
+            equity[i] = cash + pos * c
+            held[i] = True
+        else:
+            equity[i] = cash
+
+        # --- Trailing stop ---
+        if trailing_stop_pct != 0 and pos > 0 and has_peak and pending == 0:
+            peak = max(peak, c)
+            if c < peak * (1 - trailing_stop_pct):
+                pending = _SELL
+                reason = _TRAIL
+                reason_peak = peak
+                continue
+
+        # --- Entries/exits from the precomputed signals ---
+        if pos == 0 and pending == 0:
+            if entry[i]:
+                pending = _BUY
+                reason = _ENTRY
+        elif pos > 0 and pending == 0 and trailing_stop_pct == 0:
+            if exit_[i]:
+                pending = _SELL
+                reason = _EXIT
+            elif stop_loss_pct > 0 and entry_price != 0 and c < entry_price * (1 - stop_loss_pct):
+                pending = _SELL
+                reason = _STOP
+
+    return n_ev, cash, invested, pos, entry_price, invested_np
+
+
+_run_jit = njit(cache=True)(_run) if njit is not None else None
+
+
+def _date_strings(index) -> list:
+    """`[str(ts) for ts in index]`, vectorized for whole-second naive/UTC indexes."""
+    if isinstance(index, pd.DatetimeIndex) and (index.tz is None or str(index.tz) == "UTC"):
+        ns = index.asi8
+        if len(ns) and not (ns % 1_000_000_000).any():
+            text = np.datetime_as_string(ns.view("M8[ns]"), unit="s")
+            suffix = "" if index.tz is None else "+00:00"
+            return [t.replace("T", " ") + suffix for t in text.tolist()]
+    return [str(ts) for ts in index]
+
+
+def _simulate(open_, close, entry, exit_, args):
+    """Run the kernel on one signal pair: `open_`/`close` are float64 arrays (or, for
+    the pure-Python kernel, lists), `args` the six scalar risk settings."""
+    n = len(entry)
+    if _run_jit is not None:
+        equity = np.full(n, np.nan)
+        held = np.zeros(n, dtype=np.bool_)
+        ev = [np.zeros(n + 1, dtype=np.int64) for _ in range(3)] + \
+             [np.full(n + 1, np.nan) for _ in range(5)]
+        state = _run_jit(open_, close, entry, exit_, *args, equity, held, *ev)
+    else:
+        equity = [np.nan] * n
+        held = [False] * n
+        ev = [[0] * (n + 1) for _ in range(3)] + [[np.nan] * (n + 1) for _ in range(5)]
+        state = _run(open_, close, entry.tolist(), exit_.tolist(), *args, equity, held, *ev)
+        equity = np.asarray(equity, dtype=np.float64)
+        held = np.asarray(held, dtype=bool)
+    return state, equity, held, ev
+
+
+def _prices(df):
+    open_ = df["Open"].to_numpy(dtype=np.float64)
+    close = df["Close"].to_numpy(dtype=np.float64)
+    if _run_jit is None:
+        return open_.tolist(), close.tolist(), close
+    return open_, close, close
+
+
+def _round_equity(values, held):
+    """round(v, 2) per equity point as the row loop did it: NumPy rounding where a
+    position was open (pos * close was a NumPy scalar), Python's round elsewhere.
+    Flat values are just the cash balance, so only the distinct ones are rounded."""
+    out = np.round(values, 2)
+    flat = ~held
+    if flat.any():
+        uniq, inv = np.unique(values[flat], return_inverse=True)
+        out[flat] = np.array([round(v, 2) for v in uniq.tolist()])[inv]
+    return out
+
+
+def _risk_args(start_cash, risk_per_trade, per_signal_amount, slippage, stop_loss_pct,
+               trailing_stop_pct):
+    return (float(start_cash), float(risk_per_trade), float(per_signal_amount), float(slippage),
+            float(stop_loss_pct), float(trailing_stop_pct or 0.0))
+
+
+def simulate_signals(df, entry_sig, exit_sig, start_cash, risk_per_trade, slippage,
+                     stop_loss_pct, trailing_stop_pct=None, per_signal_amount=0):
+    """Simulate a v2 strategy's fills from precomputed entry/exit signals.
+
+    Args:
+        df: price frame with Open/Close columns (float64, as load_td provides)
+        entry_sig, exit_sig: boolean Series aligned to df.index
+        start_cash, risk_per_trade, slippage, stop_loss_pct, trailing_stop_pct,
+        per_signal_amount: as in run_strategy_backtest
+
+    Returns:
+        dict with trades, equity_index/equity/held (the bars with a valid close, the
+        portfolio value at each rounded to cents, and whether a position was open),
+        cash, invested, pos and entry_price (the open position, if any, that
+        run_strategy_backtest closes at the last bar).
+    """
+    open_, close_in, close = _prices(df)
+    args = _risk_args(start_cash, risk_per_trade, per_signal_amount, slippage, stop_loss_pct,
+                      trailing_stop_pct)
+    state, equity, held, ev = _simulate(open_, close_in, entry_sig.to_numpy(dtype=bool),
+                                        exit_sig.to_numpy(dtype=bool), args)
+    n_ev, cash, invested, pos, entry_price, invested_np = state
+
+    ev_bar, ev_kind, ev_reason, ev_fill, ev_size, ev_cash, ev_pnl, ev_peak = ev
+    dates = _date_strings(df.index[np.asarray(ev_bar[:n_ev], dtype=np.int64)])
+    trades = []
+    for k in range(n_ev):
+        reason = int(ev_reason[k])
+        if reason == _TRAIL:
+            why = f"Trailing Stop ({trailing_stop_pct:.0%} from ${float(ev_peak[k]):.2f})"
+        else:
+            why = _REASONS.get(reason, "")
+        trade = {"action": "BUY" if ev_kind[k] == _BUY else "SELL", "date": dates[k],
+                 "price": round(np.float64(ev_fill[k]), 4), "size": round(np.float64(ev_size[k]), 8),
+                 "cash": round(float(ev_cash[k]), 2)}
+        if ev_kind[k] == _SELL:
+            trade["pnl"] = round(float(ev_pnl[k]), 2)
+        trade["reason"] = why
+        trades.append(trade)
+
+    valid = ~np.isnan(close)
+
+    return {
+        "trades": trades,
+        "equity_index": df.index[valid],
+        "equity": _round_equity(equity[valid], held[valid]),
+        "held": held[valid],
+        "cash": float(cash),
+        "invested": np.float64(invested) if invested_np else float(invested),
+        "pos": np.float64(pos) if pos > 0 else 0,
+        "entry_price": np.float64(entry_price) if pos > 0 else None,
+    }
+
+
+def simulate_grid(df, entries, exits, start_cash, risk_per_trade, slippage, stop_loss_pct,
+                  trailing_stop_pct=None, per_signal_amount=0):
+    """Metrics-only `simulate_signals` for many signal columns over one price frame.
+
+    Args:
+        df: price frame with Open/Close columns
+        entries, exits: boolean arrays of shape (bars, combos)
+        start_cash, risk_per_trade, slippage, stop_loss_pct, trailing_stop_pct,
+        per_signal_amount: scalars, or one value per combo
+
+    Returns:
+        dict of per-combo arrays — final_cash, net_pnl, trades, win_rate, max_drawdown,
+        total_invested — computed exactly as run_strategy_backtest reports them
+        (including closing an open position at the last bar's close).
+    """
+    entries = np.asarray(entries, dtype=bool)
+    exits = np.asarray(exits, dtype=bool)
+    n, m = entries.shape
+    open_, close_in, close = _prices(df)
+    valid = np.flatnonzero(~np.isnan(close))
+    last_close = float(close[-1]) if n else float("nan")
+
+    settings = [start_cash, risk_per_trade, per_signal_amount, slippage, stop_loss_pct,
+                trailing_stop_pct]
+    settings = [list(v) if isinstance(v, (list, tuple, np.ndarray)) else [v] * m for v in settings]
+
+    out = {k: np.zeros(m) for k in ("final_cash", "net_pnl", "win_rate", "max_drawdown",
+                                    "total_invested")}
+    out["trades"] = np.zeros(m, dtype=np.int64)
+    curves = np.empty((len(valid), m))
+    for j in range(m):
+        start, risk, psa, slip, stop, trail = (v[j] for v in settings)
+        args = _risk_args(start, risk, psa, slip, stop, trail)
+        state, equity, held, ev = _simulate(open_, close_in, entries[:, j], exits[:, j], args)
+        n_ev, cash, invested, pos, entry_price, invested_np = state
+        ev_kind, ev_pnl = ev[1], ev[6]
+
+        buys = sum(1 for k in range(n_ev) if ev_kind[k] == _BUY)
+        wins = sum(1 for k in range(n_ev) if ev_kind[k] == _SELL and round(float(ev_pnl[k]), 2) > 0)
+        if pos > 0:
+            fill = last_close * (1 - args[3])
+            cash += pos * fill
+            wins += round(float((fill - entry_price) * pos), 2) > 0
+        curves[:, j] = _round_equity(equity[valid], held[valid])
+
+        out["final_cash"][j] = round(float(cash), 2)
+        out["net_pnl"][j] = round(float(cash) - args[0], 2)
+        out["trades"][j] = buys
+        out["win_rate"][j] = round(wins / buys, 3) if buys > 0 else 0.0
+        spent = (np.float64(invested) if invested_np else float(invested)) if args[2] > 0 else args[0]
+        out["total_invested"][j] = round(spent, 2)
+
+    out["max_drawdown"] = np.array([round(float(v), 4) for v in max_drawdown(curves)])
+    return out
@@ -28,7 +28,12 @@ def _resolve_tickers(target):
 @click.argument("target", required=False, default=None,
                 metavar="[TICKER|CATEGORY|all]")
 @click.option("--interval", type=click.Choice(INTERVALS), default="1d", show_default=True)
-def analyze(target, interval):
+@click.option("--rebuild", is_flag=True,
+              help="Recompute even when the cleaned data / signal files are unchanged")
+@click.option("--verify-incremental", "verify", is_flag=True,
+              help="Check tail-only indicator updates against a full recompute "
+                   "(falls back to the full recompute on mismatch)")
+def analyze(target, interval, rebuild, verify):
     """Run indicators, detect patterns, and merge signals.
 
     TARGET can be a ticker (AAPL), a category (stocks/etfs/crypto), or 'all'.\n
@@ -36,7 +41,8 @@ def analyze(target, interval):
     Examples:\n
       stonks analyze AAPL --interval 1d\n
       stonks analyze crypto --interval 1wk\n
-      stonks analyze all
+      stonks analyze all\n
+      stonks analyze AAPL --rebuild            # ignore the unchanged-input skip
     """
     if not target:
         target = "all"
@@ -45,13 +51,13 @@ def analyze(target, interval):
 
     for t in tickers:
         try:
-            aggregate_and_save(t, interval)
+            aggregate_and_save(t, interval, rebuild=rebuild, verify=verify)
             logger.info(f"[✓] Analyzed {t} ({interval})")
         except Exception as e:
             logger.error(f"[!] Analyze {t} ({interval}): {e}")
         try:
-            merge_signals_for_ticker_interval(t, interval)
-            merge_patterns_for_ticker_interval(t, interval)
+            merge_signals_for_ticker_interval(t, interval, rebuild=rebuild)
+            merge_patterns_for_ticker_interval(t, interval, rebuild=rebuild)
             logger.info(f"[✓] Merged {t} ({interval})")
         except Exception as e:
             logger.error(f"[!] Merge {t} ({interval}): {e}")
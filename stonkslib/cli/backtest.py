@@ -41,7 +41,9 @@ def _load_strategies(all_strategies, every_strategy, strategy):
 @click.option("--interval",
               type=click.Choice(["1m", "5m", "15m", "30m", "1h", "1d", "1wk"]),
               default="1d", show_default=True)
-def backtest(target, strategy, all_strategies, every_strategy, interval):
+@click.option("--no-cache", "no_cache", is_flag=True,
+              help="Re-simulate even when an identical run's result is stored")
+def backtest(target, strategy, all_strategies, every_strategy, interval, no_cache):
     """Run strategy backtests.
 
     TARGET can be a ticker (AAPL), a category (stocks/etfs/crypto), or 'all'.\n
@@ -52,6 +54,7 @@ def backtest(target, strategy, all_strategies, every_strategy, interval):
       stonks backtest all --all-strategies --interval 1wk
     """
     from stonkslib.backtest.strategy import run_strategy_backtest, load_strategy
+    from stonkslib.backtest.cache import backtest_cache_info
 
     if not target:
         print("[!] Provide a ticker (AAPL), category (stocks/etfs/crypto), or 'all'")
@@ -75,7 +78,7 @@ def backtest(target, strategy, all_strategies, every_strategy, interval):
         strat_name = strat.get("name", path.stem)
         metrics_list = []
         for t in tickers:
-            m = run_strategy_backtest(t, interval, strat)
+            m = run_strategy_backtest(t, interval, strat, use_cache=not no_cache)
             if m:
                 metrics_list.append(m)
         if metrics_list:
@@ -99,4 +102,9 @@ def backtest(target, strategy, all_strategies, every_strategy, interval):
         short = name[:23] + "…" if len(name) > 24 else name
         marker = "  ◀ BEST" if i == 1 else ""
         print(f"  {i:<3} {short:<24} ${pnl:>9.2f} {win:>6.1%} {trades:>7}{marker}")
-    print(f"{'='*60}\n")
+    print(f"{'='*60}")
+    info = backtest_cache_info()
+    if info["hits"] + info["misses"]:
+        print(f"  Result cache: {info['hits']}/{info['hits'] + info['misses']} runs reused "
+              f"({info['hit_rate']:.0%}), {info['entries']} stored")
+    print()
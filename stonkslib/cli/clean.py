@@ -40,6 +40,8 @@ def clean():
       stonks clean               (all tickers, all intervals)\n
       stonks clean AAPL\n
       stonks clean crypto --interval 1d\n
+      stonks clean store --interval 1d\n
+      stonks clean vol AAPL --interval 1d\n
       stonks clean options AAPL
     """
 
@@ -64,9 +66,54 @@ def data(target, interval, force):
                 df = clean_td(t, i, force=force)
                 if df is not None:
                     logger.info(f"[✓] Cleaned {t} ({i}) — {len(df)} rows")
+                    _rebuild_vol(t, i)
             except Exception as e:
                 logger.error(f"[!] {t} ({i}): {e}")
 
+    for i in intervals:
+        _rebuild_store(i)
+
+
+def _rebuild_store(interval):
+    from stonkslib.utils.price_store import build_price_store
+    try:
+        path = build_price_store(interval)
+        if path is not None:
+            logger.info(f"[✓] Price store rebuilt ({interval}) → {path}")
+    except Exception as e:
+        logger.error(f"[!] Price store ({interval}): {e}")
+
+
+def _rebuild_vol(ticker, interval):
+    from stonkslib.utils.vol_store import build_vol_store
+    try:
+        path = build_vol_store(ticker, interval)
+        if path is not None:
+            logger.info(f"[✓] Vol store {ticker} ({interval}) → {path}")
+    except Exception as e:
+        logger.error(f"[!] Vol store {ticker} ({interval}): {e}")
+
+
+@clean.command()
+@click.option("--interval", type=click.Choice(INTERVALS), default=None,
+              help="Specific interval (default: all)")
+def store(interval):
+    """Repack cleaned parquets into the per-interval Arrow price store."""
+    for i in ([interval] if interval else INTERVALS):
+        _rebuild_store(i)
+
+
+@clean.command()
+@click.argument("target", required=False, default=None,
+                metavar="[TICKER|CATEGORY|all]")
+@click.option("--interval", type=click.Choice(INTERVALS), default=None,
+              help="Specific interval (default: all)")
+def vol(target, interval):
+    """Recompute the per-ticker vol store (realized/EWMA/GARCH) from cleaned parquets."""
+    for t in _resolve_tickers(target or "all"):
+        for i in ([interval] if interval else INTERVALS):
+            _rebuild_vol(t, i)
+
 
 @clean.command()
 @click.argument("ticker", required=False, default=None)
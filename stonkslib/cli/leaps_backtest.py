@@ -8,6 +8,10 @@ from stonkslib.utils.active_strategies import resolve_strategy_set
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 STRATEGY_DIR = PROJECT_ROOT / "stonkslib" / "strategies"
 TICKER_YAML = PROJECT_ROOT / "tickers.yaml"
+# utils/vol_store.VOL_MODELS / DEFAULT_VOL_MODEL, listed here so importing the CLI stays
+# light (vol_store pulls in scipy and pyarrow); dev/test_vol_store.py keeps them in sync.
+VOL_MODELS = ["rv_10", "rv_20", "rv_30", "rv_60", "rv_90", "ewma", "garch"]
+DEFAULT_VOL_MODEL = "rv_30"
 logger = setup_logging(PROJECT_ROOT / "log", "leaps.log")
 
 
@@ -42,7 +46,7 @@ def _resolve_strategy_path(path, ticker=None, option_type="auto"):
     return path
 
 
-def _print_results(all_results):
+def _print_results(all_results, pricing="30-bar realized vol"):
     rows = []
     for r in all_results:
         if r:
@@ -68,7 +72,29 @@ def _print_results(all_results):
               f"${r['net_pnl']:>9.2f} {r['win_rate']:>6.1%} {r['avg_pnl_pct']:>7.1f}% "
               f"{r['trades']:>7}{marker}")
 
-    print(f"\n  Pricing: Black-Scholes with 30-bar realized vol (approximate)")
+    print(f"\n  Pricing: Black-Scholes with {pricing} (approximate)")
+    print(f"{'='*width}\n")
+
+
+def _float_list(text):
+    return [float(v) for v in text.split(",") if v.strip()]
+
+
+def _print_sweep(cube, path, top=3):
+    width = 80
+    print(f"\n{'='*width}")
+    print(f"{'LEAP SWEEP — BEST CONTRACTS':^{width}}")
+    print(f"{'='*width}")
+    print(f"  {'Ticker':<8} {'Strategy':<26} {'Days':>5} {'K/S':>5} {'Stop':>5} "
+          f"{'P&L':>10} {'Win%':>7} {'Trades':>7}")
+    print(f"  {'-'*75}")
+    best = (cube.sort_values("net_pnl", ascending=False)
+                .groupby(["ticker", "strategy"], sort=False).head(top))
+    for _, r in best.iterrows():
+        print(f"  {r['ticker']:<8} {r['strategy']:<26} {r['leap_days']:>5} "
+              f"{r['strike_moneyness']:>5.2f} {r['stop_loss_pct']:>5.0%} "
+              f"${r['net_pnl']:>9.2f} {r['win_rate']:>6.1%} {r['trades']:>7}")
+    print(f"\n  {len(cube)} rows → {path}")
     print(f"{'='*width}\n")
 
 
@@ -90,19 +116,38 @@ def _print_results(all_results):
               help="Strike as fraction of spot (1.0=ATM, 0.95=slightly ITM call)")
 @click.option("--stop-loss", "stop_loss_pct", default=0.50, show_default=True,
               help="Close if option loses this fraction of entry premium")
+@click.option("--vol-model", "vol_model", type=click.Choice(VOL_MODELS), default=DEFAULT_VOL_MODEL,
+              show_default=True,
+              help="Pricing vol from the per-ticker vol store: rv_N = N-bar realized, "
+                   "ewma, garch (GARCH(1,1))")
+@click.option("--sweep", is_flag=True,
+              help="Backtest every --sweep-days × --sweep-moneyness × --sweep-stops combo "
+                   "in one pass per ticker/strategy and write a Parquet results cube.")
+@click.option("--sweep-days", default="180,270,365,540,730", show_default=True,
+              help="Comma-separated LEAP durations (days) for --sweep")
+@click.option("--sweep-moneyness", default="0.9,0.95,1.0,1.05,1.1", show_default=True,
+              help="Comma-separated strike/spot ratios for --sweep")
+@click.option("--sweep-stops", default="0.25,0.35,0.5,0.65,0.8", show_default=True,
+              help="Comma-separated stop-loss fractions for --sweep")
+@click.option("--sweep-out", default=None, type=click.Path(dir_okay=False),
+              help="Parquet file for the --sweep cube "
+                   "(default: data/backtest_results/leaps/sweep_<type>_<interval>.parquet)")
 def leaps_backtest(target, strategy, all_strategies, every_strategy, option_type, interval,
-                   leap_days, strike_moneyness, stop_loss_pct):
+                   leap_days, strike_moneyness, stop_loss_pct, vol_model, sweep, sweep_days,
+                   sweep_moneyness, sweep_stops, sweep_out):
     """Backtest LEAP call/put options using Black-Scholes pricing on historical data.
 
-    Premiums are approximated via Black-Scholes with 30-bar realized volatility
-    since yfinance doesn't provide historical options prices. Results are
-    directionally useful but not exact.
+    Premiums are approximated via Black-Scholes with a historical volatility model
+    (--vol-model; 30-bar realized by default) since yfinance doesn't provide
+    historical options prices. Results are directionally useful but not exact.
 
     Examples:\n
       stonks leaps-backtest AAPL --strategy rsi.yaml\n
       stonks leaps-backtest stocks --all-strategies --option-type put\n
       stonks leaps-backtest NVDA --all-strategies --interval 1wk\n
-      stonks leaps-backtest etfs --all-strategies --option-type auto
+      stonks leaps-backtest etfs --all-strategies --option-type auto\n
+      stonks leaps-backtest NVDA --strategy rsi.yaml --vol-model garch\n
+      stonks leaps-backtest NVDA --strategy rsi.yaml --sweep --sweep-stops 0.3,0.5
     """
     from stonkslib.backtest.leaps import run_leaps_backtest
 
@@ -123,6 +168,11 @@ def leaps_backtest(target, strategy, all_strategies, every_strategy, option_type
             print(f"[!] Strategy not found: {p}")
         return
 
+    if sweep:
+        _run_sweep(tickers, strategy_paths, option_type, interval, _float_list(sweep_days),
+                   _float_list(sweep_moneyness), _float_list(sweep_stops), sweep_out, vol_model)
+        return
+
     print(f"\nBacktesting {len(tickers)} ticker(s) × {len(strategy_paths)} strategy(s) "
           f"[{option_type} | {interval} | {leap_days}d LEAP]...\n")
 
@@ -141,8 +191,42 @@ def leaps_backtest(target, strategy, all_strategies, every_strategy, option_type
                 leap_days=leap_days,
                 strike_moneyness=strike_moneyness,
                 stop_loss_pct=stop_loss_pct,
+                vol_model=vol_model,
             )
             if result:
                 all_results.append(result)
 
-    _print_results(all_results)
+    from stonkslib.utils.vol_store import describe_vol
+    _print_results(all_results, describe_vol(vol_model))
+
+
+def _run_sweep(tickers, strategy_paths, option_type, interval, days, moneyness, stops, out,
+               vol_model):
+    import pandas as pd
+    from stonkslib.backtest.leaps_sweep import run_leaps_sweep, sweep_path
+
+    days = [int(d) for d in days]
+    print(f"\nSweeping {len(tickers)} ticker(s) × {len(strategy_paths)} strategy(s) × "
+          f"{len(days) * len(moneyness) * len(stops)} contract/stop combos "
+          f"[{option_type} | {interval} | {vol_model}]...\n")
+
+    tables = []
+    for path in strategy_paths:
+        for ticker in tickers:
+            resolved = _resolve_strategy_path(path, ticker, option_type)
+            with open(resolved) as f:
+                strat = yaml.safe_load(f)
+            table = run_leaps_sweep(ticker, interval, strat, option_type=option_type,
+                                    leap_days=days, strike_moneyness=moneyness,
+                                    stop_loss_pct=stops, vol_model=vol_model)
+            if table is not None:
+                tables.append(table)
+
+    if not tables:
+        print("  No results.")
+        return
+    cube = pd.concat(tables, ignore_index=True)
+    path = Path(out) if out else sweep_path(option_type, interval)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    cube.to_parquet(path, index=False)
+    _print_sweep(cube, path)
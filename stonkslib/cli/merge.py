@@ -22,16 +22,21 @@ from stonkslib.merge.by_patterns import run_merge_patterns, merge_patterns_for_t
     default=None,
     help="Limit merging to a specific interval",
 )
-def merge(target, ticker, interval):
+@click.option(
+    "--rebuild",
+    is_flag=True,
+    help="Re-merge even when the input signal files are unchanged",
+)
+def merge(target, ticker, interval, rebuild):
     """Merge signals into combined time series format."""
     if target in ("indicators", "all"):
         if ticker and interval:
-            merge_signals_for_ticker_interval(ticker, interval)
+            merge_signals_for_ticker_interval(ticker, interval, rebuild=rebuild)
         else:
-            run_merge_indicators()
+            run_merge_indicators(rebuild=rebuild)
 
     if target in ("patterns", "all"):
         if ticker and interval:
-            merge_patterns_for_ticker_interval(ticker, interval)
+            merge_patterns_for_ticker_interval(ticker, interval, rebuild=rebuild)
         else:
-            run_merge_patterns()
+            run_merge_patterns(rebuild=rebuild)
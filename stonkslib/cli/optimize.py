@@ -75,7 +75,13 @@ def _print_summary(results):
 @click.option("--warm-start", "warm_start", is_flag=True,
               help="Start from an existing optimized YAML if one exists, instead of the base strategy. "
                    "Use for a second-pass refinement with a stronger model.")
-def optimize(strategy, all_strategies, every_strategy, ticker, all_tickers, per_ticker, interval, iterations, model, use_leaps, option_type, warm_start):
+@click.option("--workers", "--jobs", "-j", "workers", type=int, default=1, show_default=True,
+              help="Backtest worker processes. >1 runs the strategy/ticker optimizations "
+                   "pipelined: backtests fan out across the pool while other jobs wait on the LLM. "
+                   "1 = sequential.")
+@click.option("--llm-workers", "llm_workers", type=int, default=2, show_default=True,
+              help="Max concurrent LLM requests when --workers > 1")
+def optimize(strategy, all_strategies, every_strategy, ticker, all_tickers, per_ticker, interval, iterations, model, use_leaps, option_type, warm_start, workers, llm_workers):
     """LLM-driven parameter optimization across strategies and tickers.
 
     Use --per-ticker to save a separate optimized YAML per ticker.
@@ -86,9 +92,10 @@ def optimize(strategy, all_strategies, every_strategy, ticker, all_tickers, per_
       stonks optimize --strategy rsi.yaml --ticker AAPL --per-ticker\n
       stonks optimize --strategy rsi.yaml --ticker NVDA --leaps --option-type call\n
       stonks optimize --all-strategies --all-tickers --per-ticker --leaps --option-type put\n
-      stonks optimize --all-strategies --all-tickers --iterations 3
+      stonks optimize --all-strategies --all-tickers --iterations 3\n
+      stonks optimize --all-strategies --all-tickers --per-ticker --workers 8
     """
-    from stonkslib.llm.optimizer import optimize as run_optimize
+    from stonkslib.llm.optimizer import optimize as run_optimize, optimize_many
     from stonkslib.backtest.strategy import load_strategy
 
     if not strategy and not all_strategies and not every_strategy:
@@ -108,44 +115,39 @@ def optimize(strategy, all_strategies, every_strategy, ticker, all_tickers, per_
             logger.error(f"[!] Strategy file not found: {p}")
         return
 
-    results = {}
+    from stonkslib.backtest.cache import backtest_cache_info
+    hits_before = backtest_cache_info()["lifetime_hits"]
 
+    mode_label = f"LEAP {option_type}" if use_leaps else "equity"
+    common = dict(interval=interval, iterations=iterations, model=model, use_leaps=use_leaps,
+                  option_type=option_type, warm_start=warm_start)
+    jobs = []   # (label, header, optimize kwargs), in the order the summary lists them
     for path in strategy_paths:
         name = load_strategy(path).get("name", path.stem)
-
-        mode_label = f"LEAP {option_type}" if use_leaps else "equity"
-
         if per_ticker:
             for t in tickers:
-                print(f"\n{'─'*50}")
-                print(f"Strategy: {name}  |  Ticker: {t}  |  {mode_label}  |  Iterations: {iterations}")
-                print(f"{'─'*50}")
-                result = run_optimize(
-                    strategy_path=path,
-                    tickers=[t],
-                    interval=interval,
-                    iterations=iterations,
-                    model=model,
-                    output_ticker=t,
-                    use_leaps=use_leaps,
-                    option_type=option_type,
-                    warm_start=warm_start,
-                )
-                results[f"{name} / {t}"] = result or {}
+                jobs.append((f"{name} / {t}",
+                             f"Strategy: {name}  |  Ticker: {t}  |  {mode_label}  |  Iterations: {iterations}",
+                             dict(strategy_path=path, tickers=[t], output_ticker=t, **common)))
         else:
+            jobs.append((name,
+                         f"Strategy: {name}  |  Tickers: {tickers}  |  {mode_label}  |  Iterations: {iterations}",
+                         dict(strategy_path=path, tickers=tickers, **common)))
+
+    if workers > 1 and jobs:
+        print(f"[*] {len(jobs)} optimizations on {workers} backtest workers, "
+              f"{llm_workers} concurrent LLM requests")
+        results = optimize_many([(label, kwargs) for label, _, kwargs in jobs],
+                                workers=workers, llm_workers=llm_workers)
+    else:
+        results = {}
+        for label, header, kwargs in jobs:
             print(f"\n{'─'*50}")
-            print(f"Strategy: {name}  |  Tickers: {tickers}  |  {mode_label}  |  Iterations: {iterations}")
+            print(header)
             print(f"{'─'*50}")
-            result = run_optimize(
-                strategy_path=path,
-                tickers=tickers,
-                interval=interval,
-                iterations=iterations,
-                model=model,
-                use_leaps=use_leaps,
-                option_type=option_type,
-                warm_start=warm_start,
-            )
-            results[name] = result or {}
+            results[label] = run_optimize(**kwargs) or {}
 
     _print_summary(results)
+    reused = backtest_cache_info()["lifetime_hits"] - hits_before
+    if reused:
+        print(f"[cache] {reused} backtest(s) reused a stored result instead of re-simulating")
@@ -1,3 +1,6 @@
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+
 import click
 import yaml
 from pathlib import Path
@@ -21,40 +24,47 @@ def _resolve_tickers(target):
     return [target.upper()]
 
 
-def run_pipeline(ticker, interval, force=False, analyze=True):
-    """Run fetch → clean for a single ticker/interval.
+def _config():
+    with open(PROJECT_ROOT / "config.yaml") as f:
+        return yaml.safe_load(f)
 
-    When analyze=True (default) also runs indicator/pattern analysis, signal merge,
-    and the earnings fetch. analyze=False stops at the cleaned parquet — fast, for
-    just getting price data in; the scheduled pipeline (or the Pipeline page) fills
-    in analysis later. Only the Confluence page depends on the analysis output.
-    """
-    import yaml as _yaml
-    import os
-    from pathlib import Path as _Path
 
-    _root = _Path(__file__).resolve().parents[2]
-    with open(_root / "config.yaml") as f:
-        cfg = _yaml.safe_load(f)
+def _fetch(tickers, interval, force=False, throttle=None, downloader=None):
+    """Fetch stage: one (batched) fetch_all call for `tickers`. Returns {ticker: ok}.
 
+    If the batch call raises, each ticker is retried on its own, so one bad symbol
+    only fails itself.
+    """
     from stonkslib.fetch.td import fetch_all
-    from stonkslib.clean.td import clean_td
-    from stonkslib.analysis.signals import aggregate_and_save
-    from stonkslib.merge.by_indicators import merge_signals_for_ticker_interval
-    from stonkslib.merge.by_patterns import merge_patterns_for_ticker_interval
 
-    ticker_yaml = _root / cfg["project"]["ticker_yaml"]
-    data_dir = _root / cfg["project"]["ticker_data_dir"]
+    cfg = _config()
+    ticker_yaml = PROJECT_ROOT / cfg["project"]["ticker_yaml"]
+    data_dir = PROJECT_ROOT / cfg["project"]["ticker_data_dir"]
 
     try:
         # Only fetch the interval we're about to clean/analyze — fetching all 8 intervals
         # per ticker (the fetch_all default) is what triggers Yahoo rate limits on big runs.
         fetch_all(yaml_file=ticker_yaml, data_dir=data_dir, force=force,
-                  tickers=[ticker], only_intervals=[interval])
-        logger.info(f"[✓] Fetched {ticker} ({interval})")
+                  tickers=list(tickers), only_intervals=[interval], throttle=throttle,
+                  downloader=downloader)
     except Exception as e:
-        logger.error(f"[!] Fetch {ticker}: {e}")
-        return False
+        if len(tickers) == 1:
+            logger.error(f"[!] Fetch {tickers[0]}: {e}")
+            return {tickers[0]: False}
+        logger.warning(f"[!] Batch fetch {', '.join(tickers)}: {e} — retrying per ticker")
+        out = {}
+        for t in tickers:
+            out.update(_fetch([t], interval, force, throttle, downloader))
+        return out
+    for t in tickers:
+        logger.info(f"[✓] Fetched {t} ({interval})")
+    return {t: True for t in tickers}
+
+
+def _process(ticker, interval, force=False, analyze=True, rebuild=False):
+    """Clean/analyze stage for one fetched ticker (CPU-bound; runs in a worker process
+    under --workers). Analyze/merge skip unchanged inputs unless rebuild=True."""
+    from stonkslib.clean.td import clean_td
 
     try:
         clean_td(ticker, interval, force=force)
@@ -62,14 +72,25 @@ def run_pipeline(ticker, interval, force=False, analyze=True):
     except Exception as e:
         logger.error(f"[!] Clean {ticker} ({interval}): {e}")
 
+    try:
+        from stonkslib.utils.vol_store import build_vol_store
+        if build_vol_store(ticker, interval):
+            logger.info(f"[✓] Vol store {ticker} ({interval})")
+    except Exception as e:
+        logger.error(f"[!] Vol store {ticker} ({interval}): {e}")
+
     if not analyze:
         logger.info(f"[✓] {ticker} ({interval}) — stopped at parquet (--no-analyze)")
         return True
 
     try:
-        aggregate_and_save(ticker, interval)
-        merge_signals_for_ticker_interval(ticker, interval)
-        merge_patterns_for_ticker_interval(ticker, interval)
+        from stonkslib.analysis.signals import aggregate_and_save
+        from stonkslib.merge.by_indicators import merge_signals_for_ticker_interval
+        from stonkslib.merge.by_patterns import merge_patterns_for_ticker_interval
+
+        aggregate_and_save(ticker, interval, rebuild=rebuild)
+        merge_signals_for_ticker_interval(ticker, interval, rebuild=rebuild)
+        merge_patterns_for_ticker_interval(ticker, interval, rebuild=rebuild)
         logger.info(f"[✓] Analyzed {ticker} ({interval})")
     except Exception as e:
         logger.error(f"[!] Analyze {ticker} ({interval}): {e}")
@@ -86,6 +107,76 @@ def run_pipeline(ticker, interval, force=False, analyze=True):
     return True
 
 
+def run_pipeline(ticker, interval, force=False, analyze=True, rebuild=False, downloader=None):
+    """Run fetch → clean for a single ticker/interval.
+
+    When analyze=True (default) also runs indicator/pattern analysis, signal merge,
+    and the earnings fetch. analyze=False stops at the cleaned parquet — fast, for
+    just getting price data in; the scheduled pipeline (or the Pipeline page) fills
+    in analysis later. Only the Confluence page depends on the analysis output.
+    Analysis and merges are skipped when their inputs are unchanged since the last
+    run; rebuild=True recomputes them regardless. `downloader` replaces yf.download
+    (tests).
+    """
+    if not _fetch([ticker], interval, force=force, downloader=downloader)[ticker]:
+        return False
+    return _process(ticker, interval, force=force, analyze=analyze, rebuild=rebuild)
+
+
+# Tickers per fetch-stage task: big enough to batch Yahoo requests, small enough that
+# the process pool gets work while later batches are still downloading.
+FETCH_BATCH = 8
+
+
+def run_pipeline_concurrent(tickers, interval, force=False, analyze=True, workers=4,
+                            fetch_workers=2, batch_size=FETCH_BATCH, rebuild=False,
+                            downloader=None, pool=None):
+    """Staged pipeline: I/O thread pool for fetches feeding a process pool for clean/analyze.
+
+    Fetch batches go to `fetch_workers` threads sharing one adaptive TokenBucket; as each
+    batch lands, its tickers are handed to `workers` processes, so downloads overlap
+    cleaning and analysis instead of alternating with them. Failures stay per ticker:
+    a failed fetch skips only that ticker's processing (see _fetch), and a crashed
+    worker only fails its own ticker.
+
+    Args:
+        downloader: yf.download stand-in, passed through to fetch_all (tests)
+        pool: existing executor for clean/analyze (default: a spawn process pool of
+            `workers`)
+
+    Returns:
+        The number of tickers completed.
+    """
+    from stonkslib.fetch.throttle import TokenBucket
+
+    bucket = TokenBucket(rate=2.0, capacity=2.0)
+    batches = [tickers[i:i + batch_size] for i in range(0, len(tickers), batch_size)]
+    ok = 0
+    own_pool = pool is None
+    if own_pool:
+        # spawn, not fork: forking while fetch threads hold locks can deadlock the child.
+        pool = ProcessPoolExecutor(max_workers=workers,
+                                   mp_context=multiprocessing.get_context("spawn"))
+    try:
+        with ThreadPoolExecutor(max_workers=fetch_workers) as io:
+            fetched = [io.submit(_fetch, batch, interval, force, bucket, downloader)
+                       for batch in batches]
+            work = {}
+            for fut in as_completed(fetched):
+                for t, good in fut.result().items():
+                    if good:
+                        work[pool.submit(_process, t, interval, force, analyze, rebuild)] = t
+            for fut in as_completed(work):
+                try:
+                    ok += bool(fut.result())
+                except Exception as e:
+                    logger.error(f"[!] Pipeline {work[fut]} ({interval}): {e}")
+    finally:
+        if own_pool:
+            pool.shutdown()
+    return ok
+
+
 @click.command()
 @click.argument("target", required=False, default=None,
                 metavar="[TICKER|CATEGORY|all]")
@@ -95,7 +186,12 @@ def run_pipeline(ticker, interval, force=False, analyze=True):
               help="Stop after the cleaned parquet — skip indicator/pattern analysis, "
                    "merge, and earnings (fast). The scheduled pipeline / Pipeline page fills "
                    "analysis in later; only the Confluence page needs it.")
-def pipeline(target, interval, force, no_analyze):
+@click.option("--workers", "--jobs", "-j", "workers", type=int, default=1, show_default=True,
+              help="Run as a staged pipeline: batched fetches on an I/O thread pool feed "
+                   "N clean/analyze worker processes. 1 = sequential, per ticker.")
+@click.option("--rebuild", is_flag=True,
+              help="Recompute analysis and merges even when their inputs are unchanged")
+def pipeline(target, interval, force, no_analyze, workers, rebuild):
     """Run the pipeline: fetch → clean → analyze (use --no-analyze to stop at the parquet).
 
     TARGET can be a ticker (AAPL), a category (stocks/etfs/crypto), or 'all'.\n
@@ -104,7 +200,8 @@ def pipeline(target, interval, force, no_analyze):
       stonks pipeline AAPL\n
       stonks pipeline AMD --no-analyze        # just fetch + clean (fast)\n
       stonks pipeline crypto --interval 1wk\n
-      stonks pipeline all --interval 1d --force
+      stonks pipeline all --interval 1d --force\n
+      stonks pipeline all --workers 4
     """
     if not target:
         target = "all"
@@ -116,9 +213,22 @@ def pipeline(target, interval, force, no_analyze):
 
     mode = "fetch+clean only" if no_analyze else "full"
     print(f"[→] Pipeline ({mode}): {len(tickers)} ticker(s), interval={interval}")
-    ok = 0
-    for t in tickers:
-        if run_pipeline(t, interval, force=force, analyze=not no_analyze):
-            ok += 1
+    if workers > 1:
+        ok = run_pipeline_concurrent(tickers, interval, force=force, analyze=not no_analyze,
+                                     workers=workers, fetch_workers=min(2, workers),
+                                     rebuild=rebuild)
+    else:
+        ok = 0
+        for t in tickers:
+            if run_pipeline(t, interval, force=force, analyze=not no_analyze, rebuild=rebuild):
+                ok += 1
+
+    # Repack the interval's consolidated Arrow store so readers see the fresh parquets.
+    try:
+        from stonkslib.utils.price_store import build_price_store
+        if build_price_store(interval):
+            logger.info(f"[✓] Price store rebuilt ({interval})")
+    except Exception as e:
+        logger.error(f"[!] Price store ({interval}): {e}")
 
     print(f"[✓] Done — {ok}/{len(tickers)} ticker(s) completed ({interval})")
@@ -60,12 +60,11 @@ def load_alert_cache() -> dict:
 
 @st.cache_resource(show_spinner=False)
 def load_ticker_data(ticker: str, interval: str) -> pd.DataFrame | None:
+    from stonkslib.utils.load_td import load_td
     path = CLEAN_DIR / ticker / f"{interval}.parquet"
     if not path.exists():
         return None
-    df = pd.read_parquet(path)
-    df.columns = df.columns.str.title()
-    return df.sort_index()
+    return load_td([ticker], interval, base_dir=CLEAN_DIR).get(ticker)
 
 
 # ── shared broker renderers ─────────────────────────────────────────────────────
@@ -12,6 +12,7 @@ from stonkslib.dash.common import (
     load_watchlist, flat_tickers, load_ticker_data,
     STRATEGY_DIR, BACKTEST_DIR, CLEAN_DIR,
 )
+from stonkslib.backtest.metrics import return_pct
 
 st.set_page_config(page_title="Backtest — Stonks", layout="wide")
 st.title("Backtest")
@@ -146,7 +147,7 @@ def _metrics_row(m, label):
     return {
         "Exit mode":    label,
         "Net P&L":      f"${pnl:,.2f}",
-        "Return":       f"{pnl/invested*100:+.1f}%" if invested else "—",
+        "Return":       f"{return_pct(m):+.1f}%" if invested else "—",
         "Win rate":     f"{m.get('win_rate', 0):.1%}",
         "Trades":       m.get("trades", 0),
         "Max drawdown": f"{m.get('max_drawdown', 0):.1%}",
@@ -165,8 +166,7 @@ def _equity_chart(ind_m, ts_m, strat_name, bh_m=None, dca_m=None):
         (bh_m,  "#9e9e9e", "Buy & Hold",                  "dot"),
     ]:
         if m and m.get("equity_curve"):
-            eq = pd.DataFrame(m["equity_curve"])
-            eq["date"] = pd.to_datetime(eq["date"])
+            eq = m["equity_curve"].to_frame()
             fig.add_trace(go.Scatter(
                 x=eq["date"], y=eq["value"],
                 mode="lines", name=name,
@@ -246,13 +246,11 @@ def _show_comparison(all_results, bh_m=None):
     medals = ["🥇", "🥈", "🥉"]
     cols = st.columns(min(3, len(scored)))
     for col, (name, mode, m, score), medal in zip(cols, scored[:3], medals):
-        invested = m.get("total_invested", m.get("start_cash", 10000))
-        pnl      = m.get("net_pnl", 0)
         with col:
             st.metric(
                 label=f"{medal} {name}",
                 value=f"{score:.0f} / 100",
-                delta=f"{pnl/invested*100:+.1f}% return · {m.get('win_rate',0):.0%} win rate",
+                delta=f"{return_pct(m):+.1f}% return · {m.get('win_rate',0):.0%} win rate",
             )
             _ts = m.get("timing_score")
             _ts_txt = f" · Timing: {_ts:.0f}/100" if _ts is not None else ""
@@ -272,7 +270,11 @@ def _show_comparison(all_results, bh_m=None):
             "Exit":         mode,
             "Score":        int(score),
             "Net P&L":      round(pnl, 2),
-            "Return %":     round(pnl / invested * 100, 2) if invested else 0.0,
+            "Return %":     round(return_pct(m), 2),
+            "CAGR %":       round(m.get("cagr", 0) * 100, 2),
+            "Sharpe":       m.get("sharpe"),
+            "Sortino":      m.get("sortino"),
+            "Exposure %":   round(m.get("exposure", 0) * 100, 1),
             "Win rate":     round(m.get("win_rate", 0) * 100, 1),
             "Timing":       m.get("timing_score"),
             "Trades":       m.get("trades", 0),
@@ -289,7 +291,11 @@ def _show_comparison(all_results, bh_m=None):
             "Exit":         "Hold forever",
             "Score":        None,
             "Net P&L":      round(pnl, 2),
-            "Return %":     round(pnl / invested * 100, 2) if invested else 0.0,
+            "Return %":     round(return_pct(bh_m), 2),
+            "CAGR %":       round(bh_m.get("cagr", 0) * 100, 2),
+            "Sharpe":       bh_m.get("sharpe"),
+            "Sortino":      bh_m.get("sortino"),
+            "Exposure %":   round(bh_m.get("exposure", 0) * 100, 1),
             "Win rate":     None,
             "Timing":       None,
             "Trades":       bh_m.get("trades", 1),
@@ -300,6 +306,10 @@ def _show_comparison(all_results, bh_m=None):
     col_cfg = {
         "Net P&L":    st.column_config.NumberColumn("Net P&L",    format="$%.2f"),
         "Return %":   st.column_config.NumberColumn("Return %",   format="%.2f%%"),
+        "CAGR %":     st.column_config.NumberColumn("CAGR %",     format="%.2f%%"),
+        "Sharpe":     st.column_config.NumberColumn("Sharpe",     format="%.2f", help="Annualised mean / std of bar returns (risk-free 0)"),
+        "Sortino":    st.column_config.NumberColumn("Sortino",    format="%.2f", help="Like Sharpe, but only downside moves count as risk"),
+        "Exposure %": st.column_config.NumberColumn("Exposure %", format="%.1f%%", help="Share of bars with a position open"),
         "Win rate":   st.column_config.NumberColumn("Win rate",   format="%.1f%%"),
         "Timing":     st.column_config.NumberColumn("Timing", format="%.0f", help="0–100: how close entries sat to local lows and exits to local highs (higher = better-timed)"),
         "Max DD %":   st.column_config.NumberColumn("Max DD %",   format="%.2f%%"),
@@ -4,8 +4,10 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
 
 import streamlit as st
 import pandas as pd
+import plotly.graph_objects as go
 
 from stonkslib.dash.common import load_watchlist, flat_tickers, BACKTEST_DIR
+from stonkslib.backtest.equity import load_equity_curve
 
 st.set_page_config(page_title="Trades — Stonks", layout="wide")
 st.title("Trades")
@@ -81,6 +83,16 @@ c3.metric("Wins",         wins)
 c4.metric("Losses",       losses)
 c5.metric("Total P&L",    f"${total_pnl:,.2f}", delta_color="normal")
 
+# The saved run's equity curve lives in a parquet sidecar; only the selected one is read.
+curve = load_equity_curve(result_dir / f"{strategy_map[strategy].stem}_metrics.json")
+if curve is not None and len(curve):
+    eq = curve.to_frame()
+    fig = go.Figure(go.Scatter(x=eq["date"], y=eq["value"], mode="lines", name="Equity",
+                               line=dict(width=1.5, color="#42a5f5")))
+    fig.update_layout(title="Equity curve", height=260, margin=dict(l=0, r=0, t=30, b=0),
+                      xaxis_rangeslider_visible=False)
+    st.plotly_chart(fig, use_container_width=True)
+
 st.divider()
 
 # Format for display
@@ -0,0 +1,193 @@
+"""On-disk options-chain cache for the LEAP scanner.
+
+`stonks leaps` needs, per ticker, the list of expirations and one option chain, plus
+a year of VIX closes for the whole scan. All of it is kept under data/options_data:
+
+    data/options_data/chains/{TICKER}/expirations.json
+    data/options_data/chains/{TICKER}/{expiry}_{fetch date}.parquet   (calls + puts)
+    data/options_data/chains/vix.parquet
+
+An entry is fresh while its file is younger than the TTL (STONKS_CHAIN_TTL_HOURS,
+default 6; STONKS_VIX_TTL_HOURS, default 12), so repeated scans in a session hit
+disk only. A stale entry is refetched and written under today's date; the write
+then drops that expiry's older snapshots, and any for expiries already past, so a
+ticker keeps at most one file per live expiry. If the refetch fails, the stale
+copy is served with a warning. Network calls go through one TokenBucket, so a
+scanner can fan the per-ticker lookups out over a thread pool without tripping
+Yahoo's rate limit.
+
+The network side is a small source object (YahooChains by default); pass any object
+with the same three methods as `source=` to run against a local stand-in.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+import yfinance as yf
+
+from stonkslib.fetch.throttle import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+CHAIN_DIR = PROJECT_ROOT / "data" / "options_data" / "chains"
+CHAIN_TTL_HOURS = float(os.getenv("STONKS_CHAIN_TTL_HOURS", "6"))
+VIX_TTL_HOURS = float(os.getenv("STONKS_VIX_TTL_HOURS", "12"))
+CHAIN_WORKERS = 4
+
+
+class YahooChains:
+    """Default chain source: yfinance."""
+
+    def expirations(self, ticker: str) -> list[str]:
+        return list(yf.Ticker(ticker).options)
+
+    def chain(self, ticker: str, expiry: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+        chain = yf.Ticker(ticker).option_chain(expiry)
+        return chain.calls, chain.puts
+
+    def vix(self) -> pd.Series:
+        df = yf.download("^VIX", period="1y", interval="1d", progress=False)
+        return df["Close"].dropna().squeeze() if not df.empty else pd.Series(dtype=float)
+
+
+def _write_atomic(path: Path, write):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    write(tmp)
+    os.replace(tmp, path)
+
+
+class ChainCache:
+    """TTL'd disk cache in front of a chain source. Thread-safe.
+
+    Args:
+        root: cache directory (default data/options_data/chains)
+        ttl_hours: age after which expirations and chains are refetched
+        vix_ttl_hours: same for the VIX series
+        source: object with expirations(ticker), chain(ticker, expiry) -> (calls, puts)
+            and vix() -> Series (default YahooChains)
+        throttle: TokenBucket shared by all network calls (default 2 req/s, adaptive)
+    """
+
+    def __init__(self, root: Path = CHAIN_DIR, ttl_hours: float = CHAIN_TTL_HOURS,
+                 vix_ttl_hours: float = VIX_TTL_HOURS, source=None, throttle=None):
+        self.root = Path(root)
+        self.ttl = ttl_hours * 3600
+        self.vix_ttl = vix_ttl_hours * 3600
+        self.source = source or YahooChains()
+        self.throttle = throttle or TokenBucket(rate=2.0, capacity=2.0)
+        self.stats = {"hits": 0, "fetches": 0, "stale": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _fresh(self, path: Path | None, ttl: float) -> bool:
+        try:
+            return path is not None and time.time() - path.stat().st_mtime < ttl
+        except FileNotFoundError:
+            return False
+
+    def _call(self, fn, *args):
+        self.throttle.acquire()
+        try:
+            out = fn(*args)
+        except Exception:
+            self.throttle.backoff()
+            raise
+        self.throttle.recover()
+        self._count("fetches")
+        return out
+
+    def _cached(self, path, ttl, fetch, read, write, what):
+        """Serve `path` if fresh, else fetch + write; fall back to a stale copy on error."""
+        if self._fresh(path, ttl):
+            self._count("hits")
+            return read(path)
+        try:
+            value = self._call(fetch)
+        except Exception as e:
+            if path is not None and path.exists():
+                logger.warning(f"[!] {what} refetch failed, using cached copy: {e}")
+                self._count("stale")
+                return read(path)
+            raise
+        write(value)
+        return value
+
+    def expirations(self, ticker: str) -> list[str]:
+        """Listed expiry dates (YYYY-MM-DD) for a ticker — empty if it has no options."""
+        path = self.root / ticker / "expirations.json"
+
+        def write(exps):
+            _write_atomic(path, lambda p: p.write_text(json.dumps(exps)))
+
+        return self._cached(path, self.ttl, lambda: list(self.source.expirations(ticker)),
+                            lambda p: json.loads(p.read_text()), write,
+                            f"{ticker} expirations")
+
+    def _snapshot(self, ticker: str, expiry: str) -> Path | None:
+        snaps = sorted((self.root / ticker).glob(f"{expiry}_*.parquet"))
+        return snaps[-1] if snaps else None
+
+    def _prune(self, ticker: str, expiry: str, keep: Path):
+        """Drop `expiry`'s snapshots other than `keep`, and those of expired contracts."""
+        today = date.today().isoformat()
+        for snap in (self.root / ticker).glob("*_*.parquet"):
+            snap_expiry = snap.name.split("_", 1)[0]
+            if snap != keep and (snap_expiry == expiry or snap_expiry < today):
+                snap.unlink(missing_ok=True)
+
+    def chain(self, ticker: str, expiry: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """(calls, puts) for one expiry, from the newest snapshot if it is fresh."""
+
+        def read(p):
+            df = pd.read_parquet(p)
+            calls, puts = (df[df["side"] == side].drop(columns="side").reset_index(drop=True)
+                           for side in ("calls", "puts"))
+            return calls, puts
+
+        def write(value):
+            calls, puts = value
+            df = pd.concat([calls.assign(side="calls"), puts.assign(side="puts")],
+                           ignore_index=True)
+            out = self.root / ticker / f"{expiry}_{date.today().isoformat()}.parquet"
+            _write_atomic(out, lambda p: df.to_parquet(p, index=False))
+            self._prune(ticker, expiry, out)
+
+        return self._cached(self._snapshot(ticker, expiry), self.ttl,
+                            lambda: self.source.chain(ticker, expiry), read, write,
+                            f"{ticker} {expiry} chain")
+
+    def vix(self) -> pd.Series:
+        """The past year of daily VIX closes."""
+        path = self.root / "vix.parquet"
+
+        def write(close):
+            if len(close):
+                frame = close.rename("Close").to_frame()
+                _write_atomic(path, lambda p: frame.to_parquet(p))
+
+        return self._cached(path, self.vix_ttl, self.source.vix,
+                            lambda p: pd.read_parquet(p)["Close"], write, "VIX")
+
+
+_DEFAULT: ChainCache | None = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def default_cache() -> ChainCache:
+    """Process-wide ChainCache on data/options_data/chains (one shared throttle)."""
+    global _DEFAULT
+    with _DEFAULT_LOCK:
+        if _DEFAULT is None:
+            _DEFAULT = ChainCache()
+        return _DEFAULT
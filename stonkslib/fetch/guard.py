@@ -1,26 +1,114 @@
 # stonkslib/fetch/guard.py
 
+import json
 from pathlib import Path
 from datetime import datetime, timedelta
 import pandas as pd
 import warnings
 
+# Raw CSVs can be years of bars; everything here avoids parsing them in full.
+# A small sidecar (`{interval}.csv.idx.json`) records the last timestamp, row count,
+# header layout and the CSV's byte size when it was written — if the size no longer
+# matches, the CSV was rewritten behind our back and the sidecar is ignored.
+_TAIL_BYTES = 4096
+
+
+def index_path(csv_path: Path) -> Path:
+    return csv_path.with_name(csv_path.name + ".idx.json")
+
+
+def _parse_ts(field: str):
+    field = field.strip().strip('"')
+    if not field:
+        return None
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        ts = pd.to_datetime(field, errors="coerce", utc=True)
+    return None if pd.isna(ts) else ts
+
+
+def read_index(csv_path: Path) -> dict | None:
+    """Return the CSV's sidecar index if it is present and still matches the file."""
+    idx = index_path(csv_path)
+    try:
+        meta = json.loads(idx.read_text())
+        if meta.get("size") != csv_path.stat().st_size:
+            return None
+        meta["last"] = pd.Timestamp(meta["last"]) if meta.get("last") else None
+        return meta
+    except (FileNotFoundError, ValueError, KeyError, TypeError):
+        return None
+
+
+def write_index(csv_path: Path, last, rows: int, columns: list[str], header_lines: int) -> dict:
+    meta = {
+        "last": str(last) if last is not None else None,
+        "rows": int(rows),
+        "columns": list(columns),
+        "header_lines": int(header_lines),
+        "size": csv_path.stat().st_size,
+    }
+    index_path(csv_path).write_text(json.dumps(meta))
+    meta["last"] = pd.Timestamp(meta["last"]) if meta["last"] else None
+    return meta
+
+
+def scan_csv(csv_path: Path) -> dict | None:
+    """Build index info for a CSV without parsing it: header from the first lines,
+    last timestamp from the last line (seek to the tail), rows by counting newlines."""
+    try:
+        with open(csv_path, "rb") as f:
+            head = [f.readline().decode("utf-8", "replace") for _ in range(4)]
+            header_lines = 0
+            for line in head:
+                if not line or _parse_ts(line.split(",", 1)[0]) is not None:
+                    break
+                header_lines += 1
+            columns = [c.strip() for c in head[0].rstrip("\r\n").split(",")[1:]] if head[0] else []
+
+            f.seek(0, 2)
+            size = f.tell()
+            f.seek(max(0, size - _TAIL_BYTES))
+            tail = [ln for ln in f.read().decode("utf-8", "replace").splitlines() if ln.strip()]
+
+            f.seek(0)
+            lines = 0
+            last_byte = b"\n"
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                lines += chunk.count(b"\n")
+                last_byte = chunk[-1:]
+            if last_byte != b"\n":
+                lines += 1
+    except FileNotFoundError:
+        return None
+
+    last = _parse_ts(tail[-1].split(",", 1)[0]) if tail else None
+    return {"last": last, "rows": max(0, lines - header_lines), "columns": columns,
+            "header_lines": header_lines}
+
+
+def last_timestamp(file_path: Path):
+    """Last row's timestamp — from the sidecar when valid, else from the file's tail."""
+    meta = read_index(file_path)
+    if meta is not None:
+        return meta["last"]
+    with open(file_path, "rb") as f:
+        f.seek(0, 2)
+        f.seek(max(0, f.tell() - _TAIL_BYTES))
+        tail = [ln for ln in f.read().decode("utf-8", "replace").splitlines() if ln.strip()]
+    return _parse_ts(tail[-1].split(",", 1)[0]) if tail else None
+
+
 def needs_update(file_path: Path, interval: str) -> bool:
     """Return True if the file is missing or outdated."""
     if not file_path.exists():
         return True
 
     try:
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore", UserWarning)
-            df = pd.read_csv(file_path, index_col=0, parse_dates=True)
-            df.index = pd.to_datetime(df.index, errors='coerce', utc=True)
-
-        if df.empty:
+        last_time = last_timestamp(file_path)
+        if last_time is None:
             return True
 
-        last_time = df.index[-1]
-
         now = datetime.utcnow().replace(tzinfo=last_time.tzinfo)
 
         delta = {
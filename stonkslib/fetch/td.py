@@ -1,16 +1,17 @@
 import os
 import sys
+import threading
 import yaml
 import pandas as pd
 import yfinance as yf
 from pathlib import Path
 import warnings
-import time
 
 # Fix import path for guard.py and ranges.py
 sys.path.append(str(Path(__file__).resolve().parent))
-from guard import needs_update
+from guard import needs_update, read_index, write_index, scan_csv
 from ranges import CATEGORY_INTERVALS
+from throttle import TokenBucket
 from stonkslib.utils.logging import setup_logging
 
 # Suppress warnings
@@ -44,15 +45,194 @@ LOG_DIR = PROJECT_ROOT / config["project"]["log_dir"]
 # Re-setup logging
 logger = setup_logging(LOG_DIR, "fetch.log")
 
+# yfinance `period` strings → how far back an incremental `start=` may reach.
+_PERIOD_UNITS = {"d": "D", "wk": "W", "mo": "D", "y": "D"}
+
+# Tickers per multi-symbol yf.download call.
+BATCH_SIZE = 25
+
+
+def _period_span(period: str) -> pd.Timedelta | None:
+    num = "".join(ch for ch in period if ch.isdigit())
+    unit = period[len(num):]
+    if not num or unit not in _PERIOD_UNITS:
+        return None
+    n = int(num)
+    if unit == "y":
+        return pd.Timedelta(days=365 * n)
+    if unit == "mo":
+        return pd.Timedelta(days=30 * n)
+    return pd.Timedelta(n, unit=_PERIOD_UNITS[unit])
+
+
+def _single_layout(df: pd.DataFrame, ticker: str) -> pd.DataFrame:
+    """Shape one ticker's slice like a single-ticker yf.download: (Price, Ticker) columns
+    in yfinance's order, UTC `Date` index — so the raw CSV layout doesn't depend on
+    whether it came from a batch."""
+    df = df[sorted(df.columns)].copy()
+    df.columns = pd.MultiIndex.from_product([df.columns, [ticker]], names=["Price", "Ticker"])
+    df.index = pd.to_datetime(df.index, utc=True)
+    df.index.name = "Date"
+    return df
+
+
+def split_download(raw: pd.DataFrame, tickers: list[str]) -> dict[str, pd.DataFrame]:
+    """Split a (possibly multi-symbol) yf.download frame into per-ticker frames.
+
+    Handles both column layouts yfinance produces — (Ticker, Price) with
+    group_by="ticker" and (Price, Ticker) otherwise — and drops the all-NaN rows a
+    ticker gets for bars that only other symbols in the batch traded.
+    """
+    out = {}
+    if raw is None or raw.empty:
+        return out
+    cols = raw.columns
+    if isinstance(cols, pd.MultiIndex):
+        wanted = set(tickers)
+        level = next((i for i in range(cols.nlevels) if wanted & set(cols.get_level_values(i))), None)
+        if level is None:
+            return out
+        present = set(cols.get_level_values(level))
+        for ticker in tickers:
+            if ticker in present:
+                sub = raw.xs(ticker, axis=1, level=level).dropna(how="all")
+                if not sub.empty:
+                    out[ticker] = _single_layout(sub, ticker)
+    elif len(tickers) == 1:
+        sub = raw.dropna(how="all")
+        if not sub.empty:
+            out[tickers[0]] = _single_layout(sub, tickers[0])
+    return out
+
+
+# yf.download collects results in module globals (yfinance.shared), so concurrent calls
+# from fetch worker threads would clobber each other — requests go out one at a time.
+_DOWNLOAD_LOCK = threading.Lock()
+
+
+def _download(download, bucket, tickers, interval_str, **kwargs) -> dict[str, pd.DataFrame] | None:
+    """One throttled multi-symbol request; returns per-ticker frames (missing = no data),
+    or None if the request itself failed."""
+    bucket.acquire()
+    try:
+        with _DOWNLOAD_LOCK:
+            raw = download(list(tickers), interval=interval_str, group_by="ticker",
+                           progress=False, **kwargs)
+    except Exception as e:
+        bucket.backoff()
+        logger.error(f"[!] Error fetching {', '.join(tickers)} ({interval_str}): {e}")
+        return None
+    frames = split_download(raw, tickers)
+    if frames:
+        bucket.recover()
+    elif "period" in kwargs:
+        # A full-period batch that comes back completely empty is how Yahoo throttling
+        # usually looks. An empty tail request just means every ticker is current.
+        bucket.backoff()
+    return frames
+
+
+def _chunks(items, size):
+    size = max(1, int(size))
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _tail_reachable(meta, period) -> bool:
+    span = _period_span(period)
+    last = meta.get("last")
+    return last is not None and span is not None and pd.Timestamp.now(tz="UTC") - last < span
+
+
+def _append_new(ticker, interval_str, df, csv_path, meta):
+    """Append the bars of `df` after the CSV's last timestamp, in the file's column order.
+
+    Returns True when handled (appended or already current), False when the caller
+    should fall back to a full-period download (header mismatch).
+    """
+    last = meta["last"]
+    new_rows = df[df.index > last] if df is not None else df
+    if new_rows is None or new_rows.empty:
+        logger.info(f"[⏭] Skipping {ticker} ({interval_str}) – already up-to-date")
+        return True
+
+    new_rows = new_rows.copy()
+    new_rows.columns = new_rows.columns.get_level_values(0)
+    if not meta["columns"] or not set(meta["columns"]) <= set(new_rows.columns):
+        return False
+
+    new_rows = new_rows[meta["columns"]].sort_index()
+    with open(csv_path, "rb+") as f:
+        f.seek(0, 2)
+        if f.tell():
+            f.seek(-1, 2)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+    new_rows.to_csv(csv_path, mode="a", header=False)
+    write_index(csv_path, new_rows.index[-1], meta["rows"] + len(new_rows),
+                meta["columns"], meta["header_lines"])
+    logger.info(f"[✓] Appended {len(new_rows)} rows to {ticker} → {interval_str}, latest: {new_rows.index[-1]})")
+    return True
+
+
+def _save_full(ticker, interval_str, df, csv_path, force):
+    """Write a full-period download: a new file, or merge its unseen rows into the old one."""
+    csv_path.parent.mkdir(parents=True, exist_ok=True)
+    if force or not csv_path.exists():
+        df.to_csv(csv_path)
+        info = scan_csv(csv_path)
+        write_index(csv_path, info["last"], info["rows"], info["columns"], info["header_lines"])
+        logger.info(f"[✓] Saved {ticker} → {interval_str} (new file, {len(df)} rows, latest: {df.index[-1]})")
+        return
+    existing = pd.read_csv(csv_path, index_col=0)
+    existing.index.name = "Date"
+    existing.index = pd.to_datetime(existing.index, utc=True, errors="coerce")
+    existing = existing[existing.index.notna()]
+    new_rows = df[~df.index.isin(existing.index)]
+    if new_rows.empty:
+        logger.info(f"[⏭] Skipping {ticker} ({interval_str}) – already up-to-date")
+        return
+    df = pd.concat([existing, new_rows])
+    df.sort_index(inplace=True)
+    df.to_csv(csv_path)
+    info = scan_csv(csv_path)
+    write_index(csv_path, info["last"], info["rows"], info["columns"], info["header_lines"])
+    logger.info(f"[✓] Appended {len(new_rows)} rows to {ticker} → {interval_str}, latest: {df.index[-1]})")
+
+
+def _index_for(csv_path):
+    """Sidecar index for an existing raw CSV, (re)built from its tail if missing/stale."""
+    meta = read_index(csv_path)
+    if meta is None:
+        info = scan_csv(csv_path)
+        if info is None:
+            return None
+        meta = write_index(csv_path, info["last"], info["rows"], info["columns"], info["header_lines"])
+    return meta
+
+
 def fetch_all(yaml_file=TICKER_YAML, data_dir=TICKER_RAW_DIR, force=False, tickers=None,
-              category=None, only_intervals=None):
+              category=None, only_intervals=None, incremental=True, downloader=None,
+              batch_size=BATCH_SIZE, throttle=None):
     """Fetch stock data and save to ticker-centric directory structure.
 
     only_intervals: optional iterable of interval strings (e.g. ["1d", "1wk"]) to restrict
     the fetch to. Default (None) fetches every interval in CATEGORY_INTERVALS — but that's
     8 Yahoo requests per ticker, so callers that only need one interval (the pipeline) should
     pass it to avoid rate limits.
+    incremental: for existing files (and no --force), request only the bars after the
+    sidecar-indexed last timestamp and append them, instead of re-downloading the whole
+    period and rewriting the CSV. Falls back to the full download when the gap exceeds
+    the period or the file's header doesn't match.
+    downloader: callable with yf.download's signature (default yf.download) — inject a
+    local stand-in for tests.
+    batch_size: tickers per multi-symbol request. Stale tickers of one category/interval
+    are grouped (full-period downloads together, tail appends together from the oldest
+    last bar) and each batch is split back into the per-ticker raw files.
+    throttle: TokenBucket shared by all requests (default: 2 req/s, adaptive).
     """
+    download = downloader or yf.download
+    bucket = throttle or TokenBucket(rate=2.0, capacity=2.0)
     only_intervals = set(only_intervals) if only_intervals else None
     yaml_path = Path(yaml_file)
     raw_data_path = Path(data_dir)
@@ -80,56 +260,71 @@ def fetch_all(yaml_file=TICKER_YAML, data_dir=TICKER_RAW_DIR, force=False, ticke
         if only_intervals:
             intervals = [(i, p) for (i, p) in intervals if str(i) in only_intervals]
 
-        for ticker in these_tickers:
-            for interval, period in intervals:
-                interval_str = str(interval)
+        for interval, period in intervals:
+            interval_str = str(interval)
+            full, tail = [], []   # tickers needing a full-period download / a tail append
+
+            for ticker in these_tickers:
                 csv_path = raw_data_path / ticker / f"{interval_str}.csv"
 
                 if not force and not needs_update(csv_path, interval_str):
                     if csv_path.exists():
                         try:
-                            existing = pd.read_csv(csv_path, index_col=0)
-                            existing.index.name = "Date"
-                            existing.index = pd.to_datetime(existing.index, utc=True, errors="coerce")
-                            existing = existing[existing.index.notna()]
-                            latest = existing.index[-1] if not existing.empty else "n/a"
-                            logger.info(f"[⏭] Skipping {ticker} ({interval_str}) – {len(existing)} rows, latest: {latest}")
+                            meta = _index_for(csv_path)
+                            latest = meta["last"] if meta and meta["last"] is not None else "n/a"
+                            logger.info(f"[⏭] Skipping {ticker} ({interval_str}) – {meta['rows'] if meta else 0} rows, latest: {latest}")
                         except Exception as e:
                             logger.error(f"[⏭] Skipping {ticker} ({interval_str}) – error reading existing data: {e}")
                     else:
                         logger.info(f"[⏭] Skipping {ticker} ({interval_str}) – file not found but considered fresh")
                     continue
 
-                logger.info(f"[↑] Fetching {ticker} ({interval_str}, {period})...")
-                try:
-                    yf_interval = {"1h": "60m"}.get(interval_str, interval_str)
-                    df = yf.download(ticker, interval=interval_str, period=period, progress=False)
-                    if not df.empty:
-                        df.index.name = "Date"
-                        df.index = pd.to_datetime(df.index, utc=True)
-                        csv_path.parent.mkdir(parents=True, exist_ok=True)
-                        if force or not csv_path.exists():
-                            df.to_csv(csv_path)
-                            logger.info(f"[✓] Saved {ticker} → {interval_str} (new file, {len(df)} rows, latest: {df.index[-1]})")
-                        else:
-                            existing = pd.read_csv(csv_path, index_col=0)
-                            existing.index.name = "Date"
-                            existing.index = pd.to_datetime(existing.index, utc=True, errors="coerce")
-                            existing = existing[existing.index.notna()]
-                            new_rows = df[~df.index.isin(existing.index)]
-                            if new_rows.empty:
-                                logger.info(f"[⏭] Skipping {ticker} ({interval_str}) – already up-to-date")
-                                continue
-                            df = pd.concat([existing, new_rows])
-                            df.sort_index(inplace=True)
-                            df.to_csv(csv_path)
-                            logger.info(f"[✓] Appended {len(new_rows)} rows to {ticker} → {interval_str}, latest: {df.index[-1]})")
-                    else:
+                meta = None
+                if incremental and not force and csv_path.exists():
+                    try:
+                        meta = _index_for(csv_path)
+                    except Exception as e:
+                        logger.warning(f"[!] Incremental fetch unavailable for {ticker} ({interval_str}): {e}")
+                if meta is not None and _tail_reachable(meta, period):
+                    tail.append((ticker, meta))
+                else:
+                    full.append(ticker)
+
+            intraday = interval_str not in ("1d", "1wk", "1mo")
+            for chunk in _chunks(tail, batch_size):
+                start = min(meta["last"] for _, meta in chunk)
+                start = start if intraday else start.normalize()
+                names = [t for t, _ in chunk]
+                logger.info(f"[↑] Fetching {', '.join(names)} ({interval_str}) after {start}...")
+                frames = _download(download, bucket, names, interval_str, start=start.to_pydatetime())
+                if frames is None:
+                    for ticker in names:
+                        logger.error(f"[!] Fetch failed for {ticker} ({interval_str}) – existing data kept")
+                    continue
+                for ticker, meta in chunk:
+                    try:
+                        if not _append_new(ticker, interval_str, frames.get(ticker),
+                                           raw_data_path / ticker / f"{interval_str}.csv", meta):
+                            full.append(ticker)
+                    except Exception as e:
+                        logger.warning(f"[!] Incremental fetch failed for {ticker} ({interval_str}), "
+                                       f"falling back to full period: {e}")
+                        full.append(ticker)
+
+            for chunk in _chunks(full, batch_size):
+                logger.info(f"[↑] Fetching {', '.join(chunk)} ({interval_str}, {period})...")
+                frames = _download(download, bucket, chunk, interval_str, period=period)
+                if frames is None:
+                    continue
+                for ticker in chunk:
+                    df = frames.get(ticker)
+                    if df is None or df.empty:
                         logger.warning(f"[!] No data for {ticker} ({interval_str})")
-                    # Add delay to avoid hitting yfinance rate limits
-                    time.sleep(0.5)  # 0.5 seconds per request
-                except Exception as e:
-                    logger.error(f"[!] Error fetching {ticker} ({interval_str}): {e}")
+                        continue
+                    try:
+                        _save_full(ticker, interval_str, df, raw_data_path / ticker / f"{interval_str}.csv", force)
+                    except Exception as e:
+                        logger.error(f"[!] Error fetching {ticker} ({interval_str}): {e}")
 
 if __name__ == "__main__":
-    fetch_all()
\ No newline at end of file
+    fetch_all()
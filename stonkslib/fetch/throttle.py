@@ -0,0 +1,50 @@
+# stonkslib/fetch/throttle.py
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Adaptive token-bucket limiter for Yahoo requests.
+
+    `acquire()` blocks until a token is available; tokens refill at `rate` per second
+    up to `capacity` (so short bursts don't wait). The rate adapts AIMD-style:
+    `backoff()` halves it after a rate-limit/empty response and drains the bucket,
+    `recover()` adds a little back after each good response, up to `max_rate`.
+    Thread-safe, so one bucket can be shared by concurrent fetch workers.
+    """
+
+    def __init__(self, rate: float = 2.0, capacity: float = 2.0, min_rate: float = 0.1,
+                 max_rate: float | None = None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.min_rate = float(min_rate)
+        self.max_rate = float(max_rate if max_rate is not None else rate)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(capacity)
+        self._stamp = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def acquire(self):
+        with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                self._sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    def backoff(self):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = 0.0
+            self._stamp = self._clock()
+
+    def recover(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.1)
@@ -1,6 +1,138 @@
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+
 import numpy as np
 import pandas as pd
 
+from stonkslib.utils.load_td import price_column
+
+
+class _RollingMarkov:
+    """Sliding-window state/transition counts for `markov_signals`.
+
+    States are quantile bins of the window, so the bin boundaries move as the
+    window slides. Instead of re-sorting and rebuilding the whole transition
+    matrix every bar, the window is kept as a sorted list of (value, bar) pairs
+    and each slide:
+
+      1. drops the oldest transition and inserts the newest value (bisect),
+      2. recomputes the `states - 1` boundaries from the two order statistics
+         `np.quantile(method="linear")` would interpolate between,
+      3. re-bins only the values a boundary moved across, patching the (at most
+         two) transitions each of those touches,
+      4. adds the newest transition.
+
+    Boundaries are interpolated exactly as NumPy does, so states (and hence the
+    probabilities) match the full recompute.
+    """
+
+    def __init__(self, states, size):
+        self.states = states
+        self.size = size
+        levels = np.array([j / states for j in range(1, states)])
+        virtual = (size - 1) * levels
+        prev = np.floor(virtual).astype(int)
+        self._lo = prev.tolist()
+        self._hi = np.minimum(prev + 1, size - 1).tolist()
+        self._gamma = (virtual - prev).tolist()
+
+    def _boundaries(self):
+        s = self._sorted
+        out = []
+        for lo, hi, g in zip(self._lo, self._hi, self._gamma):
+            a, b = s[lo][0], s[hi][0]
+            d = b - a
+            out.append(b - d * (1 - g) if g >= 0.5 else a + d * g)
+        return out
+
+    def reset(self, values, start):
+        """Rebuild from scratch for the window `values` whose first bar is `start`."""
+        self._start = start
+        self._end = start + len(values) - 1
+        self._vals = deque(values)
+        self._sorted = sorted((v, start + k) for k, v in enumerate(values))
+        self.bounds = self._boundaries()
+        self._state = {start + k: bisect_right(self.bounds, v) for k, v in enumerate(values)}
+        self.trans = [[0] * self.states for _ in range(self.states)]
+        for t in range(start, self._end):
+            self.trans[self._state[t]][self._state[t + 1]] += 1
+
+    def slide(self, value):
+        """Advance the window one bar: drop the oldest value, append `value`."""
+        st, trans = self._state, self.trans
+
+        old_t = self._start
+        old_v = self._vals.popleft()
+        if old_t + 1 in st:
+            trans[st[old_t]][st[old_t + 1]] -= 1
+        del st[old_t]
+        del self._sorted[bisect_left(self._sorted, (old_v, old_t))]
+        self._start += 1
+
+        self._end += 1
+        new_t = self._end
+        self._vals.append(value)
+        insort(self._sorted, (value, new_t))
+
+        old_bounds, self.bounds = self.bounds, self._boundaries()
+        for ob, nb in zip(old_bounds, self.bounds):
+            if ob == nb:
+                continue
+            lo, hi = (ob, nb) if ob < nb else (nb, ob)
+            i0 = bisect_left(self._sorted, (lo, -1))
+            i1 = bisect_right(self._sorted, (hi, float("inf")))
+            for v, t in self._sorted[i0:i1]:
+                if t == new_t:
+                    continue
+                old_s, new_s = st[t], bisect_right(self.bounds, v)
+                if old_s == new_s:
+                    continue
+                if t > self._start:
+                    trans[st[t - 1]][old_s] -= 1
+                    trans[st[t - 1]][new_s] += 1
+                if t + 1 < new_t:
+                    trans[old_s][st[t + 1]] -= 1
+                    trans[new_s][st[t + 1]] += 1
+                st[t] = new_s
+
+        st[new_t] = bisect_right(self.bounds, value)
+        if new_t - 1 in st:
+            trans[st[new_t - 1]][st[new_t]] += 1
+
+    def probs(self):
+        """(current state, P(current -> top state), P(current -> bottom state))."""
+        cur = self._state[self._end]
+        row = self.trans[cur]
+        rs = sum(row) or 1
+        return cur, row[-1] / rs, row[0] / rs
+
+
+def _window_probs(window, states):
+    """Full recompute for a single window; None on a degenerate window."""
+    quantile_levels = np.array([j / states for j in range(1, states)])
+    boundaries = np.quantile(window, quantile_levels)
+    if len(np.unique(boundaries)) < len(boundaries):
+        return None
+
+    state_seq = np.digitize(window, boundaries)  # values: 0 .. states-1
+
+    trans = np.zeros((states, states))
+    for t in range(len(state_seq) - 1):
+        trans[state_seq[t], state_seq[t + 1]] += 1
+
+    row_sums = trans.sum(axis=1, keepdims=True)
+    row_sums[row_sums == 0] = 1
+    trans /= row_sums
+
+    cur = state_seq[-1]
+    return float(cur), trans[cur, states - 1], trans[cur, 0]
+
+
+def _close(df):
+    """Valid closes of `df` as float64, without copying or modifying the frame."""
+    close = price_column(df, "Close")
+    return close.dropna() if close.hasnans else close
+
 
 def markov_signals(df, states=3, lookback=60):
     """
@@ -11,51 +143,55 @@ def markov_signals(df, states=3, lookback=60):
     probability of transitioning from the current state to the most bullish state
     (bull_prob) and the most bearish state (bear_prob).
 
+    The window slides incrementally (see `_RollingMarkov`), so a full pass is
+    O(n) transition updates rather than a re-sort and matrix rebuild per bar.
+
     Returns a DataFrame aligned to df.index with columns:
         state      - current discretized state (0=most bearish, states-1=most bullish)
         bull_prob  - P(current → top state)
         bear_prob  - P(current → bottom state)
     """
-    df = df.copy()
-    df["Close"] = pd.to_numeric(df["Close"], errors="coerce")
-    df = df.dropna(subset=["Close"])
-    n = len(df)
+    close = _close(df)
+    n = len(close)
 
-    log_ret = np.log(df["Close"] / df["Close"].shift(1)).values
-    quantile_levels = np.array([j / states for j in range(1, states)])
+    log_ret = np.log(close / close.shift(1)).values
 
     state_arr = np.full(n, np.nan)
     bull_arr = np.full(n, np.nan)
     bear_arr = np.full(n, np.nan)
 
+    # Prefix counts answer "does window [i-lookback, i] contain a NaN / an inf?" in O(1).
+    nan_cs = np.concatenate(([0], np.cumsum(np.isnan(log_ret))))
+    bad_cs = np.concatenate(([0], np.cumsum(~np.isfinite(log_ret))))
+
+    engine = None
     for i in range(lookback, n):
-        window = log_ret[i - lookback : i + 1]
-        if np.isnan(window).any():
+        lo = i - lookback
+        if nan_cs[i + 1] - nan_cs[lo]:
+            engine = None
             continue
-
-        boundaries = np.quantile(window, quantile_levels)
-        if len(np.unique(boundaries)) < len(boundaries):
-            # degenerate window (all returns identical) — skip
+        if bad_cs[i + 1] - bad_cs[lo]:
+            # ±inf returns (a zero close) can't be binned incrementally — recompute.
+            engine = None
+            res = _window_probs(log_ret[lo : i + 1], states)
+            if res is not None:
+                state_arr[i], bull_arr[i], bear_arr[i] = res
             continue
 
-        state_seq = np.digitize(window, boundaries)  # values: 0 .. states-1
-
-        trans = np.zeros((states, states))
-        for t in range(len(state_seq) - 1):
-            trans[state_seq[t], state_seq[t + 1]] += 1
-
-        row_sums = trans.sum(axis=1, keepdims=True)
-        row_sums[row_sums == 0] = 1
-        trans /= row_sums
+        if engine is None:
+            engine = _RollingMarkov(states, lookback + 1)
+            engine.reset(log_ret[lo : i + 1].tolist(), lo)
+        else:
+            engine.slide(float(log_ret[i]))
 
-        cur = state_seq[-1]
-        state_arr[i] = float(cur)
-        bull_arr[i] = trans[cur, states - 1]
-        bear_arr[i] = trans[cur, 0]
+        if len(set(engine.bounds)) < len(engine.bounds):
+            # degenerate window (all returns identical) — skip
+            continue
+        state_arr[i], bull_arr[i], bear_arr[i] = engine.probs()
 
     return pd.DataFrame(
         {"state": state_arr, "bull_prob": bull_arr, "bear_prob": bear_arr},
-        index=df.index,
+        index=close.index,
     )
 
 
@@ -108,11 +244,8 @@ def markov_forecast(df, states=3, lookback=60, days_ahead=5):
         transition     list[list[float]]                 (the T matrix)
         horizons       list[{h, bull_prob, bear_prob, dist_to_stationary, confidence}]
     """
-    df = df.copy()
-    df["Close"] = pd.to_numeric(df["Close"], errors="coerce")
-    df = df.dropna(subset=["Close"])
-
-    log_ret = np.log(df["Close"] / df["Close"].shift(1)).values
+    close = _close(df)
+    log_ret = np.log(close / close.shift(1)).values
     T, cur = _transition_matrix(log_ret, states, lookback)
 
     empty = {"current_state": None, "states": states, "stationary": [],
@@ -8,8 +8,8 @@ It does NOT call an LLM — it only reads scores already written to the news sto
 data producer, never in the live signal path).
 
 The ticker is read from `df.attrs["ticker"]` (set in `utils/load_td.load_td`), since
-the engine's `build_namespace` passes only the price frame to indicator functions and
-`.copy()` preserves `.attrs`. If no ticker or no scores are available the indicator
+the engine's `build_namespace` passes only the price frame to indicator functions (as
+is — indicators never modify their input). If no ticker or no scores are available the indicator
 returns all-NaN, which the engine treats as "no signal".
 """
 
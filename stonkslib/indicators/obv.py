@@ -5,6 +5,8 @@ import pandas as pd
 import numpy as np
 import warnings
 
+from stonkslib.utils.load_td import price_column
+
 # Suppress specific date warnings
 warnings.filterwarnings("ignore", category=UserWarning, message="Could not infer format")
 
@@ -14,16 +16,17 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(me
 def obv(df):
     """
     Calculate On-Balance Volume (OBV) for a given DataFrame.
-    Returns a DataFrame with a single 'OBV' column.
+    Returns a DataFrame with a single 'OBV' column. `df` is only read, never modified.
     """
-    df = df.copy()
-    df["Close"] = pd.to_numeric(df["Close"], errors="coerce")
-    df["Volume"] = pd.to_numeric(df["Volume"], errors="coerce")
-    df = df.dropna(subset=["Close", "Volume"])
+    close = price_column(df, "Close")
+    volume = price_column(df, "Volume")
+    if close.hasnans or volume.hasnans:
+        keep = close.notna() & volume.notna()
+        close, volume = close[keep], volume[keep]
 
-    direction = np.sign(df["Close"].diff()).fillna(0)
-    obv_series = (direction * df["Volume"]).cumsum()
-    return pd.DataFrame({"OBV": obv_series}, index=df.index)
+    direction = np.sign(close.diff()).fillna(0)
+    obv_series = (direction * volume).cumsum()
+    return pd.DataFrame({"OBV": obv_series}, index=close.index)
 
 def generate_obv_signals(df):
     """
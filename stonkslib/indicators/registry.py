@@ -7,6 +7,8 @@ that `entry:` / `exit:` / confluence-vote expressions can reference.
 
 Schema of an entry:
     fn        callable(df, **kwargs) -> Series | DataFrame   (the existing indicator fn)
+                  Receives the caller's frame as is (float64 OHLCV from load_td, often
+                  read-only) and must not modify it.
     needs     list[str]   OHLCV columns the fn requires (title-cased)
     params    dict[yaml_key -> (fn_kwarg, default)]
                   Maps a strategy YAML param key to the indicator function's kwarg.
@@ -18,11 +20,29 @@ Schema of an entry:
                   from the returned DataFrame.
     vote_buy  str   default confluence BUY vote expression (reuses the same namespace)
     vote_sell str   default confluence SELL vote expression
+    cache     bool  optional, default True. False for indicators whose output depends on
+                  more than the price frame (e.g. news_sentiment reads the news store),
+                  so compute_indicator() never memoizes them.
 
 Adding a brand-new indicator = add its function under indicators/ and one entry here.
 No edits to backtest/strategy.py or alerts/signals.py required.
+
+compute_indicator() is the shared way to run one: results are memoized per (frame
+fingerprint, indicator, kwargs) in a process-wide LRU with a byte budget
+(STONKS_IND_CACHE_MB, default 256; 0 disables), plus an optional on-disk Parquet tier
+(STONKS_IND_CACHE_DIR) so separate processes — optimizer workers, the alert cron, the
+dashboard — reuse each other's results.
 """
 
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
 from stonkslib.indicators.rsi import rsi as _rsi
 from stonkslib.indicators.macd import macd as _macd
 from stonkslib.indicators.bollinger import bollinger_bands as _bollinger
@@ -104,6 +124,7 @@ INDICATORS = {
         "outputs": {"news_sent": None},
         "vote_buy": "news_sent > 6",
         "vote_sell": "news_sent < 4",
+        "cache": False,
     },
 }
 
@@ -117,3 +138,172 @@ def known_names() -> set[str]:
     for spec in INDICATORS.values():
         names.update(spec["outputs"])
     return names
+
+
+def resolve_kwargs(key: str, params: dict | None) -> dict:
+    """Map a strategy YAML `params:` block to the indicator function's kwargs (with defaults)."""
+    params = params or {}
+    return {fn_kw: params.get(yaml_key, default)
+            for yaml_key, (fn_kw, default) in INDICATORS[key]["params"].items()}
+
+
+# ── indicator result cache ─────────────────────────────────────────────────────
+# Same shape as the frame cache in utils/load_td.py: an LRU of read-only results,
+# callers get shallow copies. The fingerprint hashes the index and the columns the
+# indicator needs (plus the ticker attr), so an appended bar or a revised close is a
+# different key and a stale result is never served.
+_CACHE: OrderedDict = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+_CACHE_STATS = {"hits": 0, "disk_hits": 0, "misses": 0, "bytes": 0}
+_CACHE_BUDGET = int(float(os.getenv("STONKS_IND_CACHE_MB", "256")) * 1024 * 1024)
+_CACHE_DIR = Path(os.environ["STONKS_IND_CACHE_DIR"]) if os.getenv("STONKS_IND_CACHE_DIR") else None
+
+
+def set_result_cache_budget(mb: float):
+    """Set the in-memory result cache budget in MB (0 disables) and evict to fit."""
+    global _CACHE_BUDGET
+    with _CACHE_LOCK:
+        _CACHE_BUDGET = int(mb * 1024 * 1024)
+        _evict()
+
+
+def set_result_cache_dir(path):
+    """Enable the on-disk Parquet tier at `path` (None disables it)."""
+    global _CACHE_DIR
+    _CACHE_DIR = Path(path) if path else None
+
+
+def clear_result_cache():
+    with _CACHE_LOCK:
+        _CACHE.clear()
+        _CACHE_STATS.update(hits=0, disk_hits=0, misses=0, bytes=0)
+
+
+def result_cache_info() -> dict:
+    with _CACHE_LOCK:
+        return {**_CACHE_STATS, "entries": len(_CACHE), "budget": _CACHE_BUDGET,
+                "dir": str(_CACHE_DIR) if _CACHE_DIR else None}
+
+
+def _evict():
+    while _CACHE and _CACHE_STATS["bytes"] > _CACHE_BUDGET:
+        _, (_, size) = _CACHE.popitem(last=False)
+        _CACHE_STATS["bytes"] -= size
+
+
+def frame_fingerprint(df: pd.DataFrame, columns) -> str | None:
+    """Cheap content hash of `df`'s index and `columns` (None if they can't be hashed)."""
+    try:
+        h = hashlib.blake2b(digest_size=16)
+        idx = df.index
+        h.update(repr((len(df), str(idx.dtype), df.attrs.get("ticker"))).encode())
+        if isinstance(idx, pd.DatetimeIndex):
+            h.update(np.ascontiguousarray(idx.asi8).tobytes())
+        elif len(idx):
+            h.update(repr((idx[0], idx[-1])).encode())
+        for col in columns:
+            arr = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+            h.update(col.encode())
+            h.update(np.ascontiguousarray(arr).tobytes())
+        return h.hexdigest()
+    except Exception:
+        return None
+
+
+def _freeze(result):
+    """Copy of an indicator result whose column arrays are read-only."""
+    if isinstance(result, pd.Series):
+        arr = result.to_numpy(copy=True)
+        arr.flags.writeable = False
+        return pd.Series(arr, index=result.index, name=result.name, copy=False)
+    cols = {}
+    for col in result.columns:
+        arr = result[col].to_numpy(copy=True)
+        arr.flags.writeable = False
+        cols[col] = arr
+    return pd.DataFrame(cols, index=result.index, copy=False)
+
+
+def _nbytes(result) -> int:
+    usage = result.memory_usage(index=True, deep=True)
+    return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+
+
+def _disk_path(key: str, digest: str) -> Path:
+    return _CACHE_DIR / key / f"{digest}.parquet"
+
+
+def _disk_get(key, digest, index):
+    path = _disk_path(key, digest)
+    try:
+        frame = pd.read_parquet(path)
+    except Exception:
+        return None
+    if frame.index.equals(index):
+        frame.index = index  # keep the caller's index object (Parquet drops e.g. freq)
+    if frame.attrs.get("stonks_series"):
+        return frame.iloc[:, 0].rename(frame.attrs.get("stonks_name"))
+    return frame
+
+
+def _disk_put(key, digest, result):
+    path = _disk_path(key, digest)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(result, pd.Series):
+            frame = result.to_frame("value")
+            frame.attrs = {"stonks_series": True, "stonks_name": result.name}
+        else:
+            frame = result
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        frame.to_parquet(tmp)
+        os.replace(tmp, path)
+    except Exception:
+        pass  # the disk tier is best-effort; the in-memory result is still returned
+
+
+def compute_indicator(key: str, df: pd.DataFrame, kwargs: dict):
+    """Run INDICATORS[key]["fn"](df, **kwargs) through the result cache.
+
+    Returns a Series/DataFrame whose arrays are read-only when served from (or stored
+    in) the cache — select or derive from it, don't write into it.
+    """
+    spec = INDICATORS[key]
+    fp = frame_fingerprint(df, spec["needs"]) if spec.get("cache", True) else None
+    if fp is None or (_CACHE_BUDGET <= 0 and _CACHE_DIR is None):
+        return spec["fn"](df, **kwargs)
+
+    digest = hashlib.blake2b(repr((fp, key, sorted(kwargs.items()))).encode(),
+                             digest_size=16).hexdigest()
+    mem_key = (key, digest)
+    with _CACHE_LOCK:
+        entry = _CACHE.get(mem_key)
+        if entry is not None:
+            _CACHE.move_to_end(mem_key)
+            _CACHE_STATS["hits"] += 1
+            return entry[0].copy(deep=False)
+
+    result = _disk_get(key, digest, df.index) if _CACHE_DIR is not None else None
+    if result is not None:
+        with _CACHE_LOCK:
+            _CACHE_STATS["disk_hits"] += 1
+    else:
+        with _CACHE_LOCK:
+            _CACHE_STATS["misses"] += 1
+        result = spec["fn"](df, **kwargs)
+        if _CACHE_DIR is not None:
+            _disk_put(key, digest, result)
+
+    if _CACHE_BUDGET <= 0:
+        return result
+    frozen = _freeze(result)
+    size = _nbytes(frozen)
+    with _CACHE_LOCK:
+        if size <= _CACHE_BUDGET:
+            old = _CACHE.pop(mem_key, None)
+            if old is not None:
+                _CACHE_STATS["bytes"] -= old[1]
+            _CACHE[mem_key] = (frozen, size)
+            _CACHE_STATS["bytes"] += size
+            _evict()
+    return frozen.copy(deep=False)
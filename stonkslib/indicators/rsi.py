@@ -4,6 +4,8 @@ import logging
 import pandas as pd
 import warnings
 
+from stonkslib.utils.load_td import price_column
+
 # Suppress format warnings
 warnings.filterwarnings("ignore", category=UserWarning, message="Could not infer format")
 
@@ -14,13 +16,13 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(me
 def rsi(df, period=14):
     """
     Calculate RSI (Relative Strength Index) for a DataFrame (expects 'Close' column).
-    Returns a pandas Series with the RSI values.
+    Returns a pandas Series with the RSI values. `df` is only read, never modified.
     """
-    df = df.copy()
-    df["Close"] = pd.to_numeric(df["Close"], errors="coerce")
-    df = df.dropna(subset=["Close"])
+    close = price_column(df, "Close")
+    if close.hasnans:
+        close = close.dropna()
 
-    delta = df["Close"].diff()
+    delta = close.diff()
     gain = delta.clip(lower=0)
     loss = -delta.clip(upper=0)
 
@@ -30,9 +32,6 @@ def rsi(df, period=14):
     rs = avg_gain / avg_loss
     rsi_series = 100 - (100 / (1 + rs))
 
-    # Align with original index
-    rsi_series = rsi_series.reindex(df.index)
-
     return rsi_series
 
 
@@ -1,4 +1,7 @@
+import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
 from stonkslib.indicators.rsi import rsi as calc_rsi
 
 
@@ -9,39 +12,40 @@ def rsi_divergence(df, period=14, lookback=20):
     Bullish divergence: price makes lower low, RSI makes higher low → potential reversal up
     Bearish divergence: price makes higher high, RSI makes lower high → potential reversal down
 
+    Computed in one pass: a strided (zero-copy) view of the prior `lookback` closes
+    per bar gives the first-occurrence argmin/argmax for every bar at once.
+
     Returns a DataFrame with columns:
       Bullish_Divergence: bool
       Bearish_Divergence: bool
       RSI: the RSI series
     """
-    rsi_series = calc_rsi(df.copy(), period=period)
-    close = df["Close"]
+    rsi_series = calc_rsi(df, period=period).reindex(df.index)
+    close = df["Close"].to_numpy(dtype=float)
+    rsi_arr = rsi_series.to_numpy(dtype=float)
+    n = len(close)
 
-    bullish = pd.Series(False, index=df.index)
-    bearish = pd.Series(False, index=df.index)
+    bullish = np.zeros(n, dtype=bool)
+    bearish = np.zeros(n, dtype=bool)
 
-    for i in range(lookback, len(df)):
-        window_close = close.iloc[i - lookback: i + 1]
-        window_rsi = rsi_series.iloc[i - lookback: i + 1]
+    if n > lookback:
+        # Row k of `prior` is close[k : k + lookback] — the bars before bar k + lookback.
+        prior = sliding_window_view(close[:-1], lookback)
+        offset = np.arange(n - lookback)
+        lo_pos = prior.argmin(axis=1) + offset
+        hi_pos = prior.argmax(axis=1) + offset
 
-        if window_close.isna().any() or window_rsi.isna().any():
-            continue
+        # A window counts only if neither close nor RSI has a NaN in [i - lookback, i].
+        missing = np.concatenate(([0], np.cumsum(np.isnan(close) | np.isnan(rsi_arr))))
+        valid = (missing[lookback + 1:] - missing[:n - lookback]) == 0
 
-        current_close = close.iloc[i]
-        current_rsi = rsi_series.iloc[i]
-        prior_close_min = window_close.iloc[:-1].min()
-        prior_rsi_at_min = window_rsi.iloc[window_close.iloc[:-1].argmin()]
+        cur_close = close[lookback:]
+        cur_rsi = rsi_arr[lookback:]
 
         # Bullish: price lower low, RSI higher low
-        if current_close < prior_close_min and current_rsi > prior_rsi_at_min:
-            bullish.iloc[i] = True
-
-        prior_close_max = window_close.iloc[:-1].max()
-        prior_rsi_at_max = window_rsi.iloc[window_close.iloc[:-1].argmax()]
-
+        bullish[lookback:] = valid & (cur_close < close[lo_pos]) & (cur_rsi > rsi_arr[lo_pos])
         # Bearish: price higher high, RSI lower high
-        if current_close > prior_close_max and current_rsi < prior_rsi_at_max:
-            bearish.iloc[i] = True
+        bearish[lookback:] = valid & (cur_close > close[hi_pos]) & (cur_rsi < rsi_arr[hi_pos])
 
     return pd.DataFrame({
         "Bullish_Divergence": bullish,
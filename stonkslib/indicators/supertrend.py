@@ -1,6 +1,44 @@
 import pandas as pd
 import numpy as np
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _ratchet_bands(upper, lower, close, st, direction):
+    """Band-ratcheting recurrence, in place over plain sequences.
+
+    Each band only carries its previous value forward while price stays on the
+    far side of it, and direction/supertrend depend on the bar before — a
+    sequential recurrence, so this stays a loop. It indexes plain Python lists
+    (or NumPy arrays under Numba) instead of Series `.iloc`, which is where the
+    old per-bar cost went. NaN comparisons are False, exactly as with `.iloc`.
+    """
+    for i in range(1, len(close)):
+        # Upper band
+        if not (upper[i] < upper[i - 1] or close[i - 1] > upper[i - 1]):
+            upper[i] = upper[i - 1]
+
+        # Lower band
+        if not (lower[i] > lower[i - 1] or close[i - 1] < lower[i - 1]):
+            lower[i] = lower[i - 1]
+
+        # Direction
+        if i == 1:
+            d = 1.0
+        elif st[i - 1] == upper[i - 1]:
+            d = -1.0 if close[i] > upper[i] else 1.0
+        else:
+            d = 1.0 if close[i] < lower[i] else -1.0
+        direction[i] = d
+
+        st[i] = lower[i] if d == 1.0 else upper[i]
+
+
+_ratchet_bands_jit = njit(cache=True)(_ratchet_bands) if njit is not None else None
+
 
 def supertrend(df, period=10, multiplier=3.0):
     high = df["High"]
@@ -16,38 +54,27 @@ def supertrend(df, period=10, multiplier=3.0):
     atr = tr.ewm(span=period, adjust=False).mean()
 
     hl_avg = (high + low) / 2
-    upper_band = hl_avg + multiplier * atr
-    lower_band = hl_avg - multiplier * atr
-
-    supertrend = pd.Series(index=df.index, dtype=float)
-    direction = pd.Series(index=df.index, dtype=int)  # 1 = bullish, -1 = bearish
-
-    for i in range(1, len(df)):
-        # Upper band
-        if upper_band.iloc[i] < upper_band.iloc[i - 1] or close.iloc[i - 1] > upper_band.iloc[i - 1]:
-            upper_band.iloc[i] = upper_band.iloc[i]
-        else:
-            upper_band.iloc[i] = upper_band.iloc[i - 1]
-
-        # Lower band
-        if lower_band.iloc[i] > lower_band.iloc[i - 1] or close.iloc[i - 1] < lower_band.iloc[i - 1]:
-            lower_band.iloc[i] = lower_band.iloc[i]
-        else:
-            lower_band.iloc[i] = lower_band.iloc[i - 1]
-
-        # Direction
-        if i == 1:
-            direction.iloc[i] = 1
-        elif supertrend.iloc[i - 1] == upper_band.iloc[i - 1]:
-            direction.iloc[i] = -1 if close.iloc[i] > upper_band.iloc[i] else 1
-        else:
-            direction.iloc[i] = 1 if close.iloc[i] < lower_band.iloc[i] else -1
+    upper_band = (hl_avg + multiplier * atr).to_numpy(dtype=float)
+    lower_band = (hl_avg - multiplier * atr).to_numpy(dtype=float)
+    close_arr = close.to_numpy(dtype=float)
 
-        supertrend.iloc[i] = lower_band.iloc[i] if direction.iloc[i] == 1 else upper_band.iloc[i]
+    n = len(df)
+    if _ratchet_bands_jit is not None:
+        upper_band = upper_band.copy()
+        lower_band = lower_band.copy()
+        st = np.full(n, np.nan)
+        direction = np.full(n, np.nan)  # 1 = bullish, -1 = bearish
+        _ratchet_bands_jit(upper_band, lower_band, close_arr, st, direction)
+    else:
+        upper_band = upper_band.tolist()
+        lower_band = lower_band.tolist()
+        st = [np.nan] * n
+        direction = [np.nan] * n  # 1 = bullish, -1 = bearish
+        _ratchet_bands(upper_band, lower_band, close_arr.tolist(), st, direction)
 
     return pd.DataFrame({
-        "Supertrend": supertrend,
-        "Direction": direction,  # 1=bullish, -1=bearish
-        "Upper_Band": upper_band,
-        "Lower_Band": lower_band,
+        "Supertrend": np.asarray(st, dtype=float),
+        "Direction": np.asarray(direction, dtype=float),  # 1=bullish, -1=bearish
+        "Upper_Band": np.asarray(upper_band, dtype=float),
+        "Lower_Band": np.asarray(lower_band, dtype=float),
     }, index=df.index)
@@ -1,12 +1,13 @@
 import yaml
 import logging
 import warnings
-import yfinance as yf
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timedelta
 
 from stonkslib.alerts.signals import check_signals
+from stonkslib.fetch.chains import CHAIN_WORKERS, default_cache
 from stonkslib.utils.load_td import load_td
 
 warnings.filterwarnings("ignore")
@@ -18,13 +19,12 @@ TICKER_YAML = PROJECT_ROOT / "tickers.yaml"
 logger = logging.getLogger(__name__)
 
 
-def get_vix_rank() -> tuple[float | None, float | None]:
-    """Return (current_vix, vix_rank_percentile) from the past 52 weeks."""
+def get_vix_rank(cache=None) -> tuple[float | None, float | None]:
+    """Return (current_vix, vix_rank_percentile) from the past 52 weeks (cached VIX)."""
     try:
-        df = yf.download("^VIX", period="1y", interval="1d", progress=False)
-        if df.empty:
+        close = (cache or default_cache()).vix()
+        if close is None or close.empty:
             return None, None
-        close = df["Close"].dropna().squeeze()
         current = float(close.iloc[-1])
         vix_min = float(close.min())
         vix_max = float(close.max())
@@ -66,11 +66,12 @@ def _ticker_category(ticker: str) -> str:
     return "stocks"
 
 
-def _best_leap_option(ticker: str, current_price: float, direction: str) -> dict | None:
+def _best_leap_option(ticker: str, current_price: float, direction: str,
+                      cache=None) -> dict | None:
     """Return the best LEAP strike from the options chain (12–18 months out)."""
     try:
-        t = yf.Ticker(ticker)
-        expirations = t.options
+        cache = cache or default_cache()
+        expirations = cache.expirations(ticker)
         if not expirations:
             return None
 
@@ -90,8 +91,8 @@ def _best_leap_option(ticker: str, current_price: float, direction: str) -> dict
         target_date = now + timedelta(days=456)  # ~15 months — sweet spot
         best_expiry = min(valid, key=lambda e: abs((datetime.strptime(e, "%Y-%m-%d") - target_date).days))
 
-        chain = t.option_chain(best_expiry)
-        df = chain.calls if direction == "CALL" else chain.puts
+        calls, puts = cache.chain(ticker, best_expiry)
+        df = calls if direction == "CALL" else puts
 
         # For calls: slightly ITM (~0.95x) for higher delta. For puts: ATM (~1.0x) for hedge.
         target_strike = current_price * (0.95 if direction == "CALL" else 1.0)
@@ -116,7 +117,8 @@ def _best_leap_option(ticker: str, current_price: float, direction: str) -> dict
         return None
 
 
-def scan_leaps(tickers: list[str], interval: str = "1wk") -> tuple[list[dict], float | None, float | None]:
+def scan_leaps(tickers: list[str], interval: str = "1wk", cache=None,
+               workers: int = CHAIN_WORKERS) -> tuple[list[dict], float | None, float | None]:
     """
     Scan tickers for LEAP call/put opportunities.
 
@@ -124,11 +126,23 @@ def scan_leaps(tickers: list[str], interval: str = "1wk") -> tuple[list[dict], f
     uses VIX rank as a market-wide IV proxy, and fetches the best LEAP strike
     from the options chain for non-crypto tickers.
 
+    Chains and VIX come through a ChainCache (fetch/chains.py; default on
+    data/options_data/chains), so only stale entries hit the network. Those
+    lookups run on a pool of `workers` threads: VIX while the signals are
+    scanned, then one chain lookup per signalling ticker.
+
     Returns (results, vix_current, vix_rank).
     """
-    vix_current, vix_rank = get_vix_rank()
-    logger.info(f"VIX: {vix_current} | Rank: {vix_rank}%")
+    cache = cache or default_cache()
+    pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        return _scan(tickers, interval, cache, pool)
+    finally:
+        pool.shutdown(wait=True)
 
+
+def _scan(tickers, interval, cache, pool):
+    vix_future = pool.submit(get_vix_rank, cache)
     strategy_paths = list(STRATEGY_DIR.glob("*.yaml"))
 
     results = []
@@ -176,7 +190,7 @@ def scan_leaps(tickers: list[str], interval: str = "1wk") -> tuple[list[dict], f
 
         option = None
         if category != "crypto":
-            option = _best_leap_option(ticker, current_price, direction)
+            option = pool.submit(_best_leap_option, ticker, current_price, direction, cache)
 
         results.append({
             "ticker": ticker,
@@ -187,10 +201,16 @@ def scan_leaps(tickers: list[str], interval: str = "1wk") -> tuple[list[dict], f
             "buy_count": buy_count,
             "sell_count": sell_count,
             "top_reasons": top_reasons,
-            "vix": vix_current,
-            "vix_rank": vix_rank,
+            "vix": None,
+            "vix_rank": None,
             "option": option,
         })
 
+    vix_current, vix_rank = vix_future.result()
+    logger.info(f"VIX: {vix_current} | Rank: {vix_rank}%")
+    for r in results:
+        r.update(vix=vix_current, vix_rank=vix_rank,
+                 option=r["option"].result() if r["option"] is not None else None)
+
     results.sort(key=lambda x: x["signal_count"], reverse=True)
     return results, vix_current, vix_rank
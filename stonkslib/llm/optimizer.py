@@ -1,7 +1,11 @@
 import json
 import logging
 import copy
+import contextlib
+import multiprocessing
+import threading
 import yaml
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from pathlib import Path
 
 from stonkslib.backtest.strategy import run_strategy_backtest, load_strategy
@@ -171,8 +175,17 @@ def _avg_leaps_score(metrics_list):
     return sum(m.get("avg_pnl_pct", 0) for m in metrics_list) / len(metrics_list)
 
 
+def _backtest(ticker, interval, strategy, use_leaps=False, option_type="auto"):
+    """One ticker's backtest for an optimizer iteration (module-level so a process
+    pool can run it)."""
+    if use_leaps:
+        return run_leaps_backtest(ticker, interval, strategy, option_type=option_type)
+    return run_strategy_backtest(ticker, interval, strategy)
+
+
 def optimize(strategy_path, tickers, interval="1d", iterations=5, model=DEFAULT_MODEL,
-             output_ticker=None, use_leaps=False, option_type="auto", warm_start=False):
+             output_ticker=None, use_leaps=False, option_type="auto", warm_start=False,
+             pool=None, llm_slots=None):
     """
     LLM-driven strategy parameter optimization.
 
@@ -180,6 +193,10 @@ def optimize(strategy_path, tickers, interval="1d", iterations=5, model=DEFAULT_
                 start from those params instead of the base strategy. Use this for a
                 second-pass refinement (e.g. 7b exploration → 32b refinement).
     use_leaps:  score against the LEAP backtest; output files get a _leaps_{option_type} suffix.
+    pool:       executor to fan each iteration's per-ticker backtests out to (default:
+                run them inline, one after another).
+    llm_slots:  semaphore bounding concurrent LLM calls when several optimizations
+                share one server (see optimize_many).
     """
     strategy_path = Path(strategy_path)
 
@@ -214,14 +231,13 @@ def optimize(strategy_path, tickers, interval="1d", iterations=5, model=DEFAULT_
         logger.info(f"\n--- Iteration {i + 1}/{iterations} ---")
         current = next_strategy if i > 0 else strategy
 
-        metrics_list = []
-        for ticker in tickers:
-            if use_leaps:
-                m = run_leaps_backtest(ticker, interval, current, option_type=option_type)
-            else:
-                m = run_strategy_backtest(ticker, interval, current)
-            if m:
-                metrics_list.append(m)
+        if pool is not None:
+            futures = [pool.submit(_backtest, t, interval, current, use_leaps, option_type)
+                       for t in tickers]
+            metrics_list = [m for m in (f.result() for f in futures) if m]
+        else:
+            metrics_list = [m for m in (_backtest(t, interval, current, use_leaps, option_type)
+                                        for t in tickers) if m]
 
         if not metrics_list:
             if best_metrics_list is None:
@@ -255,14 +271,15 @@ def optimize(strategy_path, tickers, interval="1d", iterations=5, model=DEFAULT_
         prompt = (_build_leaps_prompt(best_strategy, metrics_list, option_type)
                   if use_leaps else _build_prompt(best_strategy, metrics_list))
         try:
-            content = client.chat(
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": prompt}
-                ],
-                model=model,
-                json_mode=True,
-            )
+            with llm_slots or contextlib.nullcontext():
+                content = client.chat(
+                    messages=[
+                        {"role": "system", "content": SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt}
+                    ],
+                    model=model,
+                    json_mode=True,
+                )
             suggestions = json.loads(content)
             logger.info(f"    LLM: {suggestions.get('reasoning', '')}")
             # Apply suggestions to a fresh copy of best — never mutate best_strategy itself
@@ -293,3 +310,47 @@ def optimize(strategy_path, tickers, interval="1d", iterations=5, model=DEFAULT_
     logger.info(f"\n[✓] Optimized strategy saved → {out_path}")
     return {"best_metrics": best_metrics_list, "best_strategy": best_strategy,
             "history": history, "out_path": str(out_path)}
+
+
+def optimize_many(jobs, workers=4, llm_workers=2, pool=None):
+    """Run several optimize() jobs pipelined across a backtest pool and the LLM.
+
+    Each job alternates CPU-bound backtests with a wait on the LLM, so running jobs
+    one after another leaves one side idle. Here every job runs on its own driver
+    thread: its backtests fan out to `workers` processes, its LLM calls queue on a
+    semaphore of `llm_workers` slots, and while one job waits on the LLM others keep
+    the pool busy. Output paths and warm-start behave exactly as in a serial run
+    (each job still writes only its own YAML).
+
+    Args:
+        jobs: list of (label, optimize kwargs)
+        workers: backtest processes (ignored when `pool` is given)
+        llm_workers: max concurrent LLM requests
+        pool: existing executor for the backtests (default: a spawn process pool)
+
+    Returns:
+        {label: optimize() result, or {} if the job raised}, in job order.
+    """
+    slots = threading.BoundedSemaphore(max(1, llm_workers))
+    own_pool = pool is None
+    if own_pool:
+        # spawn, not fork: the driver threads may hold locks at fork time.
+        pool = ProcessPoolExecutor(max_workers=workers,
+                                   mp_context=multiprocessing.get_context("spawn"))
+    done = {}
+    try:
+        # Enough drivers to keep every backtest worker fed while others sit on the LLM.
+        with ThreadPoolExecutor(max_workers=max(1, workers) + max(1, llm_workers)) as drivers:
+            futures = {drivers.submit(optimize, **kwargs, pool=pool, llm_slots=slots): label
+                       for label, kwargs in jobs}
+            for fut in as_completed(futures):
+                label = futures[fut]
+                try:
+                    done[label] = fut.result() or {}
+                except Exception as e:
+                    logger.error(f"[!] Optimization '{label}' failed: {e}")
+                    done[label] = {}
+    finally:
+        if own_pool:
+            pool.shutdown()
+    return {label: done[label] for label, _ in jobs}
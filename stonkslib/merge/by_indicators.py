@@ -5,7 +5,8 @@ import pandas as pd
 from pathlib import Path
 import logging
 
-from stonkslib.utils.load_td import load_td
+from stonkslib.utils.load_td import load_td, DEFAULT_CLEAN_DIR
+from stonkslib.utils.fingerprint import inputs_unchanged, write_stamp
 
 # Logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
@@ -15,20 +16,32 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 INPUT_BASE = PROJECT_ROOT / "data" / "analysis" / "signals"
 OUTPUT_BASE = PROJECT_ROOT / "data" / "analysis" / "merged" / "by-indicators"
 
-def merge_signals_for_ticker_interval(ticker: str, interval: str):
+PATTERN_STEMS = {"doubles", "triangles", "wedges", "head_shoulders"}
+
+def merge_signals_for_ticker_interval(ticker: str, interval: str, rebuild: bool = False):
+    """Join the signal CSVs and prices into merged/by-indicators/{ticker}/{interval}.csv.
+
+    Skipped when neither the signal CSVs nor the cleaned parquet changed since the
+    last merge (rebuild=True forces it).
+    """
     input_dir = INPUT_BASE / ticker / interval
     if not input_dir.exists():
         logging.warning(f"[!] Missing signal folder: {input_dir}")
         return
 
+    outfile = OUTPUT_BASE / ticker / f"{interval}.csv"
+    stamp_path = outfile.with_name(outfile.name + ".inputs.json")
+    csv_paths = [p for p in sorted(input_dir.glob("*.csv")) if p.stem not in PATTERN_STEMS]
+    unchanged, _, fp = inputs_unchanged(
+        stamp_path, csv_paths + [DEFAULT_CLEAN_DIR / ticker / f"{interval}.parquet"])
+    if unchanged and not rebuild and outfile.exists():
+        logging.info(f"[⏭] Skipping merge {ticker} ({interval}) – inputs unchanged")
+        return
+
     merged_df = None
 
-    for csv_path in sorted(input_dir.glob("*.csv")):
+    for csv_path in csv_paths:
         try:
-            # Skip pattern files
-            if csv_path.stem in {"doubles", "triangles", "wedges", "head_shoulders"}:
-                continue
-
             df = pd.read_csv(csv_path)
 
             if df.empty or df.shape[0] < 2:
@@ -83,19 +96,18 @@ def merge_signals_for_ticker_interval(ticker: str, interval: str):
 
     if merged_df is not None and not merged_df.empty:
         merged_df.sort_index(inplace=True)
-        outdir = OUTPUT_BASE / ticker
-        outdir.mkdir(parents=True, exist_ok=True)
-        outfile = outdir / f"{interval}.csv"
+        outfile.parent.mkdir(parents=True, exist_ok=True)
         merged_df.to_csv(outfile)
+        write_stamp(stamp_path, fp)
         logging.info(f"[✓] Merged {ticker} ({interval}) → {outfile}")
     else:
         logging.warning(f"[!] No valid files to merge for {ticker} ({interval})")
 
-def run_merge_indicators():
+def run_merge_indicators(rebuild=False):
     tickers = [d.name for d in INPUT_BASE.iterdir() if d.is_dir()]
     for ticker in tickers:
         for interval in os.listdir(INPUT_BASE / ticker):
-            merge_signals_for_ticker_interval(ticker, interval)
+            merge_signals_for_ticker_interval(ticker, interval, rebuild=rebuild)
 
 def main(intervals=None):
     intervals = intervals or ["1m", "2m", "5m", "15m", "30m", "1h", "1d", "1wk"]
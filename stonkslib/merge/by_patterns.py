@@ -5,6 +5,8 @@ import pandas as pd
 from pathlib import Path
 import logging
 
+from stonkslib.utils.fingerprint import inputs_unchanged, write_stamp
+
 # Logging setup
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
@@ -14,12 +16,24 @@ INPUT_BASE = PROJECT_ROOT / "data" / "analysis" / "signals"
 OUTPUT_BASE = PROJECT_ROOT / "data" / "analysis" / "merged" / "by-patterns"
 PATTERN_FILES = ["doubles.csv", "triangles.csv", "wedges.csv", "head_shoulders.csv"]
 
-def merge_patterns_for_ticker_interval(ticker: str, interval: str):
+def merge_patterns_for_ticker_interval(ticker: str, interval: str, rebuild: bool = False):
+    """Stack the pattern CSVs into merged/by-patterns/{ticker}/{interval}.csv.
+
+    Skipped when the pattern CSVs are unchanged since the last merge (rebuild=True
+    forces it).
+    """
     input_dir = INPUT_BASE / ticker / interval
     if not input_dir.exists():
         logging.warning(f"[!] Missing pattern folder: {input_dir}")
         return
 
+    outfile = OUTPUT_BASE / ticker / f"{interval}.csv"
+    stamp_path = outfile.with_name(outfile.name + ".inputs.json")
+    unchanged, _, fp = inputs_unchanged(stamp_path, [input_dir / f for f in PATTERN_FILES])
+    if unchanged and not rebuild and outfile.exists():
+        logging.info(f"[⏭] Skipping pattern merge {ticker} ({interval}) – inputs unchanged")
+        return
+
     merged_df = pd.DataFrame()
 
     for filename in PATTERN_FILES:
@@ -55,20 +69,19 @@ def merge_patterns_for_ticker_interval(ticker: str, interval: str):
     if not merged_df.empty:
         merged_df.sort_index(inplace=True)
 
-        outdir = OUTPUT_BASE / ticker
-        outdir.mkdir(parents=True, exist_ok=True)
-        outfile = outdir / f"{interval}.csv"
+        outfile.parent.mkdir(parents=True, exist_ok=True)
         merged_df.to_csv(outfile)
+        write_stamp(stamp_path, fp)
         logging.info(f"[+] Merged {ticker} ({interval}) patterns → {outfile}")
     else:
         logging.warning(f"[!] No valid pattern data to merge for {ticker} ({interval})")
 
-def run_merge_patterns():
+def run_merge_patterns(rebuild=False):
     tickers = [d.name for d in INPUT_BASE.iterdir() if d.is_dir()]
     for ticker in tickers:
         for interval_path in (INPUT_BASE / ticker).iterdir():
             if interval_path.is_dir():
-                merge_patterns_for_ticker_interval(ticker, interval_path.name)
+                merge_patterns_for_ticker_interval(ticker, interval_path.name, rebuild=rebuild)
 
 if __name__ == "__main__":
     run_merge_patterns()
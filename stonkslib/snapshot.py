@@ -10,7 +10,7 @@ Design rules:
 - Each section is independently guarded (try/except per source) — one failed
   source never blanks the rest.
 - The **confluence** section comes from the *live* strategy engine
-  (`build_namespace` / `vote_signals` / `confluence_scores`), NOT pre-saved
+  (`build_namespace` / `evaluate_strategy`), NOT pre-saved
   signal CSVs, so the votes match exactly what the backtester sees (incl. the
   LLM `news_sent` vote).
 - The **edge** section reads cached backtest `*_metrics.json` for both regular
@@ -35,8 +35,7 @@ import yaml
 from stonkslib.indicators.registry import INDICATORS
 from stonkslib.strategies.engine import (
     build_namespace,
-    confluence_scores,
-    vote_signals,
+    evaluate_strategy,
 )
 from stonkslib.utils.load_td import load_td
 
@@ -122,8 +121,8 @@ def _engine_run(df: pd.DataFrame, keys: list[str]):
     """Run the engine for a set of indicator keys → (strategy, ns, votes, buy, sell)."""
     strategy = {"indicators": {k: {} for k in keys if k in INDICATORS}}
     ns = build_namespace(df, strategy)
-    votes = vote_signals(df, strategy, ns)
-    buy, sell = confluence_scores(df, strategy, ns)
+    plan = evaluate_strategy(df, strategy, ns)
+    votes, buy, sell = plan["votes"], plan["buy_score"], plan["sell_score"]
     return strategy, ns, votes, buy, sell
 
 
@@ -135,7 +134,7 @@ def _confluence(df: pd.DataFrame, ticker: str) -> dict:
     (e.g. `news_sentiment` can't reach the sentiment DB), the core technical read
     (RSI/MACD/Bollinger/Supertrend/Markov) is preserved rather than lost wholesale.
     """
-    df = df.copy()
+    df = df.copy(deep=False)
     df.attrs["ticker"] = ticker  # lets the news_sentiment indicator resolve scores
 
     keys = [k for k in TA_INDICATORS if k in INDICATORS]
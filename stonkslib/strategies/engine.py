@@ -7,8 +7,11 @@ registry. This is the single shared implementation used by both the backtest
 hardcoded per-indicator logic that was previously duplicated across both.
 
 Evaluation is **vectorized** (operates on whole Series) and **safe**: expressions are
-parsed with the `ast` module and walked under a strict node/function whitelist — no
-`eval()` of arbitrary code, no attribute access, no imports.
+parsed with the `ast` module and checked against a strict node/function whitelist — no
+`eval()` of arbitrary code, no attribute access, no imports. Each distinct expression is
+parsed once and lowered to a tree of closures (`compile_expr`), memoized on its text;
+`evaluate_strategy` runs all of a strategy's expressions with shared sub-expressions
+computed once.
 """
 
 import ast
@@ -16,7 +19,8 @@ import functools
 
 import pandas as pd
 
-from stonkslib.indicators.registry import INDICATORS, PRICE_OUTPUTS
+from stonkslib.indicators.registry import INDICATORS, PRICE_OUTPUTS, compute_indicator, resolve_kwargs
+from stonkslib.utils.load_td import price_column
 
 
 # ── v2 detection ──────────────────────────────────────────────────────────────
@@ -91,91 +95,218 @@ def _or(parts):
     return functools.reduce(lambda a, b: a | b, parts)
 
 
-def _eval_node(node, ns):
+def _raiser(msg):
+    """A compiled node that fails when evaluated — disallowed syntax is reported at the
+    point evaluation reaches it, so error precedence matches a plain tree walk."""
+    def run(ns, memo):
+        raise ExprError(msg)
+    return run
+
+
+def _memoized(key, run):
+    """Share a node's value across every expression evaluated with the same `memo` dict.
+
+    `key` is the node's normalized form (ast.dump: no positions, no formatting), so
+    `crossover(macd, macd_signal)` in `entry` and in a `vote_buy` is computed once per
+    namespace. memo=None evaluates without sharing.
+    """
+    def cached(ns, memo):
+        if memo is None:
+            return run(ns, memo)
+        try:
+            return memo[key]
+        except KeyError:
+            val = memo[key] = run(ns, memo)
+            return val
+    return cached
+
+
+def _compile_node(node):
+    """Lower an AST node to a closure `fn(ns, memo) -> value`.
+
+    The closures do exactly what a recursive isinstance-walk of the tree would do, in
+    the same order (including which ExprError surfaces first), minus the per-call
+    parsing and dispatch. Every composite node is memoized on its normalized form.
+    """
     if isinstance(node, ast.Expression):
-        return _eval_node(node.body, ns)
+        return _compile_node(node.body)
+
+    key = ast.dump(node)
 
     if isinstance(node, ast.BoolOp):
-        vals = [_eval_node(v, ns) for v in node.values]
+        parts = [_compile_node(v) for v in node.values]
         if isinstance(node.op, ast.And):
-            return _and(vals)
-        if isinstance(node.op, ast.Or):
-            return _or(vals)
-        raise ExprError(f"Unsupported boolean op: {type(node.op).__name__}")
+            combine = _and
+        elif isinstance(node.op, ast.Or):
+            combine = _or
+        else:
+            combine = None
+            msg = f"Unsupported boolean op: {type(node.op).__name__}"
+
+        def run(ns, memo):
+            vals = [p(ns, memo) for p in parts]
+            if combine is None:
+                raise ExprError(msg)
+            return combine(vals)
+        return _memoized(key, run)
 
     if isinstance(node, ast.UnaryOp):
-        val = _eval_node(node.operand, ns)
+        operand = _compile_node(node.operand)
         if isinstance(node.op, ast.Not):
-            return ~val if isinstance(val, pd.Series) else (not val)
-        if isinstance(node.op, ast.USub):
-            return -val
-        if isinstance(node.op, ast.UAdd):
-            return +val
-        raise ExprError(f"Unsupported unary op: {type(node.op).__name__}")
+            def run(ns, memo):
+                val = operand(ns, memo)
+                return ~val if isinstance(val, pd.Series) else (not val)
+        elif isinstance(node.op, ast.USub):
+            def run(ns, memo):
+                return -operand(ns, memo)
+        elif isinstance(node.op, ast.UAdd):
+            def run(ns, memo):
+                return +operand(ns, memo)
+        else:
+            msg = f"Unsupported unary op: {type(node.op).__name__}"
+
+            def run(ns, memo):
+                operand(ns, memo)
+                raise ExprError(msg)
+        return _memoized(key, run)
 
     if isinstance(node, ast.BinOp):
         op = _BIN.get(type(node.op))
         if op is None:
-            raise ExprError(f"Unsupported binary op: {type(node.op).__name__}")
-        return op(_eval_node(node.left, ns), _eval_node(node.right, ns))
+            return _raiser(f"Unsupported binary op: {type(node.op).__name__}")
+        left, right = _compile_node(node.left), _compile_node(node.right)
+
+        def run(ns, memo):
+            return op(left(ns, memo), right(ns, memo))
+        return _memoized(key, run)
 
     if isinstance(node, ast.Compare):
-        left = _eval_node(node.left, ns)
-        result = None
-        for op, comp in zip(node.ops, node.comparators):
-            fn = _CMP.get(type(op))
-            if fn is None:
-                raise ExprError(f"Unsupported comparison: {type(op).__name__}")
-            right = _eval_node(comp, ns)
-            piece = fn(left, right)
-            result = piece if result is None else (result & piece)
-            left = right  # support chained comparisons (a < b < c)
-        return result
+        left = _compile_node(node.left)
+        steps = [(_CMP.get(type(op)), f"Unsupported comparison: {type(op).__name__}", _compile_node(comp))
+                 for op, comp in zip(node.ops, node.comparators)]
+
+        def run(ns, memo):
+            lhs = left(ns, memo)
+            result = None
+            for fn, msg, comp in steps:
+                if fn is None:
+                    raise ExprError(msg)
+                rhs = comp(ns, memo)
+                piece = fn(lhs, rhs)
+                result = piece if result is None else (result & piece)
+                lhs = rhs  # support chained comparisons (a < b < c)
+            return result
+        return _memoized(key, run)
 
     if isinstance(node, ast.Call):
         if not isinstance(node.func, ast.Name) or node.func.id not in _FUNCS:
-            raise ExprError("Only whitelisted functions may be called")
+            return _raiser("Only whitelisted functions may be called")
         if node.keywords:
-            raise ExprError("Keyword arguments are not allowed in expressions")
-        args = [_eval_node(a, ns) for a in node.args]
-        return _FUNCS[node.func.id](*args)
+            return _raiser("Keyword arguments are not allowed in expressions")
+        name = node.func.id
+        args = [_compile_node(a) for a in node.args]
+        if name in ("crossover", "crossunder") and len(args) == 2:
+            return _memoized(key, _compile_cross(name, node.args, args))
+        fn = _FUNCS[name]
+
+        def run(ns, memo):
+            return fn(*[a(ns, memo) for a in args])
+        return _memoized(key, run)
 
     if isinstance(node, ast.Name):
-        if node.id not in ns:
-            raise ExprError(f"Unknown name in expression: '{node.id}'")
-        return ns[node.id]
+        name = node.id
+        msg = f"Unknown name in expression: '{name}'"
+
+        def run(ns, memo):
+            if name not in ns:
+                raise ExprError(msg)
+            return ns[name]
+        return run
 
     if isinstance(node, ast.Constant):
         if isinstance(node.value, (int, float, bool)):
-            return node.value
-        raise ExprError(f"Unsupported constant: {node.value!r}")
+            value = node.value
+            return lambda ns, memo: value
+        return _raiser(f"Unsupported constant: {node.value!r}")
+
+    return _raiser(f"Disallowed expression syntax: {type(node).__name__}")
+
+
+def _compile_cross(name, arg_nodes, args):
+    """crossover/crossunder inlined, with each operand's previous-bar shift shared:
+    `crossover(macd, sig)` and `crossunder(macd, sig)` shift each Series once."""
+    a, b = args
+    prev_a = _memoized(("prev", ast.dump(arg_nodes[0])), lambda ns, memo: _prev(a(ns, memo)))
+    prev_b = _memoized(("prev", ast.dump(arg_nodes[1])), lambda ns, memo: _prev(b(ns, memo)))
+    fn = _FUNCS[name]
+    if name == "crossover":
+        def run(ns, memo):
+            va, vb = a(ns, memo), b(ns, memo)
+            if memo is None:
+                return fn(va, vb)
+            return (prev_a(ns, memo) <= prev_b(ns, memo)) & (va > vb)
+    else:
+        def run(ns, memo):
+            va, vb = a(ns, memo), b(ns, memo)
+            if memo is None:
+                return fn(va, vb)
+            return (prev_a(ns, memo) >= prev_b(ns, memo)) & (va < vb)
+    return run
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_cached(expr: str):
+    if not expr.strip():
+        raise ExprError("Empty expression")
+    try:
+        tree = ast.parse(expr, mode="eval")
+    except SyntaxError as e:
+        raise ExprError(f"Could not parse expression: {e}") from e
+    root = _compile_node(tree)
+
+    def evaluate(ns, memo=None):
+        return root(ns, memo)
+    return evaluate
 
-    raise ExprError(f"Disallowed expression syntax: {type(node).__name__}")
 
+def compile_expr(expr: str):
+    """Parse and lower an expression once; returns `fn(ns, memo=None)` evaluating it
+    against a namespace of named Series. Memoized on the expression string, so every
+    strategy × ticker × optimizer iteration after the first skips parsing entirely.
 
-def eval_expr(expr: str, ns: dict) -> pd.Series:
+    Passing the same `memo` dict to several compiled expressions over one namespace
+    computes each shared sub-expression once (see evaluate_strategy).
+
+    Raises ExprError for empty/unparseable expressions; whitelist violations and
+    unknown names raise ExprError when the compiled function is evaluated, exactly as
+    eval_expr always has.
+    """
+    if not expr:
+        raise ExprError("Empty expression")
+    return _compile_cached(str(expr))
+
+
+def eval_expr(expr: str, ns: dict, memo: dict | None = None) -> pd.Series:
     """Evaluate an expression string against a namespace of named Series.
 
     Returns a boolean pandas Series (or a scalar bool for constant expressions).
     Raises ExprError on unknown names or disallowed syntax.
     """
-    if not expr or not str(expr).strip():
-        raise ExprError("Empty expression")
-    try:
-        tree = ast.parse(str(expr), mode="eval")
-    except SyntaxError as e:
-        raise ExprError(f"Could not parse expression: {e}") from e
-    return _eval_node(tree, ns)
+    return compile_expr(expr)(ns, memo)
 
 
 # ── namespace construction ────────────────────────────────────────────────────
-def build_namespace(df: pd.DataFrame, strategy: dict) -> dict:
+def build_namespace(df: pd.DataFrame, strategy: dict, results: dict | None = None) -> dict:
     """Compute only the indicators present in `indicators:` and return a flat
-    namespace of named pandas Series the expressions can reference (plus OHLCV)."""
+    namespace of named pandas Series the expressions can reference (plus OHLCV).
+
+    `results`, if given, memoizes indicator outputs by (key, kwargs) across calls on
+    the same frame — e.g. a parameter grid where most combos share an RSI period.
+    """
     ns = {}
     for name, col in PRICE_OUTPUTS.items():
         if col in df.columns:
-            ns[name] = pd.to_numeric(df[col], errors="coerce")
+            ns[name] = price_column(df, col)
 
     ind = strategy.get("indicators", {}) or {}
     for key, cfg in ind.items():
@@ -186,9 +317,14 @@ def build_namespace(df: pd.DataFrame, strategy: dict) -> dict:
         if isinstance(cfg, dict) and cfg.get("enabled") is False:
             continue
         params = (cfg or {}).get("params", {}) if isinstance(cfg, dict) else {}
-        kwargs = {fn_kw: params.get(yaml_key, default)
-                  for yaml_key, (fn_kw, default) in spec["params"].items()}
-        out = spec["fn"](df.copy(), **kwargs)
+        kwargs = resolve_kwargs(key, params)
+        if results is None:
+            out = compute_indicator(key, df, kwargs)
+        else:
+            memo_key = (key, tuple(sorted(kwargs.items())))
+            out = results.get(memo_key)
+            if out is None:
+                out = results[memo_key] = compute_indicator(key, df, kwargs)
         for exposed, col in spec["outputs"].items():
             series = out if col is None else out[col]
             ns[exposed] = series
@@ -203,29 +339,23 @@ def _coerce_bool_series(val, index) -> pd.Series:
     return pd.Series(bool(val), index=index)
 
 
-def entry_signals(df, strategy, ns=None) -> pd.Series:
-    ns = ns if ns is not None else build_namespace(df, strategy)
-    expr = strategy.get("entry")
+def _signal(expr, df, ns, memo) -> pd.Series:
     if not expr:
         return pd.Series(False, index=df.index)
-    return _coerce_bool_series(eval_expr(expr, ns), df.index)
+    return _coerce_bool_series(eval_expr(expr, ns, memo), df.index)
 
 
-def exit_signals(df, strategy, ns=None) -> pd.Series:
+def entry_signals(df, strategy, ns=None) -> pd.Series:
     ns = ns if ns is not None else build_namespace(df, strategy)
-    expr = strategy.get("exit")
-    if not expr:
-        return pd.Series(False, index=df.index)
-    return _coerce_bool_series(eval_expr(expr, ns), df.index)
-
+    return _signal(strategy.get("entry"), df, ns, None)
 
-def vote_signals(df, strategy, ns=None) -> dict:
-    """Per-indicator BUY/SELL confluence votes as boolean Series, keyed by source.
 
-    Uses each strategy indicator's `vote_buy`/`vote_sell` override if present, else
-    the registry default. Returns {"BUY": {src: Series}, "SELL": {src: Series}}.
-    """
+def exit_signals(df, strategy, ns=None) -> pd.Series:
     ns = ns if ns is not None else build_namespace(df, strategy)
+    return _signal(strategy.get("exit"), df, ns, None)
+
+
+def _votes(df, strategy, ns, memo) -> dict:
     ind = strategy.get("indicators", {}) or {}
     out = {"BUY": {}, "SELL": {}}
     for key, cfg in ind.items():
@@ -238,12 +368,33 @@ def vote_signals(df, strategy, ns=None) -> dict:
         buy_expr = cfg.get("vote_buy", spec["vote_buy"]) if isinstance(cfg, dict) else spec["vote_buy"]
         sell_expr = cfg.get("vote_sell", spec["vote_sell"]) if isinstance(cfg, dict) else spec["vote_sell"]
         if buy_expr:
-            out["BUY"][key] = _coerce_bool_series(eval_expr(buy_expr, ns), df.index)
+            out["BUY"][key] = _coerce_bool_series(eval_expr(buy_expr, ns, memo), df.index)
         if sell_expr:
-            out["SELL"][key] = _coerce_bool_series(eval_expr(sell_expr, ns), df.index)
+            out["SELL"][key] = _coerce_bool_series(eval_expr(sell_expr, ns, memo), df.index)
     return out
 
 
+def _scores(df, strategy, votes):
+    weights = (strategy.get("confluence") or {}).get("weights", {}) or {}
+    buy = pd.Series(0.0, index=df.index)
+    sell = pd.Series(0.0, index=df.index)
+    for src, series in votes["BUY"].items():
+        buy += series.astype(float) * float(weights.get(src, 1.0))
+    for src, series in votes["SELL"].items():
+        sell += series.astype(float) * float(weights.get(src, 1.0))
+    return buy, sell
+
+
+def vote_signals(df, strategy, ns=None) -> dict:
+    """Per-indicator BUY/SELL confluence votes as boolean Series, keyed by source.
+
+    Uses each strategy indicator's `vote_buy`/`vote_sell` override if present, else
+    the registry default. Returns {"BUY": {src: Series}, "SELL": {src: Series}}.
+    """
+    ns = ns if ns is not None else build_namespace(df, strategy)
+    return _votes(df, strategy, ns, {})
+
+
 def confluence_scores(df, strategy, ns=None):
     """Weighted per-bar BUY / SELL confluence score Series.
 
@@ -253,15 +404,29 @@ def confluence_scores(df, strategy, ns=None):
     so the backtest can gate entries on it.
     """
     ns = ns if ns is not None else build_namespace(df, strategy)
-    votes = vote_signals(df, strategy, ns)
-    weights = (strategy.get("confluence") or {}).get("weights", {}) or {}
-    buy = pd.Series(0.0, index=df.index)
-    sell = pd.Series(0.0, index=df.index)
-    for src, series in votes["BUY"].items():
-        buy += series.astype(float) * float(weights.get(src, 1.0))
-    for src, series in votes["SELL"].items():
-        sell += series.astype(float) * float(weights.get(src, 1.0))
-    return buy, sell
+    return _scores(df, strategy, _votes(df, strategy, ns, {}))
+
+
+def evaluate_strategy(df, strategy, ns=None, votes=True) -> dict:
+    """Entry, exit, votes and confluence scores from one evaluation plan.
+
+    All of the strategy's expressions share one memo over the namespace, so a term
+    used in several of them (`rsi < 30`, `crossover(macd, macd_signal)`, a shifted
+    operand) is computed once. Returns {"entry", "exit"} boolean Series plus, when
+    votes=True, {"votes": {"BUY": {...}, "SELL": {...}}, "buy_score", "sell_score"}.
+    Results are identical to calling entry_signals / exit_signals / vote_signals /
+    confluence_scores separately.
+    """
+    ns = ns if ns is not None else build_namespace(df, strategy)
+    memo = {}
+    out = {
+        "entry": _signal(strategy.get("entry"), df, ns, memo),
+        "exit": _signal(strategy.get("exit"), df, ns, memo),
+    }
+    if votes:
+        out["votes"] = _votes(df, strategy, ns, memo)
+        out["buy_score"], out["sell_score"] = _scores(df, strategy, out["votes"])
+    return out
 
 
 def validate_strategy(strategy: dict) -> list[str]:
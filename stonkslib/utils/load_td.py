@@ -1,14 +1,125 @@
+import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
+import numpy as np
 import pandas as pd
 
+from stonkslib.utils.price_store import PRICE_COLUMNS, open_price_store
+
 # Automatically resolve project root relative to this file
 BASE_DIR = Path(__file__).resolve().parents[2]
 DEFAULT_CLEAN_DIR = BASE_DIR / "data" / "ticker_data" / "clean"
 
+# ── process-wide frame cache ───────────────────────────────────────────────────
+# One process (an alert sweep, an optimizer run, a dashboard session) asks for the
+# same ticker/interval many times. Loaded frames are kept in an LRU keyed by
+# (path, mtime, size) — a rewritten parquet changes the key, so stale entries are
+# never served. Cached columns are read-only and every caller gets a shallow copy:
+# assigning a column only touches the caller's copy, and an accidental in-place
+# write raises instead of corrupting the shared frame.
+# Budget in MB via STONKS_TD_CACHE_MB (0 disables); see set_cache_budget().
+_CACHE: OrderedDict = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+_CACHE_STATS = {"hits": 0, "misses": 0, "bytes": 0}
+_CACHE_BUDGET = int(float(os.getenv("STONKS_TD_CACHE_MB", "512")) * 1024 * 1024)
+
+
+def set_cache_budget(mb: float):
+    """Set the cache's memory budget in MB (0 disables caching) and evict to fit."""
+    global _CACHE_BUDGET
+    with _CACHE_LOCK:
+        _CACHE_BUDGET = int(mb * 1024 * 1024)
+        _evict()
+
+
+def clear_cache():
+    with _CACHE_LOCK:
+        _CACHE.clear()
+        _CACHE_STATS.update(hits=0, misses=0, bytes=0)
+
+
+def cache_info() -> dict:
+    """Hit/miss counters plus current entry count, bytes held and budget."""
+    with _CACHE_LOCK:
+        return {**_CACHE_STATS, "entries": len(_CACHE), "budget": _CACHE_BUDGET}
+
+
+def _evict():
+    while _CACHE and _CACHE_STATS["bytes"] > _CACHE_BUDGET:
+        _, (_, size) = _CACHE.popitem(last=False)
+        _CACHE_STATS["bytes"] -= size
+
+
+def _freeze(df: pd.DataFrame) -> pd.DataFrame:
+    """Column-wise copy of `df` whose arrays are flagged read-only."""
+    cols = {}
+    for col in df.columns:
+        arr = df[col].to_numpy(copy=True)
+        arr.flags.writeable = False
+        cols[col] = arr
+    frozen = pd.DataFrame(cols, index=df.index, copy=False)
+    frozen.attrs.update(df.attrs)
+    return frozen
+
+
+# ── input contract ─────────────────────────────────────────────────────────────
+# Frames from load_td carry float64 OHLCV columns (validated once, here) whose arrays
+# are read-only. Indicators read these columns as-is and never write into their input,
+# so callers pass the frame straight through — no defensive df.copy() per indicator.
+def price_column(df: pd.DataFrame, col: str) -> pd.Series:
+    """`df[col]` as float64: free for load_td frames, coerced (NaN on junk) otherwise."""
+    s = df[col]
+    if s.dtype != np.float64:
+        s = pd.to_numeric(s, errors="coerce").astype(np.float64)
+    return s
+
+
+def _validate_prices(df: pd.DataFrame) -> pd.DataFrame:
+    """Coerce whichever OHLCV columns aren't float64 yet; other columns are untouched."""
+    bad = [c for c in PRICE_COLUMNS if c in df.columns and df[c].dtype != np.float64]
+    if bad:
+        df = df.assign(**{c: price_column(df, c) for c in bad})
+    return df
+
+
+def _cache_get(key):
+    with _CACHE_LOCK:
+        entry = _CACHE.get(key)
+        if entry is None:
+            _CACHE_STATS["misses"] += 1
+            return None
+        _CACHE.move_to_end(key)
+        _CACHE_STATS["hits"] += 1
+    return entry[0].copy(deep=False)
+
+
+def _cache_put(key, df: pd.DataFrame) -> pd.DataFrame:
+    # Frozen even with caching disabled: the read-only contract doesn't depend on the budget.
+    if any(arr.flags.writeable for arr in (df[c].to_numpy() for c in df.columns)):
+        df = _freeze(df)
+    if _CACHE_BUDGET <= 0:
+        return df
+    size = int(df.memory_usage(index=True, deep=True).sum())
+    with _CACHE_LOCK:
+        if size <= _CACHE_BUDGET:
+            old = _CACHE.pop(key, None)
+            if old is not None:
+                _CACHE_STATS["bytes"] -= old[1]
+            _CACHE[key] = (df, size)
+            _CACHE_STATS["bytes"] += size
+            _evict()
+    return df.copy(deep=False)
+
+
 def load_td(tickers: list[str], interval: str, base_dir: Path = DEFAULT_CLEAN_DIR) -> dict[str, pd.DataFrame | None]:
     """
     Load cleaned CSVs into memory for LLMs or analysis.
 
+    Frames are served from the process-wide cache when the file is unchanged; their
+    OHLCV columns are float64 and every column is read-only (assign new columns
+    instead of writing into them).
+
     Args:
         tickers (list): List of ticker symbols
         interval (str): Timeframe like '1d', '1wk', '1m'
@@ -18,24 +129,40 @@ def load_td(tickers: list[str], interval: str, base_dir: Path = DEFAULT_CLEAN_DI
         dict: Dictionary of DataFrames keyed by ticker; None if missing/invalid
     """
     data = {}
+    # Consolidated Arrow store (utils/price_store.py), when one has been built next to
+    # the clean dir: a single mapping serves every ticker with zero-copy views.
+    store = None
     for ticker in tickers:
         ticker_path = base_dir / ticker  # Fixed: {ticker} first
         file_path = ticker_path / f"{interval}.parquet"
-        if not file_path.exists():
+        try:
+            st = file_path.stat()
+        except FileNotFoundError:
             print(f"[!] Missing cleaned file: {ticker} ({interval}) at {file_path}")
             data[ticker] = None  # Explicit None for graceful handling
             continue
 
+        key = (str(file_path), st.st_mtime_ns, st.st_size)
+        cached = _cache_get(key)
+        if cached is not None:
+            data[ticker] = cached
+            continue
+
         try:
+            if store is None:
+                store = open_price_store(interval, base_dir.parent / "store") or False
+            if store and ticker in store and store.mtime >= st.st_mtime:
+                data[ticker] = _cache_put(key, store.frame(ticker))
+                continue
             df = pd.read_parquet(file_path)
             df.columns = df.columns.str.title()
-            df = df.sort_index()
+            df = _validate_prices(df.sort_index())
             # Tag the frame with its ticker so ticker-aware indicators (e.g.
-            # news_sentiment) can resolve it; build_namespace's df.copy() keeps attrs.
+            # news_sentiment) can resolve it; shallow copies and slices keep attrs.
             df.attrs["ticker"] = ticker
-            data[ticker] = df
+            data[ticker] = _cache_put(key, df)
         except Exception as e:
             print(f"[!] Failed to load {file_path}: {e}")
             data[ticker] = None
 
-    return data
\ No newline at end of file
+    return data
@@ -12,7 +12,7 @@ def setup_logging(log_dir, log_file):
         level=logging.INFO,
         format="%(asctime)s [%(levelname)s] %(message)s",
         handlers=[
-            logging.FileHandler(log_path),
+            logging.FileHandler(log_path, delay=True),
             logging.StreamHandler()
         ]
     )
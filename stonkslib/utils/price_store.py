@@ -0,0 +1,168 @@
+"""Consolidated columnar price store — one memory-mapped Arrow file per interval.
+
+The cleaned per-ticker parquets (`data/ticker_data/clean/{TICKER}/{interval}.parquet`)
+stay the source of truth. `build_price_store` packs every ticker of one interval into
+a single Arrow IPC file:
+
+    data/ticker_data/store/{interval}.arrow
+
+partitioned by ticker as one record batch per ticker (the ticker → batch map lives in
+the schema metadata). Columns are already title-cased and OHLCV is float64, so readers
+never re-normalize.
+
+`open_price_store(interval)` memory-maps that file once per process and hands back
+per-ticker views: `store.frame("AAPL")` is a zero-copy (read-only) DataFrame over the
+mapped pages, and `store.scan()` exposes the whole interval as one Arrow table with a
+`ticker` column for watchlist-wide work — one mapping instead of N parquet opens.
+
+`load_td` reads through the store automatically whenever it is at least as new as the
+ticker's parquet, and falls back to the parquet otherwise.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+DEFAULT_CLEAN_DIR = BASE_DIR / "data" / "ticker_data" / "clean"
+DEFAULT_STORE_DIR = BASE_DIR / "data" / "ticker_data" / "store"
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+_TICKERS_KEY = b"stonks.tickers"
+
+# (resolved path) -> PriceStore; replaced when the file's mtime changes.
+_OPEN_STORES: dict[str, "PriceStore"] = {}
+
+
+def store_path(interval: str, store_dir: Path = DEFAULT_STORE_DIR) -> Path:
+    return Path(store_dir) / f"{interval}.arrow"
+
+
+def _read_clean(file_path: Path) -> pd.DataFrame:
+    df = pd.read_parquet(file_path)
+    df.columns = df.columns.str.title()
+    df = df.sort_index()
+    df.index.name = "date"
+    return df
+
+
+def build_price_store(interval: str, tickers: list[str] | None = None,
+                      clean_dir: Path = DEFAULT_CLEAN_DIR,
+                      store_dir: Path = DEFAULT_STORE_DIR) -> Path | None:
+    """(Re)build the Arrow store for one interval from the cleaned parquets.
+
+    Args:
+        interval (str): Timeframe like '1d', '1wk'
+        tickers (list): Tickers to include (default: every ticker with a cleaned file)
+        clean_dir (Path): Base path to cleaned data
+        store_dir (Path): Where `{interval}.arrow` is written
+
+    Returns:
+        Path of the written store, or None if there was nothing to pack.
+    """
+    clean_dir = Path(clean_dir)
+    if tickers is None:
+        tickers = sorted(p.parent.name for p in clean_dir.glob(f"*/{interval}.parquet"))
+
+    schema = pa.schema(
+        [pa.field("date", pa.timestamp("ns", tz="UTC"))]
+        + [pa.field(col, pa.float64()) for col in PRICE_COLUMNS]
+        + [pa.field("ticker", pa.string())]
+    )
+
+    batches, names = [], []
+    for ticker in tickers:
+        file_path = clean_dir / ticker / f"{interval}.parquet"
+        if not file_path.exists():
+            continue
+        try:
+            df = _read_clean(file_path)
+            df = df[PRICE_COLUMNS].astype("float64")
+            df["ticker"] = ticker
+            batch = pa.RecordBatch.from_pandas(df.reset_index(), schema=schema, preserve_index=False)
+        except Exception as e:
+            print(f"[!] Skipping {ticker} ({interval}) in price store: {e}")
+            continue
+        batches.append(batch)
+        names.append(ticker)
+
+    if not batches:
+        return None
+
+    schema = schema.with_metadata({_TICKERS_KEY: json.dumps(names).encode()})
+    out = store_path(interval, store_dir)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_suffix(".arrow.tmp")
+    with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+    # Atomic swap — readers that already mapped the old file keep their pages.
+    os.replace(tmp, out)
+    return out
+
+
+class PriceStore:
+    """A memory-mapped `{interval}.arrow` store; per-ticker access is zero-copy."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.mtime = self.path.stat().st_mtime
+        self._source = pa.memory_map(str(self.path), "r")
+        self._reader = pa.ipc.open_file(self._source)
+        names = json.loads(self._reader.schema.metadata[_TICKERS_KEY])
+        self._batch_of = {t: i for i, t in enumerate(names)}
+
+    @property
+    def tickers(self) -> list[str]:
+        return list(self._batch_of)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._batch_of
+
+    def batch(self, ticker: str) -> pa.RecordBatch:
+        """The ticker's record batch — a view over the mapped file, no read or copy."""
+        return self._reader.get_batch(self._batch_of[ticker])
+
+    def frame(self, ticker: str) -> pd.DataFrame:
+        """Title-cased OHLCV DataFrame (date index) for one ticker.
+
+        Numeric columns are zero-copy views of the mapping and therefore read-only;
+        assign new columns rather than writing into existing ones.
+        """
+        batch = self.batch(ticker)
+        cols = {c: batch.column(c).to_numpy(zero_copy_only=True) for c in PRICE_COLUMNS}
+        index = pd.DatetimeIndex(batch.column("date").to_pandas(), name="date")
+        df = pd.DataFrame(cols, index=index, copy=False)
+        df.attrs["ticker"] = ticker
+        return df
+
+    def scan(self) -> pa.Table:
+        """Every ticker of this interval as one Arrow table (zero-copy)."""
+        return self._reader.read_all()
+
+
+def open_price_store(interval: str, store_dir: Path = DEFAULT_STORE_DIR) -> PriceStore | None:
+    """Return the process-wide mapped store for `interval`, or None if it isn't built.
+
+    The mapping is reused across calls and re-opened only when the file changes.
+    """
+    path = store_path(interval, store_dir)
+    key = str(path.resolve())
+    try:
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        _OPEN_STORES.pop(key, None)
+        return None
+
+    store = _OPEN_STORES.get(key)
+    if store is None or store.mtime != mtime:
+        try:
+            store = PriceStore(path)
+        except Exception as e:
+            print(f"[!] Failed to open price store {path}: {e}")
+            return None
+        _OPEN_STORES[key] = store
+    return store
@@ -0,0 +1,227 @@
+"""Per-ticker volatility store — precomputed vol models next to the cleaned parquet.
+
+The LEAP backtester prices options off an annualised volatility series. Rather than
+rebuild one per backtest call, the pipeline computes every model once per ticker
+and interval and writes them beside the cleaned prices:
+
+    data/ticker_data/clean/{TICKER}/{interval}_vol.parquet
+
+one float64 column per model (see VOL_MODELS), indexed by bar date:
+
+- `rv_{w}` — rolling w-bar realized vol (std of log returns), for each w in VOL_WINDOWS;
+- `ewma`   — RiskMetrics exponentially weighted vol (λ = EWMA_LAMBDA);
+- `garch`  — GARCH(1,1) conditional vol, fit once by maximum likelihood with
+             variance targeting. The fit uses the whole stored history, so in a
+             backtest it is in-sample.
+
+Every value is the vol known at that bar's close (it includes that bar's return) and
+is annualised on a 252-bar basis, as the LEAP backtester has always done. Readers go
+through `load_vol`, which returns None when the store is missing or older than the
+parquet, so callers can fall back to computing from the frame (`vol_frame`).
+"""
+
+import json
+import math
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from scipy.optimize import minimize
+from scipy.signal import lfilter
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+DEFAULT_CLEAN_DIR = BASE_DIR / "data" / "ticker_data" / "clean"
+
+VOL_WINDOWS = (10, 20, 30, 60, 90)
+EWMA_LAMBDA = 0.94
+EWMA_MIN_PERIODS = 30
+GARCH_MIN_OBS = 100
+VOL_MODELS = [f"rv_{w}" for w in VOL_WINDOWS] + ["ewma", "garch"]
+DEFAULT_VOL_MODEL = "rv_30"
+
+_ANNUAL = math.sqrt(252)
+_GARCH_KEY = b"stonks.garch"
+
+
+def vol_path(ticker: str, interval: str, clean_dir: Path = DEFAULT_CLEAN_DIR) -> Path:
+    return Path(clean_dir) / ticker / f"{interval}_vol.parquet"
+
+
+def _log_returns(close: pd.Series) -> pd.Series:
+    return np.log(close / close.shift(1))
+
+
+def realized_vol(close: pd.Series, window: int = 30) -> pd.Series:
+    """Rolling annualized realized volatility from log returns (252-day basis)."""
+    return _log_returns(close).rolling(window).std() * _ANNUAL
+
+
+def ewma_vol(close: pd.Series, lam: float = EWMA_LAMBDA,
+             min_periods: int = EWMA_MIN_PERIODS) -> pd.Series:
+    """RiskMetrics EWMA vol: var_t = λ·var_{t-1} + (1-λ)·r_t², annualized (missing
+    returns are skipped)."""
+    var = (_log_returns(close) ** 2).ewm(alpha=1 - lam, adjust=False, ignore_na=True,
+                                         min_periods=min_periods).mean()
+    return np.sqrt(var) * _ANNUAL
+
+
+def _garch_variance(eps2, var0, omega, alpha, beta):
+    """σ²_t = ω + α·ε²_{t-1} + β·σ²_{t-1} from σ²_0 = var0, as one linear filter."""
+    x = omega + alpha * np.concatenate([[0.0], eps2[:-1]])
+    x[0] = var0
+    return lfilter([1.0], [1.0, -beta], x)
+
+
+def fit_garch(returns) -> dict | None:
+    """Gaussian maximum-likelihood GARCH(1,1) fit with variance targeting.
+
+    Args:
+        returns: per-bar log returns (NaNs dropped)
+
+    Returns:
+        dict of mean, var (the long-run variance ω/(1-α-β)), omega, alpha and beta —
+        or None with fewer than GARCH_MIN_OBS returns.
+    """
+    r = np.asarray(returns, dtype=np.float64)
+    r = r[np.isfinite(r)]
+    if len(r) < GARCH_MIN_OBS:
+        return None
+    mean = float(r.mean())
+    eps2 = (r - mean) ** 2
+    var = float(eps2.mean())
+    if var <= 0:
+        return None
+
+    def nll(p):
+        alpha, beta = p
+        if alpha < 0 or beta < 0 or alpha + beta >= 0.999:
+            return 1e10
+        sig2 = _garch_variance(eps2, var, var * (1 - alpha - beta), alpha, beta)
+        return 0.5 * float(np.sum(np.log(sig2) + eps2 / sig2))
+
+    res = minimize(nll, x0=[0.08, 0.90], method="Nelder-Mead",
+                   options={"xatol": 1e-5, "fatol": 1e-6, "maxiter": 400})
+    alpha, beta = (float(v) for v in res.x)
+    if nll(res.x) >= 1e10:
+        alpha, beta = 0.0, 0.0   # fit failed to leave the boundary: constant variance
+    return {"mean": mean, "var": var, "omega": var * (1 - alpha - beta),
+            "alpha": alpha, "beta": beta}
+
+
+def garch_vol(close: pd.Series, params: dict | None = None) -> tuple[pd.Series, dict | None]:
+    """GARCH(1,1) vol known at each bar's close — the one-step-ahead forecast after
+    that bar's return — annualized. Fits the parameters unless `params` is given.
+
+    Returns:
+        (vol, params) — vol is all NaN (and params None) when there is too little
+        history to fit.
+    """
+    r = _log_returns(close)
+    valid = r.notna().to_numpy()
+    params = params or fit_garch(r.to_numpy()[valid])
+    out = pd.Series(np.nan, index=close.index)
+    if params is None:
+        return out, None
+    eps2 = (r.to_numpy()[valid] - params["mean"]) ** 2
+    sig2 = _garch_variance(eps2, params["var"], params["omega"], params["alpha"], params["beta"])
+    forecast = params["omega"] + params["alpha"] * eps2 + params["beta"] * sig2
+    out[valid] = np.sqrt(forecast) * _ANNUAL
+    return out.ffill().where(np.arange(len(out)) >= np.argmax(valid)), params
+
+
+def compute_vol(close: pd.Series, model: str = DEFAULT_VOL_MODEL) -> pd.Series:
+    """One model computed straight from a close series (no store involved)."""
+    _check_model(model)
+    close = pd.to_numeric(close, errors="coerce").astype(np.float64)
+    if model == "ewma":
+        return ewma_vol(close)
+    if model == "garch":
+        return garch_vol(close)[0]
+    return realized_vol(close, int(model.split("_")[1]))
+
+
+def describe_vol(model: str) -> str:
+    """Human label for a vol model, e.g. for the LEAP pricing note."""
+    if model == "ewma":
+        return f"EWMA vol (λ={EWMA_LAMBDA})"
+    if model == "garch":
+        return "GARCH(1,1) vol"
+    return f"{model.split('_')[1]}-bar realized vol"
+
+
+def _check_model(model):
+    if model not in VOL_MODELS:
+        raise ValueError(f"Unknown vol model '{model}' (expected one of {', '.join(VOL_MODELS)})")
+
+
+def vol_frame(close: pd.Series) -> pd.DataFrame:
+    """Every model in VOL_MODELS for one close series (GARCH params in .attrs)."""
+    close = pd.to_numeric(close, errors="coerce").astype(np.float64)
+    cols = {f"rv_{w}": realized_vol(close, w) for w in VOL_WINDOWS}
+    cols["ewma"] = ewma_vol(close)
+    cols["garch"], params = garch_vol(close)
+    frame = pd.DataFrame(cols, index=close.index)[VOL_MODELS]
+    frame.attrs["garch"] = params
+    return frame
+
+
+def build_vol_store(ticker: str, interval: str, clean_dir: Path = DEFAULT_CLEAN_DIR) -> Path | None:
+    """(Re)compute the vol store for one ticker/interval from its cleaned parquet.
+
+    Returns:
+        Path of the written store, or None if there is no cleaned parquet.
+    """
+    src = Path(clean_dir) / ticker / f"{interval}.parquet"
+    if not src.exists():
+        return None
+    df = pd.read_parquet(src)
+    df.columns = df.columns.str.title()
+    frame = vol_frame(df.sort_index()["Close"])
+    params = frame.attrs.pop("garch")
+
+    table = pa.Table.from_pandas(frame.rename_axis("date"), preserve_index=True)
+    # GARCH params ride along in the schema metadata rather than as a column.
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}),
+                                           _GARCH_KEY: json.dumps(params).encode()})
+    out = vol_path(ticker, interval, clean_dir)
+    tmp = out.with_name(f"{out.name}.{os.getpid()}.tmp")
+    pq.write_table(table, tmp)
+    os.replace(tmp, out)
+    return out
+
+
+def garch_params(ticker: str, interval: str, clean_dir: Path = DEFAULT_CLEAN_DIR) -> dict | None:
+    """The stored GARCH(1,1) fit for one ticker/interval, or None."""
+    try:
+        meta = pq.read_schema(vol_path(ticker, interval, clean_dir)).metadata or {}
+    except (FileNotFoundError, OSError):
+        return None
+    raw = meta.get(_GARCH_KEY)
+    return json.loads(raw) if raw else None
+
+
+def load_vol(ticker: str, interval: str, model: str = DEFAULT_VOL_MODEL,
+             index: pd.Index | None = None, clean_dir: Path = DEFAULT_CLEAN_DIR) -> pd.Series | None:
+    """One stored vol model, optionally aligned to `index`.
+
+    Returns None when the store is missing, older than the cleaned parquet, or (with
+    `index`) doesn't reach its last bar — i.e. whenever the caller should compute
+    the vol from its own frame instead.
+    """
+    _check_model(model)
+    path = vol_path(ticker, interval, clean_dir)
+    src = Path(clean_dir) / ticker / f"{interval}.parquet"
+    try:
+        if src.exists() and path.stat().st_mtime < src.stat().st_mtime:
+            return None
+        vol = pd.read_parquet(path, columns=[model])[model]
+    except (FileNotFoundError, OSError, KeyError):
+        return None
+    if index is None:
+        return vol
+    if len(index) and index[-1] not in vol.index:
+        return None
+    return vol.reindex(index)